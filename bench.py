@@ -0,0 +1,1062 @@
+#!/usr/bin/env python3
+
+# Benchmarks for the SBML interpreter in hw5.py.
+#
+#   python bench.py              run every benchmark
+#   python bench.py engines      run only the named benchmark(s)
+
+import gc
+import io
+import os
+import json
+import sys
+import time
+import random
+import socket
+import tempfile
+import threading
+import tracemalloc
+import subprocess
+import argparse
+import contextlib
+
+import hw5
+
+
+def countingLoop(n):
+    return '''
+{
+  i = 0;
+  s = 0;
+  while (i < %d) { s = s + i * 2 - 1; i = i + 1; }
+  print(s);
+}
+''' % n
+
+def listLoop(n):
+    return '''
+{
+  xs = [];
+  i = 0;
+  while (i < 1000) { xs = xs + [i mod 7]; i = i + 1; }
+  i = 0;
+  s = 0;
+  while (i < %d) {
+    if (xs[i mod 1000] > 3) { s = xs[i mod 1000] + s; } else { s = s - 1; }
+    i = i + 1;
+  }
+  print(s);
+}
+''' % n
+
+def callLoop(n):
+    return '''
+fun step(a, b) = { c = a * 2 + b; } c mod 1000;
+{
+  i = 0;
+  s = 0;
+  while (i < %d) { s = step(s, i); i = i + 1; }
+  print(s);
+}
+''' % n
+
+
+def consBuild(n):
+    return '''
+{
+  xs = [];
+  i = 0;
+  while (i < %d) { xs = i :: xs; i = i + 1; }
+  print(xs[0]);
+  print(%d in xs);
+}
+''' % (n, n // 2)
+
+def concatBuild(n):
+    return '''
+{
+  xs = [];
+  i = 0;
+  while (i < %d) { xs = [i] + xs; i = i + 1; }
+  print(xs[0]);
+  print(%d in xs);
+}
+''' % (n, n // 2)
+
+def tailSum(n):
+    return '''
+fun sum(n, acc) = {
+  if (n == 0) { r = acc; } else { r = sum(n - 1, acc + n); }
+} r;
+{
+  print(sum(%d, 0));
+}
+''' % n
+
+
+def fibonacci(n):
+    return '''
+fun fib(n) = {
+  if (n < 2) { r = n; } else { r = fib(n - 1) + fib(n - 2); }
+} r;
+{
+  print(fib(%d));
+}
+''' % n
+
+def longProgram(n):
+    # n statements of mixed expressions, for parsing benchmarks.
+    lines = ["fun f(a, b) = { c = a * 2 + b; } c mod 1000;", "{", "  x = 0;", "  xs = [1, 2, 3];"]
+    for i in range(n):
+        lines.append("  x = f(x, %d) + xs[%d mod 3] * (%d - x div 7);" % (i, i, i))
+    lines.append("  print(x);")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def manySections(n):
+    # n top-level blocks, each printing, for streaming benchmarks.
+    sections = ["fun step(a) = { b = a * 3 + 1; } b mod 1000;"]
+    for i in range(n):
+        sections.append("{ x = step(%d); xs = [x, x + 1, x + 2]; s = 0; i = 0; "
+                        "while (i < 3) { s = xs[i] + s; i = i + 1; } print(s); }" % i)
+    return "\n".join(sections) + "\n"
+
+
+def timeRun(source, engine, slots = False, repeat = 3, memoSize = 0):
+    best = None
+    output = None
+    for _ in range(repeat):
+        hw5.names.clear()
+        hw5.funcnames.clear()
+        del hw5.stack[:]
+        result = hw5.parse(source)
+        sink = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            hw5.execute(result, engine, slots, memoSize)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+        output = sink.getvalue()
+    return best, output
+
+
+def benchEngines():
+    programs = [
+        ("counting loop", countingLoop(200000)),
+        ("list loop", listLoop(200000)),
+        ("call loop", callLoop(100000)),
+    ]
+    engines = [("tree", "tree", False), ("closure", "closure", False),
+               ("slots", "closure", True), ("vm", "vm", False)]
+    print("%-16s" % "program" + "".join("%10s" % label for label, _, _ in engines))
+    for title, source in programs:
+        times = []
+        outputs = []
+        for label, engine, slots in engines:
+            elapsed, output = timeRun(source, engine, slots)
+            times.append(elapsed)
+            outputs.append(output)
+        if len(set(outputs)) != 1:
+            sys.exit("engines disagree on %s" % title)
+        print("%-16s" % title + "".join("%9.3fs" % elapsed for elapsed in times))
+    print("best of 3 runs, execution only (parsing excluded)")
+
+
+consAliasing = '''
+fun set(xs) = { xs[1] = 8; } 0;
+{
+  a = 1 :: [2, 3];
+  b = a;
+  c = 0 :: a;
+  b[0] = 9;
+  x = set(a);
+  d = 5 :: a;
+  a[2] = 7;
+  print(a);
+  print(b);
+  print(c);
+  print(d);
+}
+'''
+
+def benchCons():
+    # Building a list with :: used to copy the whole tail on every step;
+    # [i] + xs still does, and is shown for comparison (100k is left out
+    # as it is quadratic). An element assigned through one variable holding
+    # a cons list must show through the others, but not in lists consed
+    # from it.
+    expected = "[9, 8, 7]\n[9, 8, 7]\n[0, 1, 2, 3]\n[5, 9, 8, 3]\n"
+    for engine, slots in (("tree", False), ("closure", False), ("closure", True), ("vm", False), ("stack", False)):
+        output = timeRun(consAliasing, engine, slots, repeat = 1)[1]
+        if output != expected:
+            sys.exit("%s%s lost cons list aliasing: %r" % (engine, " --slots" if slots else "", output))
+    print("cons list aliasing agrees on every engine")
+    print("%-22s %10s %10s %10s" % ("program", "tree", "closure", "vm"))
+    for title, source in [
+            ("cons 10k", consBuild(10000)),
+            ("cons 100k", consBuild(100000)),
+            ("concat 10k", concatBuild(10000))]:
+        times = [timeRun(source, engine, repeat = 1)[0] for engine in ("tree", "closure", "vm")]
+        print("%-22s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+
+
+def benchRecursion():
+    # An accumulator recursion a million calls deep: with tail calls it runs
+    # in constant Python stack on every engine (the VM never recursed).
+    n = 1000000
+    expected = "%d\n" % (n * (n + 1) // 2)
+    print("%-22s %10s %10s %10s %10s" % ("program", "tree", "closure", "slots", "vm"))
+    times = []
+    for engine, slots in (("tree", False), ("closure", False), ("closure", True), ("vm", False)):
+        elapsed, output = timeRun(tailSum(n), engine, slots, repeat = 1)
+        if output != expected:
+            sys.exit("%s engine got %r, expected %r" % (engine, output, expected))
+        times.append(elapsed)
+    print("%-22s" % "tail sum 1M" + "".join("%9.3fs " % elapsed for elapsed in times))
+
+
+lexerEdgeCases = [
+    "True False andalso orelse not mod in div print if else while fun",
+    "x1 _a Truex 1.5e10 1.5e-3 .5 1. 12 3.4.5 1e5 1.5e 007",
+    "**a*** <=>= <> == = :: # a::b x<>y",
+    "\"a;}\" 'b\"' '' \"\" 'x' 'y'",
+    "a\n\n b \t\n c  \t",
+    "",
+]
+
+def plyTokens(source):
+    lexer = hw5.getLexer()
+    lexer.lineno = 1
+    lexer.input(source)
+    tokens = []
+    while True:
+        token = lexer.token()
+        if not token:
+            return tokens
+        tokens.append((token.type, token.value, type(token.value), token.lineno, token.lexpos))
+
+def benchLex():
+    # The scanner must give PLY's token stream exactly: types, values (and
+    # their Python types), line numbers and positions.
+    sources = [longProgram(2000), manySections(500)] + lexerEdgeCases
+    for source in sources:
+        scanned = [(kind, value, type(value), lineno, lexpos)
+                   for kind, value, lineno, lexpos in hw5.scanTokens(source)]
+        if scanned != plyTokens(source):
+            sys.exit("scanner and PLY lexer disagree on %r" % source[:60])
+    print("scanner matches the PLY lexer on %d inputs" % len(sources))
+
+    source = longProgram(20000)
+    count = len(plyTokens(source))
+    print("%-28s %12s" % ("lexer (%d tokens)" % count, "tokens/s"))
+    lexer = hw5.getLexer()
+    for title, run in [
+            ("PLY lexer", lambda: drainLexer(lexer, source)),
+            ("scanner, PLY interface", lambda: drainLexer(hw5.Scanner(), source)),
+            ("scanner, tuples", lambda: sum(1 for _ in hw5.scanTokens(source)))]:
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-28s %12.0f" % (title, count / best))
+
+def drainLexer(lexer, source):
+    lexer.input(source)
+    token = lexer.token
+    while token():
+        pass
+
+
+def benchMemo():
+    print("%-22s %10s %10s %26s" % ("program", "slots", "memo", "hits/misses/evictions"))
+    for title, source, size in [
+            ("fib 24, memo 1024", fibonacci(24), 1024),
+            ("fib 24, memo 4", fibonacci(24), 4)]:
+        plain, expected = timeRun(source, "closure", True, repeat = 1)
+        del hw5.memoCaches[:]
+        memo, output = timeRun(source, "closure", True, repeat = 1, memoSize = size)
+        if output != expected:
+            sys.exit("memoized run disagrees on %s" % title)
+        cache = hw5.memoCaches[-1]
+        print("%-22s %9.3fs %9.3fs %26s" % (title, plain, memo,
+              "%d/%d/%d" % (cache.hits, cache.misses, cache.evictions)))
+
+
+def benchCache():
+    print("%-22s %10s %10s %10s" % ("program", "parse", "miss", "hit"))
+    with tempfile.TemporaryDirectory() as cacheDir:
+        for n in (1000, 10000):
+            source = longProgram(n)
+            times = []
+            for run in (lambda: hw5.parse(source),
+                        lambda: hw5.parseCached(source, cacheDir, 1 << 30),
+                        lambda: hw5.parseCached(source, cacheDir, 1 << 30)):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+            print("%-22s" % ("%d statements" % n) + "".join("%9.3fs " % elapsed for elapsed in times))
+
+
+def benchStream():
+    # Whole processes, timed to their first line of output and to the end,
+    # with the peak resident set size each one reports for itself.
+    here = os.path.dirname(os.path.abspath(__file__))
+    child = ("import sys, resource, hw5; sys.argv = ['hw5.py'] + sys.argv[1:]; hw5.main(); "
+             "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file = sys.stderr)")
+    print("%-22s %12s %10s %10s" % ("program", "first line", "total", "peak RSS"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (2000, 8000):
+            path = os.path.join(tmp, "sections.txt")
+            with open(path, "w") as f:
+                f.write(manySections(n))
+            outputs = []
+            for flags in ([], ["--stream"]):
+                start = time.perf_counter()
+                process = subprocess.Popen([sys.executable, "-c", child, path] + flags, cwd = here,
+                                           stdout = subprocess.PIPE, stderr = subprocess.PIPE,
+                                           universal_newlines = True)
+                first = process.stdout.readline()
+                firstTime = time.perf_counter() - start
+                rest = process.stdout.read()
+                errors = process.stderr.read()
+                process.wait()
+                total = time.perf_counter() - start
+                outputs.append(first + rest)
+                print("%-22s %11.3fs %9.3fs %8.1fMB" % ("%d sections %s" % (n, " ".join(flags)),
+                      firstTime, total, int(errors.split()[-1]) / 1024))
+            if outputs[0] != outputs[1]:
+                sys.exit("streaming output differs for %d sections" % n)
+
+
+def benchParse():
+    # Parse time should grow linearly: the last column stays roughly flat.
+    print("%-28s %10s %14s" % ("program", "parse", "per 1k items"))
+    for n in (1000, 10000, 100000):
+        source = "{\n" + "".join("  x = x + %d;\n" % i for i in range(n)) + "}\n"
+        parseTime(source, "%d statements" % n, n)
+    for n in (1000, 10000, 100000):
+        source = "{ x = [" + ", ".join(str(i) for i in range(n)) + "]; }\n"
+        parseTime(source, "list of %d items" % n, n)
+
+def parseTime(source, title, n):
+    start = time.perf_counter()
+    hw5.parse(source)
+    elapsed = time.perf_counter() - start
+    print("%-28s %9.3fs %13.2fms" % (title, elapsed, elapsed / n * 1000 * 1000))
+
+
+parserEdgeCases = [
+    "{ x = s + x[1]; y = s + 'ab'[1]; z = not a[1] == b; w = [1, 2][0] + 1; }",
+    "{ x = a < b == c; y = a == b < c; z = 1 :: 2 :: xs; w = 2 ** 3 ** 2; v = -5 ** 2 - -1.5; }",
+    "{ x = (1,); y = (1, 2,); z = (1, 2) (3); w = [1] 2]; v = f() 1) + g(); }",
+    "{ x = #1 t[0]; y = #1 [2] t; z = #(1 + 2) [2]; w = #1 [2, 3]; v = # # 1 t u; }",
+    "{ x[[1, ]] = 1; f(1) f(2, 3) print(x); if (x) { } else { y = 1; } while (x) { } }",
+    "fun f(a, b) = { } a + b; fun g() x, y) = { c = 1; } c; fun h(a, b, = { } 1;",
+    "{ }", "", "{ x = [1, [2]]; }", "{ x = f(x)[0]; }", "{ x = f(x) - 1; }", "{ x = (1, 2)[0]; }",
+    "{ x = f(1,); }", "{ x = [1,]; }", "{ x = -x; }", "{ f(1); }", "{ x = 1 }", "fun f(x,) = { } x;",
+]
+
+def randomExpression(rng, depth):
+    if depth == 0:
+        return rng.choice(["x", "f", "1", "2.5", "'s'", "True", "-1"])
+    left, right = randomExpression(rng, depth - 1), randomExpression(rng, depth - 1)
+    return rng.choice([
+        "%s %s %s" % (left, rng.choice(["+", "-", "*", "div", "**", "::", "in", "<", "==", "andalso", "orelse"]), right),
+        "not %s" % left, "(%s)" % left, "[%s, %s]" % (left, right), "(%s, %s)" % (left, right),
+        "f(%s, %s)" % (left, right), "#%s %s" % (left, right), "%s[%s]" % (left, right), "'ab'[%s]" % left])
+
+def randomProgram(rng):
+    # Mostly valid programs; a quarter have a token dropped or repeated.
+    statements = []
+    for _ in range(rng.randrange(1, 5)):
+        expression = randomExpression(rng, rng.randrange(4))
+        statements.append(rng.choice(["x = %s;", "x[1] = %s;", "print(%s);", "f(%s)",
+                                      "if (%s) { x = 1; } else { }", "while (%s) { }"]) % expression)
+    source = "fun f(a, b) = { } a; { %s }" % " ".join(statements)
+    if rng.random() < 0.25:
+        tokens = source.split()
+        i = rng.randrange(len(tokens))
+        tokens[i:i + 1] = rng.choice([[], [tokens[i]] * 2])
+        source = " ".join(tokens)
+    return source
+
+def parsedForm(parse, source):
+    # The tree, in the parse cache's encoding, and the names declared on
+    # the way; or the syntax error.
+    hw5.names.clear()
+    hw5.funcnames.clear()
+    sink = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sink):
+            sections = parse(source)
+    except hw5.SBMLSyntaxError:
+        return sink.getvalue()
+    return hw5.encodeNode(sections, {}), list(hw5.names), list(hw5.funcnames)
+
+def benchParser():
+    # The hand-written parser must build PLY's trees, and fail where PLY
+    # fails, on the generated programs, the edge cases and a seeded
+    # random corpus.
+    rng = random.Random(13)
+    sources = [longProgram(500), manySections(100), fibonacci(10), tailSum(10), consBuild(10),
+               callLoop(10), listLoop(10)] + parserEdgeCases + [randomProgram(rng) for _ in range(3000)]
+    for source in sources:
+        if parsedForm(lambda source: hw5.PrattParser(source).program(), source) != parsedForm(hw5.parse, source):
+            sys.exit("pratt parser and PLY disagree on %r" % source[:60])
+    print("pratt parser matches PLY on %d programs" % len(sources))
+
+    print("%-28s %10s %10s" % ("program", "yacc", "pratt"))
+    for title, source in [
+            ("20000 statements", longProgram(20000)),
+            ("list of 100000 items", "{ x = [" + ", ".join(str(i) for i in range(100000)) + "]; }\n")]:
+        times = []
+        for parse in (hw5.parse, lambda source: hw5.PrattParser(source).program()):
+            best = None
+            for _ in range(3):
+                gc.collect()                    #not the previous run's tree
+                start = time.perf_counter()
+                parse(source)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            times.append(best)
+        print("%-28s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+
+
+def membershipLoop(n, probes):
+    return '''
+{
+  n = %d;
+  xs = [0] * n;
+  i = 0;
+  while (i < n) { xs[i] = i * 3; i = i + 1; }
+  i = 0;
+  found = 0;
+  while (i < %d) {
+    if (i in xs) { found = found + 1; }
+    i = i + 1;
+  }
+  print(found);
+}
+''' % (n, probes)
+
+def benchMembership():
+    # `in` against one 100k-element list from a loop: scanning (the index
+    # turned off) is timed on a few probes, the hashed index on 100k. Both
+    # include building the list, and must count the probes found.
+    n = 100000
+    print("%-24s %10s %10s %10s %10s" % ("100k-element list", "probes", "tree", "slots", "vm"))
+    saved = hw5.indexedLength
+    for title, probes, length in [("scan", 2000, n + 1), ("hash index", 100000, saved)]:
+        hw5.indexedLength = length
+        times = []
+        for engine, slots in (("tree", False), ("closure", True), ("vm", False)):
+            elapsed, output = timeRun(membershipLoop(n, probes), engine, slots, repeat = 1)
+            if output != "%d\n" % len(range(0, probes, 3)):
+                sys.exit("%s found %r" % (title, output))
+            times.append(elapsed)
+        print("%-24s %10d" % (title, probes) + "".join("%9.3fs " % elapsed for elapsed in times))
+    hw5.indexedLength = saved
+
+
+def benchNodes():
+    # Memory a parsed program keeps: what the parse allocated and is still
+    # alive afterwards (nodes, with their lists and values), per node.
+    print("%-22s %10s %10s %10s" % ("program", "nodes", "memory", "per node"))
+    hw5.getParser()
+    for title, source in [("20000 statements", longProgram(20000)),
+                          ("2000 sections", manySections(2000))]:
+        gc.collect()
+        tracemalloc.start()
+        sections = hw5.parse(source)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        count = 0
+        pending = list(sections)
+        while pending:
+            node = pending.pop()
+            count += 1
+            pending.extend(hw5.childNodes(node))
+        print("%-22s %10d %8.1fMB %9.1fB" % (title, count, size / 1024 / 1024, size / count))
+
+
+def consChain(n):
+    # A tree n nodes deep.
+    return "{ x = " + " :: ".join(["1"] * n) + " :: []; }\n"
+
+def plusChain(n):
+    # A left-leaning tree n nodes deep.
+    return "{ x = " + " + ".join(["1"] * n) + "; }\n"
+
+def deepValue(source, engine):
+    hw5.names.clear()
+    hw5.funcnames.clear()
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        hw5.execute(hw5.PrattParser(source).program(), engine)
+    return hw5.names.get("x"), out.getvalue()
+
+def benchDeep():
+    # The stack engine must agree with Node.eval wherever that can run, also
+    # with every node on the work stack, and go on to chains a million
+    # deep, where Node.eval runs out of stack.
+    sources = [fibonacci(8), tailSum(50)]
+    for n in (1, 10, 300):
+        sources += [consChain(n), plusChain(n)]
+    evalDepth = hw5.evalDepth
+    for depth in (0, evalDepth):
+        hw5.evalDepth = depth
+        for source in sources:
+            if deepValue(source, "stack") != deepValue(source, "tree"):
+                sys.exit("stack engine disagrees with tree on %r" % source[:60])
+        hw5.deepNodes.clear()
+    hw5.evalDepth = evalDepth
+    print("stack engine agrees with tree")
+
+    n = 1000000
+    print("%-22s %10s %10s %12s" % ("program", "parse", "stack", "tree"))
+    for title, source, expected in [("cons 1M deep", consChain(n), [1] * n),
+                                    ("plus 1M deep", plusChain(n), n)]:
+        start = time.perf_counter()
+        sections = hw5.PrattParser(source).program()
+        parsed = time.perf_counter() - start
+        hw5.names.clear()
+        start = time.perf_counter()
+        hw5.execute(sections, "stack")
+        elapsed = time.perf_counter() - start
+        if hw5.names["x"] != expected:
+            sys.exit("stack engine got the wrong value for %s" % title)
+        try:
+            hw5.execute(sections, "tree")
+            tree = "ok"
+        except RecursionError:
+            tree = "RecursionError"
+        print("%-22s %9.3fs %9.3fs %12s" % (title, parsed, elapsed, tree))
+
+def appendLoop(piece, n):
+    return '''
+{
+  s = "";
+  i = 0;
+  while (i < %d) { s = s + "%s"; i = i + 1; }
+  print(s[0]);
+}
+''' % (n, piece)
+
+def benchAppend():
+    # Strings of 1 MB and 10 MB built by + in a loop, through
+    # StringBuilder, and with it turned off (each + copies the string so
+    # far; quadratic, so only at 1 MB). The result must be the pieces
+    # joined.
+    print("%-34s %10s %10s %10s" % ("string", "tree", "slots", "vm"))
+    saved = hw5.builderLength
+    for title, piece, n, length in [
+            ("1 MB of 100-char pieces, plain +", "x" * 100, 10000, 1 << 62),
+            ("1 MB of 100-char pieces", "x" * 100, 10000, saved),
+            ("1 MB of 10-char pieces", "abcdefghij", 100000, saved),
+            ("10 MB of 10-char pieces", "abcdefghij", 1000000, saved)]:
+        hw5.builderLength = length
+        times = []
+        for engine, slots in (("tree", False), ("closure", True), ("vm", False)):
+            elapsed, output = timeRun(appendLoop(piece, n), engine, slots, repeat = 1)
+            times.append(elapsed)
+            if not slots and hw5.plain(hw5.names["s"]) != piece * n:
+                sys.exit("%s built the wrong string" % title)
+        print("%-34s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+    hw5.builderLength = saved
+
+
+def benchAST():
+    # Writing and reloading must give back the same tree and names, and
+    # the text dump should take time in proportion to what it prints.
+    for source in [longProgram(500), manySections(100), fibonacci(10), consChain(300)]:
+        hw5.names.clear()
+        hw5.funcnames.clear()
+        sections, _ = hw5.foldConstants(hw5.parse(source))
+        expected = (hw5.encodeNode(sections, {}), list(hw5.names), list(hw5.funcnames))
+        out = io.StringIO()
+        hw5.writeAST(sections, out)
+        hw5.names.clear()
+        hw5.funcnames.clear()
+        loaded = hw5.loadAST(out.getvalue())
+        if (hw5.encodeNode(loaded, {}), list(hw5.names), list(hw5.funcnames)) != expected:
+            sys.exit("AST file does not round-trip %r" % source[:60])
+    print("AST files round-trip")
+
+    print("%-28s %10s %10s %14s" % ("program", "output", "time", "per 1M chars"))
+    for n in (1000, 2000, 4000):
+        sections = hw5.PrattParser(consChain(n)).program()
+        out = io.StringIO()
+        start = time.perf_counter()
+        hw5.dumpTree(sections, out)
+        elapsed = time.perf_counter() - start
+        size = len(out.getvalue())
+        print("%-28s %9.1fM %9.3fs %13.3fs" % ("dump, %d deep" % n, size / 1e6, elapsed, elapsed / size * 1e6))
+
+    print("%-28s %10s %10s %10s" % ("program", "parse", "write", "load"))
+    for title, source in [("20000 statements", longProgram(20000)), ("100000 deep", consChain(100000))]:
+        times = []
+        start = time.perf_counter()
+        sections = hw5.PrattParser(source).program()
+        times.append(time.perf_counter() - start)
+        out = io.StringIO()
+        start = time.perf_counter()
+        hw5.writeAST(sections, out)
+        times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        hw5.loadAST(out.getvalue())
+        times.append(time.perf_counter() - start)
+        print("%-28s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+
+
+def smallProgram(i):
+    # One of a few short programs, varied by i; the last two kinds fail.
+    kind = i % 5
+    if kind == 0:
+        return "{ x = %d; y = x * 2 + 1; print(y); }\n" % i
+    if kind == 1:
+        return "fun f(n) = { r = n * n; } r;\n{ print(f(%d)); }\n" % i
+    if kind == 2:
+        return "{ xs = [%d, 2, 3]; i = 0; s = 0; while (i < 3) { s = s + xs[i]; i = i + 1; } print(s); }\n" % i
+    if kind == 3:
+        return "{ x = %d + 'a'; print(x); }\n" % i
+    return "{ print(%d) }\n" % i
+
+def benchInProcess():
+    # 10k small programs run one after another by a warm Interpreter,
+    # against a process per program, timed on the first 100, which must
+    # print the same.
+    interpreter = hw5.Interpreter(output = io.StringIO())
+    interpreter.run("{ x = 1; }")
+    try:
+        interpreter.run("{ print(x); }")
+        sys.exit("a run sees the variables of the one before")
+    except hw5.SBMLSemanticError:
+        pass
+
+    programs = [smallProgram(i) for i in range(10000)]
+    outputs = []
+    gc.collect()
+    start = time.perf_counter()
+    for source in programs:
+        interpreter.output = io.StringIO()
+        try:
+            interpreter.run(source)
+        except hw5.SBMLError:
+            pass
+        outputs.append(interpreter.output.getvalue())
+    inProcess = time.perf_counter() - start
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    count = 100
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(count):
+            paths.append(os.path.join(tmp, "p%d.txt" % i))
+            with open(paths[i], "w") as f:
+                f.write(programs[i])
+        start = time.perf_counter()
+        for i in range(count):
+            result = subprocess.run([sys.executable, "-m", "hw5", paths[i]], cwd = here,
+                                    capture_output = True, text = True, check = True)
+            if result.stdout != outputs[i]:
+                sys.exit("in-process output differs for %r" % programs[i])
+        perProcess = time.perf_counter() - start
+
+    print("%-22s %10s %10s %12s" % ("mode", "programs", "time", "programs/s"))
+    print("%-22s %10d %9.3fs %12.0f" % ("one Interpreter", len(programs), inProcess, len(programs) / inProcess))
+    print("%-22s %10d %9.3fs %12.0f" % ("python -m hw5 each", count, perProcess, count / perProcess))
+    print("in-process is %.0fx the throughput" % ((len(programs) / inProcess) / (count / perProcess)))
+
+
+def benchBatch():
+    # The same files through pools of 1, 2 and 4 workers: every pool must
+    # report the same outputs and outcomes. Files/s should grow with the
+    # workers up to the number of CPUs.
+    programs = [smallProgram(i) for i in range(1500)] + [countingLoop(20000)] * 100
+    options = {"engine": "tree", "slots": False, "memoSize": 0, "fold": False,
+               "tailCalls": True, "parser": "yacc"}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, source in enumerate(programs):
+            paths.append(os.path.join(tmp, "p%04d.txt" % i))
+            with open(paths[i], "w") as f:
+                f.write(source)
+        print("%d CPUs" % (os.cpu_count() or 1))
+        print("%-12s %10s %10s %10s" % ("workers", "time", "files/s", "speedup"))
+        expected = None
+        base = None
+        for jobs in (1, 2, 4):
+            out = io.StringIO()
+            elapsed = hw5.runBatch(paths, jobs, options, out)
+            report = [json.loads(line) for line in out.getvalue().splitlines()]
+            for entry in report:
+                del entry["seconds"]
+            if expected is None:
+                expected = report
+                base = elapsed
+            elif report != expected:
+                sys.exit("%d workers report differently" % jobs)
+            print("%-12d %9.3fs %10.0f %9.2fx" % (jobs, elapsed, len(paths) / elapsed, base / elapsed))
+
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    return ", ".join("%s %.3f ms" % (name, latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000)
+                     for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)))
+
+def benchServe():
+    # 8 clients on their own connections to a server process, each sending
+    # 500 small programs and waiting for every reply, which must match what
+    # an Interpreter prints. Client-side latency includes the wait for the
+    # programs of the other clients.
+    interpreter = hw5.Interpreter()
+    programs = [smallProgram(i) for i in range(500)]
+    expected = [hw5.runSource(interpreter, source)[:2] for source in programs]
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sbml.sock")
+        server = subprocess.Popen([sys.executable, "-m", "hw5", "--serve", path], cwd = here,
+                                  stderr = subprocess.PIPE, text = True)
+        while not os.path.exists(path):
+            time.sleep(0.01)
+        latencies = []
+        failures = []
+
+        def client():
+            with socket.socket(socket.AF_UNIX) as connection:
+                connection.connect(path)
+                f = connection.makefile("rwb")
+                for i, source in enumerate(programs):
+                    start = time.perf_counter()
+                    f.write((json.dumps({"id": i, "source": source}) + "\n").encode())
+                    f.flush()
+                    reply = json.loads(f.readline())
+                    latencies.append(time.perf_counter() - start)
+                    if reply["id"] != i or [reply["output"], reply["status"]] != list(expected[i]):
+                        failures.append(source)
+
+        clients = [threading.Thread(target = client) for _ in range(8)]
+        start = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        server.terminate()
+        summary = server.communicate()[1].strip()
+    if failures:
+        sys.exit("server replied wrongly to %r" % failures[0])
+    print("%d requests from 8 clients in %.3fs, %.0f requests/s"
+          % (len(latencies), elapsed, len(latencies) / elapsed))
+    print("client latency: " + percentiles(latencies))
+    print("server: " + summary)
+
+
+def printingLoop(n):
+    return '''
+{
+  i = 0;
+  while (i < %d) {
+    print(i);
+    print(i / 4);
+    print(i < 2);
+    print("line");
+    print([i, "a", True, 1.5]);
+    print((i, 2.5, "b"));
+    print(i :: [1, 2]);
+    i = i + 1;
+  }
+}
+''' % n
+
+def benchOutput():
+    # A program that mostly prints, run with stdout piped, unbuffered
+    # (--output-buffer 0) and with the default buffer, to a file with
+    # --output, and in-process into an OutputBuffer kept in memory. Every
+    # way must produce the same bytes.
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "print.txt")
+        target = os.path.join(tmp, "out.txt")
+        with open(source, "w") as f:
+            f.write(printingLoop(30000))
+        print("%-28s %10s %10s" % ("mode", "time", "lines/s"))
+        expected = None
+        for title, extra in [("stdout, unbuffered", ["--output-buffer", "0"]),
+                             ("stdout, 64 KiB buffer", []),
+                             ("--output file", ["--output", target])]:
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-m", "hw5", source] + extra, cwd = here,
+                                    capture_output = True, check = True)
+            elapsed = time.perf_counter() - start
+            printed = result.stdout
+            if extra and extra[0] == "--output":
+                with open(target, "rb") as f:
+                    printed = f.read()
+            if expected is None:
+                expected = printed
+            elif printed != expected:
+                sys.exit("%s prints differently" % title)
+            print("%-28s %9.3fs %10.0f" % (title, elapsed, expected.count(b"\n") / elapsed))
+        with open(source) as f:
+            program = f.read()
+    buffer = hw5.OutputBuffer()
+    interpreter = hw5.Interpreter(output = buffer)
+    start = time.perf_counter()
+    interpreter.run(program)
+    elapsed = time.perf_counter() - start
+    if buffer.getvalue().encode() != expected:
+        sys.exit("OutputBuffer() holds different output")
+    print("%-28s %9.3fs %10.0f" % ("in-process OutputBuffer()", elapsed, expected.count(b"\n") / elapsed))
+
+
+def numericLists(n):
+    # Built by repeating short literals, which costs next to nothing on
+    # every engine; compiling a 100k-element literal would not.
+    xs = ", ".join("%r" % (i * 0.5) for i in range(100))
+    ys = ", ".join(str(i % 7) for i in range(100))
+    return "  n = %d;\n  xs = [%s] * (n div 100);\n  ys = [%s] * (n div 100);\n" % (n, xs, ys)
+
+def vectorLoop(n):
+    return '''
+{
+%s  zs = [0] * n;
+  i = 0;
+  s = 0;
+  d = 0;
+  while (i < n) {
+    x = xs[i];
+    y = ys[i];
+    z = x * 2.5 + y;
+    zs[i] = z;
+    s = s + z;
+    d = d + x * y;
+    i = i + 1;
+  }
+  print(s);
+  print(d);
+  print(zs[n - 1]);
+}
+''' % numericLists(n)
+
+def vectorBuiltins(n):
+    return '''
+{
+%s  zs = vadd(vmul(xs, 2.5), ys);
+  print(sum(zs));
+  print(dot(xs, ys));
+  print(zs[n - 1]);
+}
+''' % numericLists(n)
+
+def benchVector():
+    # Scaling, adding and summing numeric lists in a while loop, against
+    # the same computed by the builtins in one call each; both must print
+    # the same.
+    n = 100000
+    engines = [("tree", "tree", False), ("closure", "closure", False),
+               ("slots", "closure", True), ("vm", "vm", False)]
+    print("%-16s" % ("%dk floats" % (n // 1000)) + "".join("%10s" % label for label, _, _ in engines))
+    results = []
+    for title, source in [("while loop", vectorLoop(n)), ("builtins", vectorBuiltins(n))]:
+        times = []
+        for label, engine, slots in engines:
+            elapsed, output = timeRun(source, engine, slots)
+            times.append(elapsed)
+            results.append(output)
+        print("%-16s" % title + "".join("%9.3fs" % elapsed for elapsed in times))
+    if len(set(results)) != 1:
+        sys.exit("the builtins compute differently from the loop")
+
+
+def benchQuicken():
+    # The engines programs on the engines that run Node.eval, with nodes
+    # quickened and with every node left generic (quickenLimit 0), which
+    # must print the same. Then each operator node of the counting loop
+    # with its counts, as --stats reports them.
+    programs = [
+        ("counting loop", countingLoop(200000)),
+        ("list loop", listLoop(200000)),
+        ("call loop", callLoop(100000)),
+    ]
+    print("%-16s %10s %10s %10s %10s" % ("program", "tree", "generic", "stack", "generic"))
+    saved = hw5.quickenLimit
+    for title, source in programs:
+        times = []
+        outputs = []
+        for engine in ("tree", "stack"):
+            for limit in (saved, 0):
+                hw5.quickenLimit = limit
+                hw5.deoptimized.clear()
+                elapsed, output = timeRun(source, engine)
+                times.append(elapsed)
+                outputs.append(output)
+        if len(set(outputs)) != 1:
+            sys.exit("quickening changed the output of %s" % title)
+        print("%-16s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+    hw5.quickenLimit = saved
+    hw5.deoptimized.clear()
+
+    hw5.quickenStats = {}
+    hw5.names.clear()
+    hw5.funcnames.clear()
+    result = hw5.parse(countingLoop(1000))
+    with contextlib.redirect_stdout(io.StringIO()):
+        hw5.execute(result)
+    hw5.reportQuickening(result, sys.stdout)
+    hw5.quickenStats = None
+    hw5.deoptimized.clear()
+
+
+def brokenLoop(n):
+    # A long loop, then an error: the loop is not known to finish, so the
+    # error is not known to be reached.
+    return countingLoop(n).replace("print(s);", "print(s + \"done\");")
+
+def brokenProgram(n):
+    # n statements that are sure to finish, then an error every run reaches.
+    lines = ["{", "  x = 1;"]
+    for i in range(n):
+        lines.append("  x = (x * 3 + %d) mod 1000; print(x);" % i)
+    lines.append("  print(x + \"done\");")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+def checkedRun(source, engine, repeat = 3):
+    # timeRun with the type inference pass in front, timed with the run.
+    best = None
+    output = None
+    for _ in range(repeat):
+        hw5.names.clear()
+        hw5.funcnames.clear()
+        del hw5.stack[:]
+        result = hw5.parse(source)
+        sink = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(sink):
+            try:
+                errors, _ = hw5.inferTypes(result)
+                if any(certain for _, _, certain in errors):
+                    hw5.semanticError()
+                hw5.execute(result, engine)
+            except hw5.SBMLSemanticError:
+                pass
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+        output = sink.getvalue()
+    return best, output
+
+def benchTypecheck():
+    # The engines programs with quickening alone and with the checks type
+    # inference proves unneeded taken out, which must print the same; then
+    # a program that fails after a loop, which must still run, and one that
+    # fails after 20k statements, run and rejected up front.
+    programs = [
+        ("counting loop", countingLoop(200000)),
+        ("list loop", listLoop(200000)),
+        ("call loop", callLoop(100000)),
+    ]
+    print("%-16s %10s %10s %10s %10s" % ("program", "tree", "checked", "stack", "checked"))
+    for title, source in programs:
+        times = []
+        outputs = []
+        for engine in ("tree", "stack"):
+            for run in (timeRun, checkedRun):
+                elapsed, output = run(source, engine)
+                times.append(elapsed)
+                outputs.append(output)
+        if len(set(outputs)) != 1:
+            sys.exit("type inference changed the output of %s" % title)
+        print("%-16s" % title + "".join("%9.3fs " % elapsed for elapsed in times))
+
+    _, output = checkedRun(brokenLoop(1000), "tree", repeat = 1)
+    if output != "SEMANTIC ERROR\n" or hw5.names["i"] != 1000:
+        sys.exit("a program failing after a loop was rejected")
+    source = brokenProgram(20000)
+    start = time.perf_counter()
+    try:
+        timeRun(source, "tree", repeat = 1)
+    except hw5.SBMLSemanticError:
+        pass
+    elapsed = time.perf_counter() - start
+    rejected, output = checkedRun(source, "tree", repeat = 1)
+    if output != "SEMANTIC ERROR\n":
+        sys.exit("the broken program was not rejected: %r" % output[-40:])
+    print("%-16s%9.3fs %9.3fs  (tree, run and rejected)" % ("broken program", elapsed, rejected))
+
+    sections = hw5.parse(longProgram(2000))
+    start = time.perf_counter()
+    hw5.inferTypes(sections)
+    print("inferring types of %d statements: %.3fs" % (2000, time.perf_counter() - start))
+
+
+def benchStartup():
+    # Wall time of whole processes running a one-statement program, against
+    # a bare interpreter. The goal is under 50 ms to the first statement.
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "tiny.txt")
+        unit = os.path.join(tmp, "tiny.sbc")
+        with open(source, "w") as f:
+            f.write("{ print(1); }\n")
+        subprocess.run([sys.executable, "hw5.py", source, "--emit-bytecode", unit], cwd = here, check = True)
+        print("%-30s %10s %10s" % ("command", "best", "median"))
+        for title, command in [
+                ("python -c pass", ["-c", "pass"]),
+                ("python hw5.py tiny.txt", ["hw5.py", source]),
+                ("python -m hw5 tiny.txt", ["-m", "hw5", source]),
+                ("python -m hw5 tiny.sbc", ["-m", "hw5", unit])]:
+            times = []
+            for _ in range(20):
+                start = time.perf_counter()
+                subprocess.run([sys.executable] + command, cwd = here, check = True, stdout = subprocess.DEVNULL)
+                times.append(time.perf_counter() - start)
+            times.sort()
+            print("%-30s %8.1fms %8.1fms" % (title, times[0] * 1000, times[len(times) // 2] * 1000))
+
+
+benchmarks = {
+    "append": benchAppend,
+    "ast": benchAST,
+    "batch": benchBatch,
+    "cache": benchCache,
+    "cons": benchCons,
+    "deep": benchDeep,
+    "engines": benchEngines,
+    "inprocess": benchInProcess,
+    "lex": benchLex,
+    "member": benchMembership,
+    "memo": benchMemo,
+    "nodes": benchNodes,
+    "output": benchOutput,
+    "parse": benchParse,
+    "parser": benchParser,
+    "quicken": benchQuicken,
+    "recursion": benchRecursion,
+    "serve": benchServe,
+    "startup": benchStartup,
+    "stream": benchStream,
+    "typecheck": benchTypecheck,
+    "vector": benchVector,
+}
+
+
+def main():
+    argParser = argparse.ArgumentParser(description = "Benchmark the SBML interpreter.")
+    argParser.add_argument("names", nargs = "*", metavar = "name",
+                           help = "benchmarks to run: %s (default: all)" % ", ".join(sorted(benchmarks)))
+    args = argParser.parse_args()
+    for name in args.names:
+        if name not in benchmarks:
+            argParser.error("unknown benchmark: %s" % name)
+    for name in args.names or sorted(benchmarks):
+        print("== %s" % name)
+        benchmarks[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,486 +1,776 @@
 #!/usr/bin/env python3
 
+import gc
+import io
+import os
+import re
 import sys
-import ply.lex as lex
-import ply.yacc as yacc
+import time
+import array
+import hashlib
+import functools
+import itertools
+import operator
+import collections
+import marshal
+import argparse
+
+
+class ConsList():
+    # Persistent list produced by ::. Consing is O(1) and shares the tail
+    # (another ConsList, or a private Python list at the end of the chain).
+    # The elements are only copied into a Python list when something needs
+    # one, and that copy is cached. Indexed assignment modifies the copy
+    # (see mutableList), so every holder of the cell sees the change; head
+    # and tail keep the elements as they were consed, for the cells
+    # built on top of it before the change.
+    __slots__ = ("head", "tail", "length", "flat", "mutated")
+
+    def __init__(self, head, tail):
+        self.head = head
+        self.tail = tail
+        self.length = 1 + len(tail)
+        self.flat = None
+        self.mutated = False                    #flat is modified in place
+
+    def toList(self):
+        if self.flat is None:
+            items = []
+            node = self
+            while type(node) is ConsList and (node.flat is None or node.mutated):
+                items.append(node.head)
+                node = node.tail
+            if type(node) is ConsList:
+                items.extend(node.flat)
+            else:
+                items.extend(node)
+            self.flat = items
+        return self.flat
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.toList())
+
+    def __contains__(self, x):
+        return x in self.toList()
+
+    def __getitem__(self, i):
+        return self.toList()[i]
+
+    def __eq__(self, other):
+        if type(other) is list or type(other) is ConsList:
+            return self.toList() == plain(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return self.toList() + plain(other)
+
+    def __mul__(self, n):
+        return self.toList() * n
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return repr(self.toList())
+
+builderLength = 256                             #+ joins shorter strings right away
+
+class StringBuilder():
+    # String produced by + once it is builderLength long: the text is
+    # pieces[:count] joined. Extending the newest builder of a pieces list
+    # appends to that list, so a loop adding to a string costs O(1) a step
+    # instead of a copy of everything so far; extending an older one (the
+    # same string extended twice) copies its pieces first, so values
+    # sharing a list never see each other's additions. The pieces are only
+    # joined when something needs the string, and that is cached.
+    __slots__ = ("pieces", "count", "flat")
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.count = len(pieces)
+        self.flat = None
+
+    def extend(self, text):
+        if self.flat is not None:
+            pieces = [self.flat]
+        elif len(self.pieces) == self.count:
+            pieces = self.pieces
+        else:
+            pieces = self.pieces[:self.count]
+        pieces.append(text)
+        return StringBuilder(pieces)
+
+    def toString(self):
+        if self.flat is None:
+            pieces = self.pieces
+            self.flat = "".join(pieces if len(pieces) == self.count else pieces[:self.count])
+        return self.flat
+
+    def __len__(self):
+        return len(self.toString())
+
+    def __iter__(self):
+        return iter(self.toString())
+
+    def __contains__(self, x):
+        return plain(x) in self.toString()
+
+    def __getitem__(self, i):
+        return self.toString()[i]
+
+    def __eq__(self, other):
+        return self.toString() == plain(other)
+
+    def __ne__(self, other):
+        return self.toString() != plain(other)
+
+    def __lt__(self, other):
+        return self.toString() < plain(other)
+
+    def __le__(self, other):
+        return self.toString() <= plain(other)
+
+    def __gt__(self, other):
+        return self.toString() > plain(other)
+
+    def __ge__(self, other):
+        return self.toString() >= plain(other)
+
+    def __hash__(self):
+        return hash(self.toString())
+
+    def __add__(self, other):
+        return self.extend(plain(other))
+
+    def __mul__(self, n):
+        return self.toString() * n
+
+    __rmul__ = __mul__
+
+    def __str__(self):
+        return self.toString()
+
+    def __repr__(self):
+        return repr(self.toString())
+
+lazyTypes = (ConsList, StringBuilder)
+
+def plain(x):
+    # The Python value behind a lazily represented one.
+    if type(x) is ConsList:
+        return x.toList()
+    if type(x) is StringBuilder:
+        return x.toString()
+    return x
+
+def mutableList(x):
+    # A list that indexed assignment may modify: a cons list's copy, made
+    # its own the first time, since cells consed onto it read their
+    # elements through the cached copies of its tail. (A string cannot be
+    # modified, and fails as one.)
+    if type(x) is ConsList:
+        if not x.mutated:
+            x.flat = list(x.toList())
+            x.mutated = True
+        return x.flat
+    if type(x) is StringBuilder:
+        return x.toString()
+    return x
+
+
+# Program output. Print statements, and the error lines below, write
+# through printLine to output: a file object, or None for whatever
+# sys.stdout is at the time. An OutputBuffer in between collects the lines
+# and passes them on in large blocks, so a program printing in a loop
+# costs a list append per line instead of a write; whoever runs the
+# program flushes it at the end, also when the program fails.
+
+output = None
+
+class OutputBuffer():
+    # With no file, everything is kept and getvalue returns it.
+    def __init__(self, file = None, size = 65536):
+        self.file = file
+        self.size = size                        #characters held before they are passed on
+        self.pieces = []
+        self.pending = 0
+
+    def write(self, text):
+        self.pieces.append(text)
+        self.pending += len(text)
+        if self.pending >= self.size and self.file is not None:
+            self.flush()
+
+    def flush(self):
+        if self.file is not None:
+            if self.pieces:
+                self.file.write("".join(self.pieces))
+                self.pieces = []
+                self.pending = 0
+            self.file.flush()
+
+    def getvalue(self):
+        self.pieces = ["".join(self.pieces)]
+        return self.pieces[0]
+
+def printLine(value):
+    # Writes value as print(value) would.
+    (sys.stdout if output is None else output).write(str(value) + "\n")
+
+def flushOutput():
+    if output is not None:
+        output.flush()
+
+# Program errors. SBML reports one by printing SEMANTIC ERROR or SYNTAX
+# ERROR: the line goes to the program's output where the error happens,
+# then the exception carries it to whoever runs the program. A failure in
+# a function body is swallowed by the call, so its line is printed and the
+# program goes on.
+
+class SBMLError(Exception):
+    pass
+
+class SBMLSyntaxError(SBMLError):
+    pass
+
+class SBMLSemanticError(SBMLError):
+    pass
+
+def semanticError():
+    printLine("SEMANTIC ERROR")
+    raise SBMLSemanticError("SEMANTIC ERROR")
+
+def syntaxError():
+    printLine("SYNTAX ERROR")
+    raise SBMLSyntaxError("SYNTAX ERROR")
+
+
+# Operator semantics shared by every execution engine. The tree-walker
+# (Node.eval) and the compiled engines call these so a program behaves the
+# same whichever engine runs it.
+
+def opNot(x):
+    if type(x) is bool:
+        return not x
+    semanticError()
+
+def opAnd(x, y):
+    if type(x) is bool and type(y) is bool:
+        return x and y
+    semanticError()
+
+def opOr(x, y):
+    if type(x) is bool and type(y) is bool:
+        return x or y
+    semanticError()
+
+def opPlus(x, y):
+    # Lazily represented operands are checked for only once the common
+    # cases have failed; two of the same kind add through their __add__.
+    if type(x) is type(y):
+        if type(x) is str and len(x) + len(y) >= builderLength:
+            return StringBuilder([x, y])
+        return x + y
+    if type(x) is StringBuilder and type(y) is str:
+        return x.extend(y)
+    if (type(x) is int or type(x) is float) and (type(y) is int or type(y) is float):
+        return x + y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opPlus(plain(x), plain(y))
+    semanticError()
+
+def opMinus(x, y):
+    return x - y
+
+def opTimes(x, y):
+    return x * y
+
+def opIntdivision(x, y):
+    if type(x) is int and type(y) is int and y != 0:
+        return int(x / y)
+    semanticError()
+
+def opDivision(x, y):
+    if y != 0:
+        return float(x / y)
+    semanticError()
+
+def opModulus(x, y):
+    if type(x) is type(y) and type(x) is not StringBuilder:
+        return x % y
+    if type(x) is StringBuilder or type(y) is StringBuilder:
+        return opModulus(plain(x), plain(y))
+    semanticError()
+
+def opExponent(x, y):
+    return pow(x, y)
+
+def opLessthan(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x < y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opLessthan(plain(x), plain(y))
+    semanticError()
+
+def opGreaterthan(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x > y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opGreaterthan(plain(x), plain(y))
+    semanticError()
+
+def opLEQ(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x <= y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opLEQ(plain(x), plain(y))
+    semanticError()
+
+def opGEQ(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x >= y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opGEQ(plain(x), plain(y))
+    semanticError()
+
+def opEqualTo(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x == y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opEqualTo(plain(x), plain(y))
+    semanticError()
+
+def opNEQ(x, y):
+    if type(x) is type(y) and type(x) is not ConsList:
+        return x != y
+    if type(x) in lazyTypes or type(y) in lazyTypes:
+        return opNEQ(plain(x), plain(y))
+    semanticError()
+
+def opCons(x, y):
+    if type(y) is ConsList and not y.mutated:
+        return ConsList(x, y)
+    if type(y) is ConsList:
+        return ConsList(x, list(y.flat))        #as for a list, which it now is
+    if type(y) is list:
+        return ConsList(x, list(y))             #the list itself may be modified later
+    return [x] + y
+
+# Membership in a list scans it, which is slow when a loop keeps probing
+# the same long list. The second `in` against a list at least
+# indexedLength long builds a set of its elements, and later ones look x
+# up in it. Lists are only changed by indexed assignment, which drops the
+# list's entry through listChanged; an entry holds on to its list, so the
+# id cannot be reused while it exists. Lists with unhashable elements,
+# and unhashable x, are scanned as before.
+
+indexedLength = 16
+memberIndexLimit = 64                           #lists with an entry, oldest dropped first
+memberIndexes = {}                              #id of a list -> [the list, its set, None before the second probe, False if unhashable]
+
+def opIn(x, y):
+    if type(y) is not list:
+        if type(x) is StringBuilder or type(y) in lazyTypes:
+            return opIn(plain(x), plain(y))
+        return x in y
+    if len(y) >= indexedLength:
+        entry = memberIndexes.get(id(y))
+        if entry is None:
+            if len(memberIndexes) >= memberIndexLimit:
+                del memberIndexes[next(iter(memberIndexes))]
+            memberIndexes[id(y)] = [y, None]
+        else:
+            if entry[1] is None:
+                try:
+                    entry[1] = set(y)
+                except TypeError:
+                    entry[1] = False
+            if entry[1] is not False:
+                try:
+                    return x in entry[1]
+                except TypeError:
+                    pass
+    return x in y
+
+def listChanged(target):
+    if memberIndexes:
+        memberIndexes.pop(id(target), None)
+
+def opIndex(x, y):
+    if type(y) is int and (type(x) is list or type(x) is str):
+        try:
+            return x[y]
+        except IndexError:
+            pass
+    elif type(x) in lazyTypes:
+        return opIndex(plain(x), y)
+    semanticError()
+
+def opTupleIndex(i, t):
+    x = []
+    for item in t:
+        x.append(item)
+    try:
+        return x[i - 1]
+    except IndexError:
+        semanticError()
+
+
+# Builtin functions on numeric lists. A call of a name that no function
+# definition has declared runs the builtin of that name instead, so a
+# program's own functions still take precedence. Element-wise operations
+# and reductions run as single C loops (map, functools.reduce) over lists
+# of ints and floats instead of an interpreted while loop per element;
+# either operand of an element-wise operation may also be a single
+# number. Results are ordinary lists and numbers, computed exactly as the
+# equivalent loop of +, -, * and / would, left to right.
+
+numericTypes = {int, float}
+
+def numericList(x):
+    x = plain(x)
+    if type(x) is list and set(map(type, x)) <= numericTypes:
+        return x
+    semanticError()
+
+def isNumber(x):
+    return type(x) is int or type(x) is float
+
+def elementwise(op, x, y):
+    if isNumber(x):
+        y = numericList(y)
+        return list(map(op, itertools.repeat(x, len(y)), y))
+    x = numericList(x)
+    if isNumber(y):
+        return list(map(op, x, itertools.repeat(y, len(x))))
+    y = numericList(y)
+    if len(x) != len(y):
+        semanticError()
+    return list(map(op, x, y))
+
+def builtinAdd(x, y):
+    return elementwise(operator.add, x, y)
+
+def builtinSubtract(x, y):
+    return elementwise(operator.sub, x, y)
+
+def builtinMultiply(x, y):
+    return elementwise(operator.mul, x, y)
+
+def builtinDivide(x, y):
+    if y == 0 or not isNumber(y) and 0 in numericList(y):
+        semanticError()
+    return elementwise(operator.truediv, x, y)
+
+def builtinSum(xs):
+    return functools.reduce(operator.add, numericList(xs), 0)     #sum() compensates float rounding
+
+def builtinProduct(xs):
+    return functools.reduce(operator.mul, numericList(xs), 1)
+
+def builtinMin(xs):
+    xs = numericList(xs)
+    if not xs:
+        semanticError()
+    return min(xs)
+
+def builtinMax(xs):
+    xs = numericList(xs)
+    if not xs:
+        semanticError()
+    return max(xs)
+
+def builtinDot(x, y):
+    x, y = numericList(x), numericList(y)
+    if len(x) != len(y):
+        semanticError()
+    return functools.reduce(operator.add, map(operator.mul, x, y), 0)
+
+builtinFunctions = {
+    "vadd": (builtinAdd, 2),
+    "vsub": (builtinSubtract, 2),
+    "vmul": (builtinMultiply, 2),
+    "vdiv": (builtinDivide, 2),
+    "sum": (builtinSum, 1),
+    "product": (builtinProduct, 1),
+    "min": (builtinMin, 1),
+    "max": (builtinMax, 1),
+    "dot": (builtinDot, 2),
+}
+
+def applyBuiltin(name, args):
+    function, argc = builtinFunctions[name]
+    if len(args) != argc:
+        semanticError()
+    return function(*args)
+
+def noBody(frame = None):
+    return None
+
+def builtinFunction(name, args):
+    # A builtin call in the shape of a prepared function for callFunction:
+    # no parameters, an empty body, and the builtin as its output.
+    return [noBody, (), functools.partial(applyBuiltin, name, args), None]
+
+def builtinFrameFunction(name, args):
+    # The same for callInFrame, with the arguments as the call's frame.
+    return (noBody, functools.partial(applyBuiltin, name), len(args), len(args), None, None), args
 
 
 class Node():
-    def __init__(self):
-        self.parent = None
+    # Nodes keep their fields in slots and hold no link to their parent.
+    __slots__ = ()
 
-    def parentCount(self):
-        count = 0
-        current = self.parent
-        while current is not None:
-            count += 1
-            current = current.parent
-        return count
+    def label(self):
+        # The node's line in a dump: its class and the fields that hold no
+        # nodes. A quickened node shows as the class it was parsed as.
+        values = []
+        for attribute in quickenBases.get(type(self), type(self)).__slots__:
+            value = getattr(self, attribute)
+            if isinstance(value, Node) or type(value) is list and any(isinstance(item, Node) for item in value):
+                continue
+            values.append("%s=%r" % (attribute, value))
+        return " ".join([type(self).__name__] + values)
+
+    def __str__(self):
+        out = io.StringIO()
+        dumpTree(self, out)
+        return out.getvalue()
 
 class Assignment(Node):
+    __slots__ = ("lvalue", "rvalue")
+
     def __init__(self, lvalue, rvalue):
-        super().__init__()
         self.lvalue = lvalue
         self.rvalue = rvalue
-        self.lvalue.parent = self
-        self.rvalue.parent = self
         
     def eval(self):
         pass
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Assignment"
-        res += "\n" + str(self.lvalue)
-        res += "\n" + str(self.rvalue)
-        return res
     
 class Not(Node):
+    __slots__ = ("child",)
+
     def __init__(self, child):
-        super().__init__()
         self.child = child
-        self.child.parent = self
 
     def eval(self):
-        if (type(self.child.eval()) is bool):
-            v = not self.child.eval()
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        
-        return v
-
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Not"
-        res += "\n" + str(self.child)
-        return res
+        return opNot(self.child.eval())
     
 class AST_True(Node):
+    __slots__ = ("value",)
+
     def __init__(self):
-        super().__init__()
         self.value = True
 
     def eval(self):
         return self.value
 
-    def __str__(self):
-        res = "\t" * self.parentCount() + "True"
-        return res
-
 class AST_False(Node):
+    __slots__ = ("value",)
+
     def __init__(self):
-        super().__init__()
         self.value = False
 
     def eval(self):
         return self.value
-
-    def __str__(self):
-        res = "\t" * self.parentCount() + "False"
-        return res
     
 class And(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
 
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x)) is type(y) and (type(x) is bool):
-            return x and y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Andalso"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
 
 class Or(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
 
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x)) is type(y) and (type() is bool):
-            return x or y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Orelse"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
       
     
 class Number(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
         
     def eval(self):
         return self.value
     
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Number"
-        return res
-    
 class Real(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
         
     def eval(self):
         return self.value
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Real"
-        return res
 
 class Plus(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if(type(x) is type(y) and (type(x) is list or str)):
-            return x + y
-        elif (type(y) is int) or (type(y) is float):
-            if (type(x) is int) or (type(x) is float):
-                return x + y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Plus"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
-        
+        return quicken(self, self.left.eval(), self.right.eval())
 class Minus(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if(type(x) is int or float and (type(y) is int or float)):
-            return x - y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Minus"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opMinus(self.left.eval(), self.right.eval())
     
 class Times(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if(type(x) is int or float and (type(y) is int or float)):
-            return x * y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Times"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opTimes(self.left.eval(), self.right.eval())
     
 class Intdivision(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int) and (y != 0):
-            return int(x / y)
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Intdivision"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
     
 class Exponent(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        return pow(self.left.eval(), self.right.eval())
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Exponent"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opExponent(self.left.eval(), self.right.eval())
     
     
 class String(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = str(value)
         
     def eval(self):
         return self.value
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "String"
-        return res
  
 class Lessthan(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            v = x < y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Lessthan"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class Greaterthan(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            v = x > y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "GreaterThan"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class LEQ(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            v = x <= y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "LEQ"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
 
 class GEQ(Node):
+    __slots__ = ("left", "right")
+
     
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            return x >= y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "GEQ"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class EqualTo(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            return (x == y)
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "EqualTO"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class NEQ(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float or str):
-            return x != y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "NEQ"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class Uminus(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
         
     def eval(self):
         return -self.value
     
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Uminus"
-        return res
-    
 class Division(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is int or float) and (type(y) is int or float) and (y != 0):
-            v = float(x / y)
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Division"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opDivision(self.left.eval(), self.right.eval())
     
 class Modulus(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(x) is type(y)) and (type(x) is int or float):
-            v = x % y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Modulus"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
 
 class List(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
 
     def eval(self):
@@ -489,112 +779,42 @@ class List(Node):
             x.append(item.eval())
         return x
     
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "List"
-        return res
    
 class Cons(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        #self.right.parent = self
         
     def eval(self): 
         x = self.right.eval()
-        y = [self.left.eval()] + x
-        return y
-
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Cons"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opCons(self.left.eval(), x)
 
 class In(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if (type(y) is list or str):
-            return x in y
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit() 
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "In"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return opIn(self.left.eval(), self.right.eval())
     
 class Index(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        if type(self.left) is not list and type(self.left) is not str:
-            self.left.parent = self
-        self.right.parent = self
         
     def eval(self):
-        x = self.left.eval()
-        y = self.right.eval()
-        if type(y) is int:
-            if type(self.left) is list:
-                try:
-                    v =  (self.left)[y]
-                    v = v.eval()
-                except IndexError:
-                    print("SEMANTIC ERROR")
-                    sys.exit() 
-            elif (isinstance(self.left, Index)):
-                try:
-                    v = (self.left.eval())[y]
-                except IndexError:
-                    print("SEMANTIC ERROR")
-            elif (type(self.left) is str):
-                strin = self.left
-                strin = strin.strip('\"')
-                try:
-                    v =  (strin)[y]
-                except IndexError:
-                    print("SEMANTIC ERROR")
-                    sys.exit() 
-            elif (type(x) is str):
-                try:
-                    v =  (self.left.eval())[y]
-                except IndexError:
-                    print("SEMANTIC ERROR1")
-                    sys.exit() 
-            elif (type(x) is list):
-                v = (x)[y]
-            #elif ():
-                #return
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit() 
-        
-        return v
-          
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Index"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        return quicken(self, self.left.eval(), self.right.eval())
     
 class Tuple(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
 
     def eval(self):
@@ -603,60 +823,43 @@ class Tuple(Node):
             x.append(item.eval())
         return tuple(x)
     
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Tuple"
-        return res
-    
 class Print(Node):
+    __slots__ = ("value",)
+
     def __init__(self, value):
-        super().__init__()
         self.value = value
         
     def eval(self):
-        print(self.value.eval())
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Tuple"
-        return res
+        printLine(self.value.eval())
 
 class TupleIndex(Node):
+    __slots__ = ("left", "right")
+
     def __init__(self, left, right):
-        super().__init__()
         self.left = left
         self.right = right
-        self.left.parent = self
-        #self.right.parent = self
         
     def eval(self):
-        x = []
-        #print(type(self.right.eval()))
-        for item in self.right.eval():
-            x.append(item)
-            
-        try:
-            v =  (x)[self.left.eval() - 1]
-        except IndexError:
-            print("SEMANTIC ERROR")
-            sys.exit() 
-                
-        return v
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "TupleIndex"
-        res += "\n" + str(self.left)
-        res += "\n" + str(self.right)
-        return res
+        x = self.right.eval()
+        return opTupleIndex(self.left.eval(), x)
     
 class Assign(Node):
+    __slots__ = ("value", "variable", "tailCall")
+
     def __init__(self, variable, value):
-        super().__init__()
         self.value = value
         self.variable = variable
+        self.tailCall = False                   #set by markTailCalls
         
     def eval(self):
+        if self.tailCall and tailCalls:
+            return TailCall(self.variable, self.value.prepare())
         x = self.value.eval()
         if type(self.variable) is list:
-            (names[self.variable[0]])[self.variable[1].eval()]  = x
+            target = mutableList(names[self.variable[0]])
+            names[self.variable[0]] = target
+            target[self.variable[1].eval()] = x
+            listChanged(target)
             return
         elif type(x) is list:
             names[self.variable] = x
@@ -664,173 +867,2565 @@ class Assign(Node):
         else:
             names[self.variable] = x
             return
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Assignment"
-        return res
-   
-   
+
+    def label(self):
+        if type(self.variable) is list:
+            # the value is followed by the index among the children
+            return "Assign variable=%r[] tailCall=%r" % (self.variable[0], self.tailCall)
+        return Node.label(self)
+
+
 class VariableName(Node):
+    __slots__ = ("name",)
+
     def __init__(self, name):
-        super().__init__()
         self.name = name
 
-    def eval(self):
-        if self.name in names:
-            return names[self.name]
-        else:
-            print("SEMANTIC ERROR")
-            sys.exit()
+    def eval(self):
+        if self.name in names:
+            return names[self.name]
+        else:
+            semanticError()
+
+class Block(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+        
+    def eval(self):
+        result = None
+        for item in self.value: 
+            if item is not None:
+                result = item.eval()
+        return result
+    
+class Conditional(Node):
+    __slots__ = ("value", "conditional")
+
+    def __init__(self, conditional, value):
+        self.value = value
+        self.conditional = conditional
+        
+    def eval(self):
+        if (self.conditional.eval()):
+            return self.value.eval()
+        else:
+            return
+    
+class ConditionalElse(Node):
+    __slots__ = ("value", "conditional", "conditionalvalue")
+
+    def __init__(self, conditional, conditionalvalue, value):
+        self.value = value
+        self.conditional = conditional
+        self.conditionalvalue = conditionalvalue
+        
+    def eval(self):        
+        if (self.conditional.eval()):
+            return self.conditionalvalue.eval() 
+        else:
+            return self.value.eval()
+    
+
+class Loop(Node):
+    __slots__ = ("value", "conditional")
+
+    def __init__(self, conditional, value):
+        self.value = value
+        self.conditional = conditional
+        
+    def eval(self):
+        while(self.conditional.eval()):
+            self.value.eval()
+
+class FunctionDef(Node):
+    __slots__ = ("name", "var", "value", "output")
+
+    def __init__(self, name, var, value, output):
+        self.name = name
+        self.var = var
+        self.value = value
+        self.output = output
+        markTailCalls(self)
+        
+    def eval(self):
+        if type(self.output) is FunctionCall:
+            outputCall = self.output.prepare
+        else:
+            outputCall = None
+        output = self.output                    #its eval looked up per call, as quickening changes it
+        funcnames[self.name] = [self.value.eval, self.var, lambda: output.eval(), outputCall]
+    
+class FunctionCall(Node):
+    __slots__ = ("name", "var")
+
+    def __init__(self, name, var):
+        self.name = name
+        self.var = var
+        
+    def prepare(self):
+        if self.name not in funcnames:
+            if self.name in builtinFunctions:
+                return builtinFunction(self.name, [item.eval() for item in self.var])
+            semanticError()
+        
+        for item in self.var:
+            stack.append(item.eval())                  #push variables to stack in case of recursive function call
+        
+        function = funcnames[self.name]
+        if len(function[1]) != len(self.var):
+            semanticError()
+        return function
+        
+    def eval(self):
+        return callFunction(self.prepare())
+        
+
+
+# Tail calls. A call is in tail position when it is a function's output
+# expression, or when the body ends with `v = f(...)` and the output is v:
+# either way nothing but bookkeeping is left to do once f returns. Instead
+# of nesting, such calls go round the loop in callFunction (or
+# callInFrame for slot frames), so accumulator-style recursion runs in
+# constant Python stack.
+
+tailCalls = True                                #cleared by --no-tail-calls
+
+class TailCall():
+    # Returned by a body whose last action is the tail call `variable = f(...)`;
+    # function is the prepared callee, its arguments already passed.
+    __slots__ = ("variable", "function")
+
+    def __init__(self, variable, function):
+        self.variable = variable
+        self.function = function
+
+def tailStatements(block):
+    statements = [item for item in block.value if item is not None]
+    if not statements:
+        return []
+    last = statements[-1]
+    if type(last) is Conditional:
+        return tailStatements(last.value)
+    if type(last) is ConditionalElse:
+        return tailStatements(last.conditionalvalue) + tailStatements(last.value)
+    return [last]
+
+def markTailCalls(function):
+    if type(function.output) is not VariableName:
+        return
+    for item in tailStatements(function.value):
+        if type(item) is Assign and item.variable == function.output.name \
+                and type(item.value) is FunctionCall:
+            item.tailCall = True
+
+def bindArguments(variableNames):
+    count = 0                   #set variables for block evaluation
+    for x in range(len(variableNames) - 1, -1, -1):
+        names[variableNames[x]] = stack[len(stack) - 1 - count]
+        count += 1
+
+def restoreArguments(variableNames):
+    for x in range(len(variableNames) - 1, -1, -1):
+        stack.pop()
+        try:
+            names[variableNames[x]] = stack[len(stack) - x - 2]
+        except IndexError:
+            pass
+
+def callFunction(function):
+    # Runs a call whose arguments prepare() has already pushed. A failure in
+    # the body is swallowed by the call, as it always was, but running out
+    # of Python stack is not. Callers waiting on a tail call are kept in
+    # pending and finished, innermost first, once it returns; a failure
+    # after a callee's body is swallowed by the waiting caller's body.
+    pending = []
+    while True:
+        blockVal, variableNames, outputVar, outputCall = function
+        bindArguments(variableNames)
+        try:
+            signal = blockVal()                 #evaluate block
+        except RecursionError:
+            raise
+        except:
+            signal = None
+        if type(signal) is TailCall:
+            pending.append((signal.variable, variableNames, outputVar))
+            function = signal.function
+            continue
+        restoreArguments(variableNames)
+        error = None
+        try:
+            if outputCall is not None and tailCalls:
+                function = outputCall()
+                continue
+            result = outputVar()
+        except RecursionError:
+            raise
+        except BaseException as e:
+            if not pending:
+                raise
+            error = e
+        break
+    while pending:
+        variable, variableNames, outputVar = pending.pop()
+        if error is None:
+            names[variable] = result
+        restoreArguments(variableNames)
+        try:
+            result = outputVar()
+            error = None
+        except RecursionError:
+            raise
+        except BaseException as e:
+            if not pending:
+                raise
+            error = e
+    return result
+
+
+class funcVarList(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def eval(self):
+        x = []
+        for item in self.value:
+            x.append(item.eval())
+        return x
+
+class ListConstant(Node):
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = tuple(value)
+
+    def eval(self):
+        return list(self.value)                 #a fresh list, since lists are mutable
+
+# Quickening. The first evaluation of an operator node (Plus, the
+# comparisons, ...) in Node.eval hands its operand values to quicken,
+# which changes the node's class to a variant specialized for their types:
+# int + int, str < str, list[int] and so on, each with the operation
+# inlined behind a check of the types. When the check fails, deoptimize
+# computes the value the generic way and puts the node back to its class
+# as parsed, to be specialized again on its next evaluation; after
+# quickenLimit failures the node settles on the generic variant. Variants
+# add no slots and keep their class's name, so the node stays the same
+# object in the same place of the tree. An operand may evaluate the same
+# node again (a recursive call) and change its class meanwhile, so both
+# functions look up the class it was parsed as in quickenBases. With
+# --stats, quickenStats counts each node's specializations and
+# deoptimizations.
+
+quickenLimit = 4
+deoptimized = {}                                #node -> times a guard failed
+quickenStats = None                             #node -> [specializations, deoptimizations]
+
+comparisonTypes = [(int, int), (float, float), (str, str)]
+quickenedOps = {
+    # node class: (generic op, symbol, [(left type, right type, value, further guard)])
+    Plus: (opPlus, "+", [(int, int, "x + y", None), (float, float, "x + y", None),
+                         (str, str, "x + y", "len(x) + len(y) < builderLength"),
+                         (StringBuilder, str, "x.extend(y)", None)]),
+    Lessthan: (opLessthan, "<", [(l, r, "x < y", None) for l, r in comparisonTypes]),
+    Greaterthan: (opGreaterthan, ">", [(l, r, "x > y", None) for l, r in comparisonTypes]),
+    LEQ: (opLEQ, "<=", [(l, r, "x <= y", None) for l, r in comparisonTypes]),
+    GEQ: (opGEQ, ">=", [(l, r, "x >= y", None) for l, r in comparisonTypes]),
+    EqualTo: (opEqualTo, "==", [(l, r, "x == y", None) for l, r in comparisonTypes]),
+    NEQ: (opNEQ, "<>", [(l, r, "x != y", None) for l, r in comparisonTypes]),
+    Intdivision: (opIntdivision, "div", [(int, int, "int(x / y)", "y != 0")]),
+    Modulus: (opModulus, "mod", [(int, int, "x % y", None), (float, float, "x % y", None)]),
+    And: (opAnd, "andalso", [(bool, bool, "x and y", None)]),
+    Or: (opOr, "orelse", [(bool, bool, "x or y", None)]),
+    Index: (opIndex, "[]", [(list, int, "x[y]", "-len(x) <= y < len(x)"),
+                            (str, int, "x[y]", "-len(x) <= y < len(x)")]),
+}
+
+quickenTemplate = """def eval(self):
+    x = self.left.eval()
+    y = self.right.eval()
+    if {guard}:
+        return {value}
+    return deoptimize(self, x, y)
+"""
+
+genericTemplate = """def eval(self):
+    return {op}(self.left.eval(), self.right.eval())
+"""
+
+quickenVariants = {}                            #(node class, left type, right type) -> variant
+genericVariants = {}                            #node class -> variant that never specializes
+quickenBases = {}                               #node class or variant -> node class
+
+def makeVariant(cls, description, code):
+    namespace = {}
+    exec(code, globals(), namespace)
+    variant = type(cls.__name__, (cls,), {"__slots__": (), "eval": namespace["eval"],
+                                          "description": description})
+    quickenBases[variant] = cls
+    return variant
+
+def buildVariants():
+    for cls, (op, symbol, specializations) in quickenedOps.items():
+        quickenBases[cls] = cls
+        genericVariants[cls] = makeVariant(cls, "generic", genericTemplate.format(op = op.__name__))
+        for left, right, value, further in specializations:
+            guard = "type(x) is %s and type(y) is %s" % (left.__name__, right.__name__)
+            if further is not None:
+                guard += " and " + further
+            description = "%s %s %s" % (left.__name__, symbol, right.__name__)
+            quickenVariants[cls, left, right] = makeVariant(cls, description,
+                quickenTemplate.format(guard = guard, value = value))
+
+buildVariants()
+
+def quicken(node, x, y):
+    cls = quickenBases[type(node)]
+    variant = quickenVariants.get((cls, type(x), type(y)))
+    if variant is None or deoptimized.get(node, 0) >= quickenLimit:
+        variant = genericVariants[cls]
+    node.__class__ = variant
+    if quickenStats is not None:
+        counts = quickenStats.setdefault(node, [0, 0])
+        if variant.description != "generic":
+            counts[0] += 1
+    return quickenedOps[cls][0](x, y)
+
+def deoptimize(node, x, y):
+    cls = quickenBases[type(node)]
+    node.__class__ = cls
+    deoptimized[node] = deoptimized.get(node, 0) + 1
+    if quickenStats is not None:
+        quickenStats[node][1] += 1
+    return quickenedOps[cls][0](x, y)
+
+def numberNodes(sections):
+    # The nodes in the order of the lines of --dump-ast, with their line
+    # numbers.
+    pending = list(reversed(sections))
+    line = 0
+    while pending:
+        node = pending.pop()
+        line += 1
+        yield line, node
+        pending.extend(reversed(childNodes(node)))
+
+def reportQuickening(sections, out):
+    # A line per operator node that ran, with the variant it ended on.
+    for line, node in numberNodes(sections):
+        counts = quickenStats.get(node)
+        if counts is not None:
+            out.write("quicken node %d %s: %s, %d specializations, %d deoptimizations\n"
+                      % (line, type(node).__name__, getattr(type(node), "description", "not specialized"),
+                         counts[0], counts[1]))
+
+
+# Explicit-stack evaluation (--engine stack): walks the same trees as
+# Node.eval and calls the same op* functions in the same order, but keeps
+# the pending work on a list instead of the Python stack, so nesting depth
+# is bounded by memory rather than the recursion limit. A work item is a
+# node to evaluate or a (step, argument) pair to run once the values it
+# needs are on the value stack; each node leaves exactly one value there.
+# Subtrees no deeper than evalDepth are handed to Node.eval, which is
+# faster and recurses only that far. Function bodies still run through
+# callFunction, so only calls that are not tail calls nest Python frames.
+
+evalDepth = 100
+
+deepNodes = set()                               #ids of nodes deeper than evalDepth
+
+def markDeepNodes(sections):
+    # Post-order over an explicit stack: a node is pending once on its own
+    # and once more, with its number of children, after them. heights holds
+    # the heights of the finished children of the nodes on the current path.
+    heights = []
+    pending = list(reversed(sections))
+    while pending:
+        node = pending.pop()
+        if type(node) is tuple:
+            node, count = node
+            height = 1 + max(heights[len(heights) - count:])
+            del heights[len(heights) - count:]
+            if height > evalDepth:
+                deepNodes.add(id(node))
+            heights.append(height)
+            continue
+        children = childNodes(node)
+        if children:
+            pending.append((node, len(children)))
+            pending.extend(children)
+        else:
+            heights.append(1)
+
+def evaluate(node):
+    return runWork([node])
+
+def runWork(work):
+    values = []
+    while work:
+        item = work.pop()
+        if type(item) is tuple:
+            item[0](item[1], work, values)
+        elif id(item) in deepNodes:
+            stackSteps[type(item)](item, work, values)
+        else:
+            values.append(item.eval())
+    return values.pop()
+
+def discard(_, work, values):
+    values.pop()
+
+def stepConstant(node, work, values):
+    values.append(node.value)
+
+def stepUminus(node, work, values):
+    values.append(-node.value)
+
+def stepListConstant(node, work, values):
+    values.append(list(node.value))
+
+def stepNone(node, work, values):
+    values.append(None)
+
+def stepVariableName(node, work, values):
+    if node.name in names:
+        values.append(names[node.name])
+    else:
+        semanticError()
+
+def stepNot(node, work, values):
+    work.append((applyUnary, opNot))
+    work.append(node.child)
+
+def applyUnary(op, work, values):
+    values[-1] = op(values[-1])
+
+def stepBinary(node, work, values):
+    work.append(binarySteps[type(node)])
+    work.append(node.right)
+    work.append(node.left)
+
+def applyBinary(op, work, values):
+    y = values.pop()
+    values[-1] = op(values[-1], y)
+
+def stepRightFirst(node, work, values):
+    # Cons and TupleIndex evaluate their right operand first.
+    work.append(binarySteps[type(node)])
+    work.append(node.left)
+    work.append(node.right)
+
+def applyRightFirst(op, work, values):
+    x = values.pop()
+    values[-1] = op(x, values[-1])
+
+def stepList(node, work, values):
+    work.append((collect, (len(node.value), list)))
+    work.extend(reversed(node.value))
+
+def stepTuple(node, work, values):
+    work.append((collect, (len(node.value), tuple)))
+    work.extend(reversed(node.value))
+
+def collect(shape, work, values):
+    count, kind = shape
+    x = values[len(values) - count:]
+    del values[len(values) - count:]
+    values.append(kind(x))
+
+def stepPrint(node, work, values):
+    work.append(printStep)
+    work.append(node.value)
+
+def applyPrint(_, work, values):
+    printLine(values.pop())
+    values.append(None)
+
+def stepAssign(node, work, values):
+    if node.tailCall and tailCalls:
+        pushCall(node.value, (finishTailCall, node), work)
+        return
+    work.append((applyAssign, node))
+    work.append(node.value)
+
+def applyAssign(node, work, values):
+    x = values.pop()
+    if type(node.variable) is list:
+        target = mutableList(names[node.variable[0]])
+        names[node.variable[0]] = target
+        work.append((storeIndex, (target, x)))
+        work.append(node.variable[1])
+    else:
+        names[node.variable] = x
+        values.append(None)
+
+def storeIndex(pair, work, values):
+    target, x = pair
+    target[values.pop()] = x
+    listChanged(target)
+    values.append(None)
+
+def stepBlock(node, work, values):
+    found = False
+    for item in reversed(node.value):
+        if item is not None:
+            if found:
+                work.append(discardStep)
+            work.append(item)
+            found = True
+    if not found:
+        values.append(None)
+
+def stepConditional(node, work, values):
+    work.append((applyConditional, node))
+    work.append(node.conditional)
+
+def applyConditional(node, work, values):
+    if values.pop():
+        work.append(node.value)
+    else:
+        values.append(None)
+
+def stepConditionalElse(node, work, values):
+    work.append((applyConditionalElse, node))
+    work.append(node.conditional)
+
+def applyConditionalElse(node, work, values):
+    if values.pop():
+        work.append(node.conditionalvalue)
+    else:
+        work.append(node.value)
+
+def stepLoop(node, work, values):
+    work.append((applyLoop, node))
+    work.append(node.conditional)
+
+def applyLoop(node, work, values):
+    if values.pop():
+        work.append((applyLoop, node))
+        work.append(node.conditional)
+        work.append(discardStep)
+        work.append(node.value)
+    else:
+        values.append(None)
+
+def stepFunctionDef(node, work, values):
+    if type(node.output) is FunctionCall:
+        outputCall = functools.partial(prepareCall, node.output)
+    else:
+        outputCall = None
+    funcnames[node.name] = [functools.partial(evaluate, node.value), node.var,
+                            functools.partial(evaluate, node.output), outputCall]
+    values.append(None)
+
+def pushCall(call, finish, work):
+    # The work of FunctionCall.prepare: each argument is pushed to stack as
+    # soon as it is evaluated, then finish runs on the prepared function.
+    if call.name not in funcnames and call.name not in builtinFunctions:
+        semanticError()
+    work.append(finish)
+    for item in reversed(call.var):
+        work.append(pushArgumentStep)
+        work.append(item)
+
+def pushArgument(_, work, values):
+    stack.append(values.pop())
+
+def preparedFunction(call):
+    if call.name not in funcnames:
+        start = len(stack) - len(call.var)
+        args = stack[start:]
+        del stack[start:]
+        return builtinFunction(call.name, args)
+    function = funcnames[call.name]
+    if len(function[1]) != len(call.var):
+        semanticError()
+    return function
+
+def stepFunctionCall(node, work, values):
+    pushCall(node, (finishCall, node), work)
+
+def finishCall(call, work, values):
+    values.append(callFunction(preparedFunction(call)))
+
+def finishTailCall(node, work, values):
+    values.append(TailCall(node.variable, preparedFunction(node.value)))
+
+def finishPrepare(call, work, values):
+    values.append(preparedFunction(call))
+
+def prepareCall(call):
+    work = []
+    pushCall(call, (finishPrepare, call), work)
+    return runWork(work)
+
+stackOps = {
+    And: opAnd,
+    Or: opOr,
+    Plus: opPlus,
+    Minus: opMinus,
+    Times: opTimes,
+    Intdivision: opIntdivision,
+    Division: opDivision,
+    Modulus: opModulus,
+    Exponent: opExponent,
+    Lessthan: opLessthan,
+    Greaterthan: opGreaterthan,
+    LEQ: opLEQ,
+    GEQ: opGEQ,
+    EqualTo: opEqualTo,
+    NEQ: opNEQ,
+    In: opIn,
+    Index: opIndex,
+}
+
+binarySteps = {cls: (applyBinary, op) for cls, op in stackOps.items()}
+binarySteps[Cons] = (applyRightFirst, opCons)
+binarySteps[TupleIndex] = (applyRightFirst, opTupleIndex)
+discardStep = (discard, None)
+printStep = (applyPrint, None)
+pushArgumentStep = (pushArgument, None)
+
+stackSteps = {
+    Number: stepConstant,
+    Real: stepConstant,
+    String: stepConstant,
+    AST_True: stepConstant,
+    AST_False: stepConstant,
+    Uminus: stepUminus,
+    ListConstant: stepListConstant,
+    Assignment: stepNone,
+    VariableName: stepVariableName,
+    Not: stepNot,
+    And: stepBinary,
+    Or: stepBinary,
+    Plus: stepBinary,
+    Minus: stepBinary,
+    Times: stepBinary,
+    Intdivision: stepBinary,
+    Division: stepBinary,
+    Modulus: stepBinary,
+    Exponent: stepBinary,
+    Lessthan: stepBinary,
+    Greaterthan: stepBinary,
+    LEQ: stepBinary,
+    GEQ: stepBinary,
+    EqualTo: stepBinary,
+    NEQ: stepBinary,
+    In: stepBinary,
+    Index: stepBinary,
+    Cons: stepRightFirst,
+    TupleIndex: stepRightFirst,
+    List: stepList,
+    funcVarList: stepList,
+    Tuple: stepTuple,
+    Print: stepPrint,
+    Assign: stepAssign,
+    Block: stepBlock,
+    Conditional: stepConditional,
+    ConditionalElse: stepConditionalElse,
+    Loop: stepLoop,
+    FunctionDef: stepFunctionDef,
+    FunctionCall: stepFunctionCall,
+}
+
+# Constant folding: an optional pass between parser.parse and evaluation
+# that replaces literal subtrees with the literal they evaluate to and
+# drops identity operations (x * 1, x + 0, ...) where the operand type is
+# known. Anything that would take the SEMANTIC ERROR path, raise, or
+# produce an unreasonably large value is left for the runtime.
+
+foldLimit = 10000                               #largest string/list/number of digits to fold
+
+literalTypes = (Number, Real, String, AST_True, AST_False, Uminus)
+
+def isLiteral(node):
+    return type(node) in literalTypes
+
+def literalValue(node):
+    if type(node) is Uminus:
+        return -node.value
+    return node.value
+
+def makeLiteral(value):
+    if type(value) is bool:
+        node = AST_True() if value else AST_False()
+    elif type(value) is int:
+        node = Number(value)
+    elif type(value) is float:
+        node = Real(value)
+    elif type(value) is str:
+        node = String(value)
+    else:
+        node = ListConstant(value)
+    return node
+
+def isNumeric(x):
+    return type(x) is int or type(x) is float
+
+def staticType(node):
+    # int or float when the node is certain to produce that type (or fail
+    # on its own), None when it cannot be told without running it.
+    if type(node) is Number or type(node) is Uminus and type(node.value) is int:
+        return int
+    if type(node) is Real or type(node) is Uminus and type(node.value) is float:
+        return float
+    if type(node) is Intdivision:
+        return int
+    if type(node) is Division:
+        return float
+    if type(node) in (Plus, Minus, Times, Modulus):
+        left = staticType(node.left)
+        right = staticType(node.right)
+        if left is int and right is int:
+            return int
+        if left is not None and right is not None and type(node) is not Modulus:
+            return float
+        if left is float and right is float:
+            return float
+    return None
+
+def foldValues(cls, x, y):
+    # The folded value of cls applied to literals x and y, or None when it
+    # must be left to the runtime.
+    if cls is Plus:
+        if type(x) is type(y) and type(x) in (int, float, str) or isNumeric(x) and isNumeric(y):
+            return x + y
+    elif cls is Minus:
+        if isNumeric(x) and isNumeric(y):
+            return x - y
+    elif cls is Times:
+        if isNumeric(x) and isNumeric(y):
+            return x * y
+        if type(x) is str and type(y) is int and len(x) * y <= foldLimit:
+            return x * y
+    elif cls is Intdivision:
+        if type(x) is int and type(y) is int and y != 0:
+            return int(x / y)
+    elif cls is Division:
+        if isNumeric(x) and isNumeric(y) and y != 0:
+            return float(x / y)
+    elif cls is Modulus:
+        if type(x) is type(y) and isNumeric(x) and y != 0:
+            return x % y
+    elif cls is Exponent:
+        if type(x) is int and type(y) is int:
+            if x.bit_length() * abs(y) <= foldLimit and (x != 0 or y >= 0):
+                return pow(x, y)
+        elif isNumeric(x) and isNumeric(y):
+            try:
+                v = pow(x, y)
+            except ArithmeticError:
+                return None
+            if type(v) is float:
+                return v
+    elif cls in (Lessthan, Greaterthan, LEQ, GEQ, EqualTo, NEQ):
+        if type(x) is type(y) and type(x) in (int, float, str, bool):
+            return comparisonOps[cls](x, y)
+    elif cls is And:
+        if type(x) is bool and type(y) is bool:
+            return x and y
+    elif cls is Or:
+        if type(x) is bool and type(y) is bool:
+            return x or y
+    elif cls is In:
+        if type(x) is str and type(y) is str:
+            return x in y
+    elif cls is Index:
+        if type(x) is str and type(y) is int and -len(x) <= y < len(x):
+            return x[y]
+    return None
+
+comparisonOps = {
+    Lessthan: opLessthan,
+    Greaterthan: opGreaterthan,
+    LEQ: opLEQ,
+    GEQ: opGEQ,
+    EqualTo: opEqualTo,
+    NEQ: opNEQ,
+}
+
+foldableBinary = (Plus, Minus, Times, Intdivision, Division, Modulus, Exponent,
+                  Lessthan, Greaterthan, LEQ, GEQ, EqualTo, NEQ, And, Or, In, Index)
+
+class ConstantFolder():
+    def __init__(self):
+        self.folded = 0
+
+    def fold(self, node):
+        if node is None or type(node) is str:
+            return node
+        method = getattr(self, "fold" + type(node).__name__, None)
+        if method is None:
+            return node
+        return method(node)
+
+    def foldChildren(self, children):
+        return [self.fold(child) for child in children]
+
+    def replace(self, node):
+        self.folded += 1
+        return node
+
+    def foldBinary(self, node):
+        node.left = self.fold(node.left)
+        node.right = self.fold(node.right)
+        left = node.left
+        right = node.right
+        cls = type(node)
+        if isLiteral(left) and isLiteral(right):
+            v = foldValues(cls, literalValue(left), literalValue(right))
+            if v is not None and (type(v) is not str or len(v) <= foldLimit):
+                return self.replace(makeLiteral(v))
+        if cls is Index and type(left) is ListConstant and type(right) is Number:
+            if -len(left.value) <= right.value < len(left.value):
+                return self.replace(makeLiteral(left.value[right.value]))
+        if cls is Plus and type(left) is ListConstant and type(right) is ListConstant:
+            if len(left.value) + len(right.value) <= foldLimit:
+                return self.replace(ListConstant(left.value + right.value))
+        return self.simplify(node)
+
+    def simplify(self, node):
+        cls = type(node)
+        left = node.left
+        right = node.right
+        if cls is Times:
+            if type(right) is Number and right.value == 1 and staticType(left) is not None:
+                return self.replace(left)
+            if type(left) is Number and left.value == 1 and staticType(right) is not None:
+                return self.replace(right)
+        elif cls is Plus:
+            if type(right) is Number and right.value == 0 and staticType(left) is int:
+                return self.replace(left)
+            if type(left) is Number and left.value == 0 and staticType(right) is int:
+                return self.replace(right)
+        elif cls is Minus:
+            if type(right) is Number and right.value == 0 and staticType(left) is not None:
+                return self.replace(left)
+        elif cls is Exponent:
+            if type(right) is Number and right.value == 1 and staticType(left) is not None:
+                return self.replace(left)
+        return node
+
+    foldPlus = foldBinary
+    foldMinus = foldBinary
+    foldTimes = foldBinary
+    foldIntdivision = foldBinary
+    foldDivision = foldBinary
+    foldModulus = foldBinary
+    foldExponent = foldBinary
+    foldLessthan = foldBinary
+    foldGreaterthan = foldBinary
+    foldLEQ = foldBinary
+    foldGEQ = foldBinary
+    foldEqualTo = foldBinary
+    foldNEQ = foldBinary
+    foldAnd = foldBinary
+    foldOr = foldBinary
+    foldIn = foldBinary
+    foldIndex = foldBinary
+
+    def foldNot(self, node):
+        node.child = self.fold(node.child)
+        if type(node.child) is AST_True:
+            return self.replace(AST_False())
+        if type(node.child) is AST_False:
+            return self.replace(AST_True())
+        return node
+
+    def foldCons(self, node):
+        node.left = self.fold(node.left)
+        node.right = self.fold(node.right)
+        if isLiteral(node.left) and type(node.right) is ListConstant and len(node.right.value) < foldLimit:
+            return self.replace(ListConstant((literalValue(node.left),) + node.right.value))
+        return node
+
+    def foldTupleIndex(self, node):
+        node.left = self.fold(node.left)
+        node.right = self.fold(node.right)
+        if type(node.left) is Number and type(node.right) is Tuple:
+            items = node.right.value
+            if all(isLiteral(item) for item in items) and -len(items) <= node.left.value - 1 < len(items):
+                return self.replace(items[node.left.value - 1])
+        return node
+
+    def foldList(self, node):
+        node.value = self.foldChildren(node.value)
+        if node.value and all(isLiteral(item) for item in node.value):
+            return self.replace(ListConstant([literalValue(item) for item in node.value]))
+        return node
+
+    def foldTuple(self, node):
+        node.value = self.foldChildren(node.value)
+        return node
+
+    def foldPrint(self, node):
+        node.value = self.fold(node.value)
+        return node
+
+    def foldAssign(self, node):
+        node.value = self.fold(node.value)
+        if type(node.variable) is list:
+            node.variable[1] = self.fold(node.variable[1])
+        return node
+
+    def foldBlock(self, node):
+        node.value = self.foldChildren(node.value)
+        return node
+
+    def foldConditional(self, node):
+        node.conditional = self.fold(node.conditional)
+        node.value = self.fold(node.value)
+        return node
+
+    def foldConditionalElse(self, node):
+        node.conditional = self.fold(node.conditional)
+        node.conditionalvalue = self.fold(node.conditionalvalue)
+        node.value = self.fold(node.value)
+        return node
+
+    def foldLoop(self, node):
+        node.conditional = self.fold(node.conditional)
+        node.value = self.fold(node.value)
+        return node
+
+    def foldFunctionDef(self, node):
+        node.value = self.fold(node.value)
+        node.output = self.fold(node.output)
+        return node
+
+    def foldFunctionCall(self, node):
+        node.var = self.foldChildren(node.var)
+        return node
+
+
+def foldConstants(sections):
+    folder = ConstantFolder()
+    result = [folder.fold(item) for item in sections]
+    return result, folder.folded
+
+# Type inference (--typecheck): a pass over the whole program before it
+# runs, following the types each variable may hold through blocks,
+# conditionals, loops (run again until the types stop growing) and
+# function bodies. A type is a set of kinds: the Python type of a value,
+# with str standing for StringBuilder as well, list for ConsList and
+# object for anything else. Variables are dynamically scoped, so a call
+# may assign any of them, and a function body or output starts from
+# knowing nothing. Where an operator fails for every pair of its operand
+# kinds (int + str, not 1, an undeclared variable or function), the node
+# is a certain SEMANTIC ERROR once reached; one outside any function,
+# conditional or loop body is reached by every run, and rejects the
+# program before it starts. Where the kinds are single and match an
+# unguarded quickening specialization, the node becomes a variant that
+# checks nothing, and so does every read of a declared variable.
+
+anyKind = frozenset({int, float, bool, str, list, tuple, type(None), object})
+noKind = frozenset()
+intKind = frozenset({int})
+floatKind = frozenset({float})
+boolKind = frozenset({bool})
+strKind = frozenset({str})
+listKind = frozenset({list})
+tupleKind = frozenset({tuple})
+numberKind = frozenset({int, float})
+exactKinds = (int, float, bool)                 #kinds that are a single runtime type
+integerKinds = (int, bool)
+
+kindNames = {type(None): "none", object: "other"}
+
+def kindOf(value):
+    kind = type(value)
+    if kind is StringBuilder:
+        return str
+    if kind is ConsList:
+        return list
+    return kind if kind in anyKind else object
+
+def describeKinds(kinds):
+    return " or ".join(sorted(kindNames.get(kind, kind.__name__) for kind in kinds))
+
+def isZero(node):
+    return isLiteral(node) and type(literalValue(node)) is not str and literalValue(node) == 0
+
+# The kinds each operator gives for one pair of operand kinds, or None
+# when the pair is a SEMANTIC ERROR. Operators that only fail inside
+# Python (None + None, "a" - "b") give anyKind there; the value never
+# comes, so it is no matter what it would be.
+
+def plusKinds(a, b):
+    if a is object or b is object:
+        return anyKind
+    if a is b:
+        if a is bool:
+            return intKind
+        return anyKind if a is type(None) else frozenset({a})
+    if a in numberKind and b in numberKind:
+        return floatKind
+    return None
+
+def compareKinds(a, b):
+    if a is b or a is object or b is object:
+        return boolKind
+    return None
+
+def intdivisionKinds(a, b):
+    return intKind if a is int and b is int else None
+
+def modulusKinds(a, b):
+    if a is object or b is object:
+        return anyKind
+    if a is b:
+        if a in integerKinds:
+            return intKind
+        return frozenset({a}) if a is float or a is str else anyKind
+    return None
+
+def logicKinds(a, b):
+    return boolKind if a is bool and b is bool else None
+
+def indexKinds(a, b):
+    if b is int and a is str:
+        return strKind
+    return anyKind if b is int and a is list else None
+
+def minusKinds(a, b):
+    if a in integerKinds and b in integerKinds:
+        return intKind
+    if a in exactKinds and b in exactKinds:
+        return floatKind
+    return anyKind
+
+def timesKinds(a, b):
+    if a in exactKinds and b in exactKinds:
+        return minusKinds(a, b)
+    if a in integerKinds and b in (str, list, tuple):
+        return frozenset({b})
+    if b in integerKinds and a in (str, list, tuple):
+        return frozenset({a})
+    return anyKind
+
+def exponentKinds(a, b):
+    return numberKind if a in integerKinds and b in integerKinds else anyKind
+
+def divisionKinds(a, b):
+    return floatKind
+
+def inKinds(a, b):
+    return boolKind
+
+def consKinds(a, b):
+    return listKind
+
+def tupleIndexKinds(a, b):
+    return anyKind
+
+pairKinds = {
+    Plus: plusKinds,
+    Minus: minusKinds,
+    Times: timesKinds,
+    Intdivision: intdivisionKinds,
+    Division: divisionKinds,
+    Modulus: modulusKinds,
+    Exponent: exponentKinds,
+    Lessthan: compareKinds,
+    Greaterthan: compareKinds,
+    LEQ: compareKinds,
+    GEQ: compareKinds,
+    EqualTo: compareKinds,
+    NEQ: compareKinds,
+    And: logicKinds,
+    Or: logicKinds,
+    In: inKinds,
+    Index: indexKinds,
+    Cons: consKinds,
+    TupleIndex: tupleIndexKinds,
+}
+
+comparisonClasses = (Lessthan, Greaterthan, LEQ, GEQ)
+
+def pairCompletes(cls, a, b, right):
+    # Whether cls on operands of kinds a and b gives a value or a SEMANTIC
+    # ERROR, never a Python exception (None + None, 1 mod 0, "a" - "b", a
+    # comparison of lists with unlike elements). right is the right
+    # operand's node. Numbers are taken not to overflow.
+    if a is object or b is object:
+        return False
+    if cls is Plus:
+        return a is not b or a is not type(None)
+    if cls in comparisonClasses:
+        return a is not b or a in exactKinds or a is str
+    if cls in (EqualTo, NEQ, Intdivision, And, Or, Index):
+        return True
+    if cls is Minus or cls is Division:
+        return a in exactKinds and b in exactKinds or cls is Division and isZero(right)
+    if cls is Times:
+        return a in exactKinds and b in exactKinds or a in integerKinds or b in integerKinds
+    if cls is Modulus:
+        return a is not b or a in (int, float) and isLiteral(right) and not isZero(right)
+    if cls is In:
+        return b is list or b is tuple or a is str and b is str
+    if cls is Cons:
+        return b is list
+    if cls is TupleIndex:
+        return a in integerKinds and b in (tuple, list, str)
+    return False                                #Exponent: 0 ** -1, complex results
+
+builtinKinds = {
+    "vadd": listKind,
+    "vsub": listKind,
+    "vmul": listKind,
+    "vdiv": listKind,
+    "sum": numberKind,
+    "product": numberKind,
+    "min": numberKind,
+    "max": numberKind,
+    "dot": numberKind,
+}
+
+provenTemplate = """def eval(self):
+    x = self.left.eval()
+    y = self.right.eval()
+    return {value}
+"""
+
+provenVariants = {}                             #(node class, left type, right type) -> variant
+
+def buildProvenVariants():
+    for cls, (op, symbol, specializations) in quickenedOps.items():
+        for left, right, value, further in specializations:
+            if left in exactKinds and right in exactKinds:
+                description = "%s %s %s, proven" % (left.__name__, symbol, right.__name__)
+                provenVariants[cls, left, right] = makeVariant(cls, description,
+                    provenTemplate.format(value = value))
+
+buildProvenVariants()
+declaredVariable = makeVariant(VariableName, "declared", "def eval(self):\n    return names[self.name]\n")
+
+def joinTypes(first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return {name: kinds | second[name] for name, kinds in first.items()}
+
+class TypeChecker():
+    # Statements (check*) take the kinds of the variables before them and
+    # return those after, or None when nothing runs after; expressions
+    # (infer*) return their kinds, noKind when no value comes, and may
+    # forget the variables' kinds for a call. Loop bodies are gone through
+    # in trial passes, which neither report nor specialize, until their
+    # types settle, then once more for good. An error is only reached by
+    # every run when everything before it finishes, so a loop that may run
+    # forever, a call (it may recurse without end) or an operation that may
+    # fail in Python sets stops, and later errors are not certain.
+    def __init__(self, sections, specialize):
+        self.specialize = specialize
+        self.final = True                       #not a trial pass through a loop
+        self.certain = True                     #outside functions, conditionals and loop bodies
+        self.stops = False                      #something before may not finish
+        self.errors = []                        #(node, description, certain)
+        self.proved = 0
+        self.arities = {}
+        for item in sections:
+            if type(item) is FunctionDef:
+                self.arities.setdefault(item.name, set()).add(len(item.var))
+
+    def error(self, node, description):
+        if self.final:
+            self.errors.append((node, description, self.certain and not self.stops))
+        return noKind
+
+    def prove(self, node, variant):
+        if self.final and self.specialize:
+            node.__class__ = variant
+            self.proved += 1
+
+    def check(self, node, env):
+        method = getattr(self, "check" + type(node).__name__, None)
+        if method is None:                      #a call as a statement
+            return env if self.infer(node, env) else None
+        return method(node, env)
+
+    def infer(self, node, env):
+        return getattr(self, "infer" + type(node).__name__)(node, env)
+
+    def checkBlock(self, node, env):
+        for item in node.value:
+            if env is None:
+                break
+            if item is not None:
+                env = self.check(item, env)
+        return env
+
+    def checkAssignment(self, node, env):
+        return env
+
+    def checkPrint(self, node, env):
+        return env if self.infer(node.value, env) else None
+
+    def checkAssign(self, node, env):
+        kinds = self.infer(node.value, env)
+        if not kinds:
+            return None
+        if type(node.variable) is list:
+            # anything but a list fails in Python; the index may call a
+            # function that assigns the name again
+            env[node.variable[0]] = listKind
+            if not self.infer(node.variable[1], env):
+                return None
+            self.stops = True                   #the index may be out of range
+        else:
+            env[node.variable] = kinds
+        return env
+
+    def checkConditional(self, node, env):
+        if not self.infer(node.conditional, env):
+            return None
+        certain, self.certain = self.certain, False
+        taken = self.check(node.value, dict(env))
+        self.certain = certain
+        return joinTypes(env, taken)
+
+    def checkConditionalElse(self, node, env):
+        if not self.infer(node.conditional, env):
+            return None
+        certain, self.certain = self.certain, False
+        taken = self.check(node.conditionalvalue, dict(env))
+        other = self.check(node.value, env)
+        self.certain = certain
+        return joinTypes(taken, other)
+
+    def checkLoop(self, node, env):
+        final, self.final = self.final, False
+        while True:
+            after, body = self.loopPass(node, env)
+            widened = joinTypes(env, body)
+            if widened == env:
+                break
+            env = widened
+        self.final = final
+        if final:
+            after, _ = self.loopPass(node, env)
+        if not isLiteral(node.conditional) or literalValue(node.conditional):
+            self.stops = True
+        return after
+
+    def loopPass(self, node, env):
+        # The kinds after the condition fails and after the body, from
+        # those before the condition.
+        env = dict(env)
+        if not self.infer(node.conditional, env):
+            return None, None
+        certain, self.certain = self.certain, False
+        body = self.check(node.value, dict(env))
+        self.certain = certain
+        return env, body
+
+    def checkFunctionDef(self, node, env):
+        certain, self.certain = self.certain, False
+        stops = self.stops
+        self.check(node.value, dict.fromkeys(env, anyKind))
+        self.infer(node.output, dict.fromkeys(env, anyKind))
+        self.certain = certain
+        self.stops = stops
+        return env
+
+    def inferConstant(self, node, env):
+        return frozenset({kindOf(node.value)})
+
+    inferNumber = inferConstant
+    inferReal = inferConstant
+    inferString = inferConstant
+    inferAST_True = inferConstant
+    inferAST_False = inferConstant
+    inferUminus = inferConstant
+
+    def inferListConstant(self, node, env):
+        return listKind
+
+    def inferVariableName(self, node, env):
+        if node.name not in env:
+            return self.error(node, "%r is never assigned" % node.name)
+        self.prove(node, declaredVariable)
+        return env[node.name]
+
+    def inferNot(self, node, env):
+        kinds = self.infer(node.child, env)
+        if kinds and bool not in kinds:
+            return self.error(node, "not %s" % describeKinds(kinds))
+        return kinds and boolKind
+
+    def inferItems(self, items, env, kinds):
+        for item in items:
+            if not self.infer(item, env):
+                return noKind
+        return kinds
+
+    def inferList(self, node, env):
+        return self.inferItems(node.value, env, listKind)
+
+    inferfuncVarList = inferList
+
+    def inferTuple(self, node, env):
+        return self.inferItems(node.value, env, tupleKind)
+
+    def inferBinary(self, node, env):
+        cls = quickenBases.get(type(node), type(node))
+        if cls is Cons or cls is TupleIndex:    #the right operand first
+            right = self.infer(node.right, env)
+            left = right and self.infer(node.left, env)
+        else:
+            left = self.infer(node.left, env)
+            right = left and self.infer(node.right, env)
+        if not left or not right:
+            return noKind
+        if (cls is Division or cls is Intdivision) and isZero(node.right):
+            return self.error(node, "division by zero")
+        rule = pairKinds[cls]
+        kinds = noKind
+        for a in left:
+            for b in right:
+                pair = rule(a, b)
+                if pair is not None:
+                    kinds = kinds | pair
+                    if not pairCompletes(cls, a, b, node.right):
+                        self.stops = True
+        if not kinds:
+            if cls is Index:
+                return self.error(node, "%s[%s]" % (describeKinds(left), describeKinds(right)))
+            return self.error(node, "%s %s %s" % (describeKinds(left), quickenedOps[cls][1],
+                                                  describeKinds(right)))
+        if len(left) == 1 and len(right) == 1:
+            variant = provenVariants.get((cls, next(iter(left)), next(iter(right))))
+            if variant is not None and (cls is not Intdivision
+                                        or isLiteral(node.right) and not isZero(node.right)):
+                self.prove(node, variant)
+        return kinds
+
+    inferPlus = inferBinary
+    inferMinus = inferBinary
+    inferTimes = inferBinary
+    inferIntdivision = inferBinary
+    inferDivision = inferBinary
+    inferModulus = inferBinary
+    inferExponent = inferBinary
+    inferLessthan = inferBinary
+    inferGreaterthan = inferBinary
+    inferLEQ = inferBinary
+    inferGEQ = inferBinary
+    inferEqualTo = inferBinary
+    inferNEQ = inferBinary
+    inferAnd = inferBinary
+    inferOr = inferBinary
+    inferIn = inferBinary
+    inferIndex = inferBinary
+    inferCons = inferBinary
+    inferTupleIndex = inferBinary
+
+    def inferFunctionCall(self, node, env):
+        if not self.inferItems(node.var, env, anyKind):
+            return noKind
+        if node.name not in funcnames:
+            if node.name not in builtinFunctions:
+                return self.error(node, "no function %r" % node.name)
+            if builtinFunctions[node.name][1] != len(node.var):
+                return self.error(node, "%s takes %d arguments, not %d"
+                                  % (node.name, builtinFunctions[node.name][1], len(node.var)))
+            return builtinKinds[node.name]
+        arities = self.arities.get(node.name)
+        if arities and len(node.var) not in arities:
+            return self.error(node, "%s takes %s arguments, not %d"
+                              % (node.name, " or ".join(map(str, sorted(arities))), len(node.var)))
+        for name in env:
+            env[name] = anyKind
+        self.stops = True
+        return anyKind
+
+def inferTypes(sections, specialize = True):
+    # Returns the certain SEMANTIC ERROR sites as (node, description,
+    # reached by every run) and the number of nodes specialized.
+    # specialize is for the engines that run Node.eval.
+    checker = TypeChecker(sections, specialize)
+    env = {name: frozenset({kindOf(value)}) for name, value in names.items()}
+    for item in sections:
+        if env is None:
+            break
+        env = checker.check(item, env)
+    return checker.errors, checker.proved
+
+def reportTypeErrors(sections, errors, out):
+    lines = {node: line for line, node in numberNodes(sections)}
+    for node, description, certain in errors:
+        out.write("typecheck node %d %s: %s%s\n" % (lines[node], type(node).__name__, description,
+                                                    ", in every run" if certain else ""))
+
+for variant, cls in quickenBases.items():      #deep nodes run through these in the stack engine
+    stackSteps[variant] = stackSteps[cls]
+    if cls in binarySteps:
+        binarySteps[variant] = binarySteps[cls]
+
+# Closure compiler: lowers the parsed section list into nested Python
+# closures once, so executing a program no longer pays for the attribute
+# lookups and method dispatch of Node.eval on every evaluation. Every
+# closure takes the current frame; it is only used when variables have
+# been resolved to slots (see resolveSlots), and is None otherwise.
+
+def compileNode(node, scope):
+    return compilers[type(node)](node, scope)
+
+def compileConstant(node, scope):
+    value = node.value
+    def constant(frame):
+        return value
+    return constant
+
+def compileUminus(node, scope):
+    value = -node.value
+    def constant(frame):
+        return value
+    return constant
+
+# Binary operators are compiled from templates: one closure factory per
+# operator and operand shape (literal, variable, frame slot, or
+# sub-expression), so a leaf operand is read inline instead of through a
+# closure call. The int fast paths fall back to the shared op* functions
+# for everything else.
+
+binaryTemplates = {
+    Plus: """if type(x) is int and type(y) is int:
+    return x + y
+return opPlus(x, y)""",
+    Minus: "return x - y",
+    Times: "return x * y",
+    Lessthan: """if type(x) is int and type(y) is int:
+    return x < y
+return opLessthan(x, y)""",
+    Greaterthan: """if type(x) is int and type(y) is int:
+    return x > y
+return opGreaterthan(x, y)""",
+    LEQ: """if type(x) is int and type(y) is int:
+    return x <= y
+return opLEQ(x, y)""",
+    GEQ: """if type(x) is int and type(y) is int:
+    return x >= y
+return opGEQ(x, y)""",
+    EqualTo: """if type(x) is int and type(y) is int:
+    return x == y
+return opEqualTo(x, y)""",
+    NEQ: """if type(x) is int and type(y) is int:
+    return x != y
+return opNEQ(x, y)""",
+    Index: """if type(x) is list and type(y) is int:
+    try:
+        return x[y]
+    except IndexError:
+        pass
+return opIndex(x, y)""",
+    And: "return opAnd(x, y)",
+    Or: "return opOr(x, y)",
+    Intdivision: "return opIntdivision(x, y)",
+    Division: "return opDivision(x, y)",
+    Modulus: "return opModulus(x, y)",
+    Exponent: "return opExponent(x, y)",
+    In: "return opIn(x, y)",
+}
+
+operandTemplates = {
+    "literal": "{0} = {1}\n",
+    "variable": "try:\n    {0} = names[{1}]\nexcept KeyError:\n    semanticError()\n",
+    "local": "{0} = frame[{1}]\n",
+    "global": "{0} = globalFrame[{1}]\n",
+    "expression": "{0} = {1}(frame)\n",
+}
+
+binaryFactories = {}
+
+def indent(code, level):
+    return "".join("    " * level + line + "\n" for line in code.splitlines())
+
+def binaryFactory(cls, leftShape, rightShape):
+    key = (cls, leftShape, rightShape)
+    if key not in binaryFactories:
+        code = "def make(l, r, globalFrame):\n    def binary(frame):\n"
+        code += indent(operandTemplates[leftShape].format("x", "l"), 2)
+        code += indent(operandTemplates[rightShape].format("y", "r"), 2)
+        code += indent(binaryTemplates[cls], 2)
+        code += "    return binary\n"
+        namespace = {}
+        exec(code, globals(), namespace)
+        binaryFactories[key] = namespace["make"]
+    return binaryFactories[key]
+
+def compileOperand(node, scope):
+    if type(node) in (Number, Real, String, AST_True, AST_False):
+        return "literal", node.value
+    if type(node) is Uminus:
+        return "literal", -node.value
+    if type(node) is VariableName:
+        if scope is None:
+            return "variable", node.name
+        shape, slot = scope.lookup(node.name)
+        if shape != "undeclared":
+            return shape, slot
+    return "expression", compileNode(node, scope)
+
+def compileBinary(node, scope):
+    leftShape, left = compileOperand(node.left, scope)
+    rightShape, right = compileOperand(node.right, scope)
+    globalFrame = scope.globalFrame if scope is not None else None
+    return binaryFactory(type(node), leftShape, rightShape)(left, right, globalFrame)
+
+def compileNot(node, scope):
+    child = compileNode(node.child, scope)
+    def negate(frame):
+        return opNot(child(frame))
+    return negate
+
+def compileCons(node, scope):
+    left = compileNode(node.left, scope)
+    right = compileNode(node.right, scope)
+    def cons(frame):
+        y = right(frame)
+        return opCons(left(frame), y)
+    return cons
+
+def compileTupleIndex(node, scope):
+    left = compileNode(node.left, scope)
+    right = compileNode(node.right, scope)
+    def tupleIndex(frame):
+        y = right(frame)
+        return opTupleIndex(left(frame), y)
+    return tupleIndex
+
+def compileListConstant(node, scope):
+    value = node.value
+    def makeList(frame):
+        return list(value)
+    return makeList
+
+def compileList(node, scope):
+    items = [compileNode(item, scope) for item in node.value]
+    def makeList(frame):
+        return [item(frame) for item in items]
+    return makeList
+
+def compileTuple(node, scope):
+    items = [compileNode(item, scope) for item in node.value]
+    def makeTuple(frame):
+        return tuple([item(frame) for item in items])
+    return makeTuple
+
+def compileVariableName(node, scope):
+    name = node.name
+    if scope is None:
+        def variable(frame):
+            try:
+                return names[name]
+            except KeyError:
+                semanticError()
+        return variable
+
+    shape, slot = scope.lookup(name)
+    if shape == "local":
+        def local(frame):
+            return frame[slot]
+        return local
+    if shape == "global":
+        globalFrame = scope.globalFrame
+        def globalVariable(frame):
+            return globalFrame[slot]
+        return globalVariable
+    def undeclared(frame):
+        semanticError()
+    return undeclared
+
+def compilePrint(node, scope):
+    value = compileNode(node.value, scope)
+    def printValue(frame):
+        printLine(value(frame))
+    return printValue
+
+def compileAssign(node, scope):
+    if node.tailCall and tailCalls:
+        return compileTailAssign(node, scope)
+    value = compileNode(node.value, scope)
+    if type(node.variable) is list:
+        return compileAssignIndex(node, scope, value)
+
+    name = node.variable
+    if scope is None:
+        def assign(frame):
+            names[name] = value(frame)
+        return assign
+
+    shape, slot = scope.lookup(name)
+    if shape == "local":
+        def assignLocal(frame):
+            frame[slot] = value(frame)
+        return assignLocal
+    globalFrame = scope.globalFrame
+    def assignGlobal(frame):
+        globalFrame[slot] = value(frame)
+    return assignGlobal
+
+def compileTailAssign(node, scope):
+    prepare = compilePrepare(node.value, scope)
+    if scope is None:
+        variable = node.variable
+    else:
+        variable = scope.lookup(node.variable)[1]
+    def tailAssign(frame):
+        return TailCall(variable, prepare(frame))
+    return tailAssign
+
+def compileAssignIndex(node, scope, value):
+    name = node.variable[0]
+    index = compileNode(node.variable[1], scope)
+    shape, slot = scope.lookup(name) if scope is not None else ("variable", name)
+    if shape == "variable":
+        def assignIndex(frame):
+            x = value(frame)
+            target = names[name] = mutableList(names[name])
+            target[index(frame)] = x
+            listChanged(target)
+        return assignIndex
+    if shape == "local":
+        def assignLocalIndex(frame):
+            x = value(frame)
+            target = frame[slot] = mutableList(frame[slot])
+            target[index(frame)] = x
+            listChanged(target)
+        return assignLocalIndex
+    if shape == "global":
+        globalFrame = scope.globalFrame
+        def assignGlobalIndex(frame):
+            x = value(frame)
+            target = globalFrame[slot] = mutableList(globalFrame[slot])
+            target[index(frame)] = x
+            listChanged(target)
+        return assignGlobalIndex
+    def undeclared(frame):
+        value(frame)
+        semanticError()
+    return undeclared
+
+def compileBlock(node, scope):
+    statements = [compileNode(item, scope) for item in node.value if item is not None]
+    if not statements:
+        return lambda frame: None
+    init = statements[:-1]
+    last = statements[-1]
+    def block(frame):
+        for statement in init:
+            statement(frame)
+        return last(frame)
+    return block
+
+def compileConditional(node, scope):
+    conditional = compileNode(node.conditional, scope)
+    value = compileNode(node.value, scope)
+    def ifThen(frame):
+        if conditional(frame):
+            return value(frame)
+    return ifThen
+
+def compileConditionalElse(node, scope):
+    conditional = compileNode(node.conditional, scope)
+    conditionalvalue = compileNode(node.conditionalvalue, scope)
+    value = compileNode(node.value, scope)
+    def ifThenElse(frame):
+        if conditional(frame):
+            return conditionalvalue(frame)
+        else:
+            return value(frame)
+    return ifThenElse
+
+def compileLoop(node, scope):
+    conditional = compileNode(node.conditional, scope)
+    value = compileNode(node.value, scope)
+    def loop(frame):
+        while conditional(frame):
+            value(frame)
+    return loop
+
+def compileFunctionDef(node, scope):
+    name = node.name
+    outputCall = None
+    if scope is None:
+        body = compileNode(node.value, None)
+        output = compileNode(node.output, None)
+        if type(node.output) is FunctionCall:
+            prepareOutput = compilePrepare(node.output, None)
+            outputCall = lambda: prepareOutput(None)
+        function = [lambda: body(None), node.var, lambda: output(None), outputCall]
+    else:
+        local = scope.functionScopes[node]
+        if type(node.output) is FunctionCall and tailCalls:
+            outputCall = compilePrepare(node.output, local)
+        memo = None
+        if name in scope.pure:
+            memo = MemoCache(name, scope.memoSize)
+            memoCaches.append(memo)
+        function = (compileNode(node.value, local), compileNode(node.output, local),
+                    len(node.var), len(local.slots), outputCall, memo)
+    def define(frame):
+        funcnames[name] = function
+    return define
+
+def compilePrepare(node, scope):
+    # Everything a call does before entering the callee: check the name,
+    # pass the arguments and check their number.
+    name = node.name
+    args = [compileNode(item, scope) for item in node.var]
+    argc = len(args)
+    if scope is not None:
+        # With resolved slots every call gets a fresh frame: the arguments
+        # go into the first slots and the body's locals after them, so
+        # nested and recursive calls cannot overwrite each other's variables.
+        def prepareFrame(frame):
+            if name not in funcnames:
+                if name in builtinFunctions:
+                    return builtinFrameFunction(name, [item(frame) for item in args])
+                semanticError()
+            values = [item(frame) for item in args]
+            function = funcnames[name]
+            if function[2] != argc:
+                semanticError()
+            return function, values + [None] * (function[3] - argc)
+        return prepareFrame
+
+    def prepare(frame):
+        if name not in funcnames:
+            if name in builtinFunctions:
+                return builtinFunction(name, [item(frame) for item in args])
+            semanticError()
+        for item in args:
+            stack.append(item(frame))           #same calling convention as FunctionCall.prepare
+        function = funcnames[name]
+        if len(function[1]) != argc:
+            semanticError()
+        return function
+    return prepare
+
+def compileFunctionCall(node, scope):
+    prepare = compilePrepare(node, scope)
+    if scope is not None:
+        def callSlots(frame):
+            function, callFrame = prepare(frame)
+            if function[5] is None:
+                return callInFrame(function, callFrame)
+            return function[5].call(function, callFrame)
+        return callSlots
+    def call(frame):
+        return callFunction(prepare(frame))
+    return call
+
+def callInFrame(function, callFrame):
+    # callFunction for slot frames: the arguments are already in callFrame
+    # and there is nothing to restore afterwards.
+    pending = []
+    while True:
+        blockVal, outputVar, paramCount, frameSize, outputCall, memo = function
+        try:
+            signal = blockVal(callFrame)
+        except RecursionError:
+            raise
+        except:
+            global swallowedErrors
+            swallowedErrors += 1
+            signal = None
+        if type(signal) is TailCall:
+            pending.append((signal.variable, callFrame, outputVar))
+            function, callFrame = signal.function
+            continue
+        error = None
+        try:
+            if outputCall is not None:
+                function, callFrame = outputCall(callFrame)
+                continue
+            result = outputVar(callFrame)
+        except RecursionError:
+            raise
+        except BaseException as e:
+            if not pending:
+                raise
+            error = e
+        break
+    while pending:
+        slot, frame, outputVar = pending.pop()
+        if error is None:
+            frame[slot] = result
+        try:
+            result = outputVar(frame)
+            error = None
+        except RecursionError:
+            raise
+        except BaseException as e:
+            if not pending:
+                raise
+            error = e
+    return result
+
+compilers = {
+    Number: compileConstant,
+    Real: compileConstant,
+    String: compileConstant,
+    AST_True: compileConstant,
+    AST_False: compileConstant,
+    Uminus: compileUminus,
+    Not: compileNot,
+    And: compileBinary,
+    Or: compileBinary,
+    Plus: compileBinary,
+    Minus: compileBinary,
+    Times: compileBinary,
+    Intdivision: compileBinary,
+    Division: compileBinary,
+    Modulus: compileBinary,
+    Exponent: compileBinary,
+    Lessthan: compileBinary,
+    Greaterthan: compileBinary,
+    LEQ: compileBinary,
+    GEQ: compileBinary,
+    EqualTo: compileBinary,
+    NEQ: compileBinary,
+    Cons: compileCons,
+    In: compileBinary,
+    Index: compileBinary,
+    List: compileList,
+    ListConstant: compileListConstant,
+    Tuple: compileTuple,
+    TupleIndex: compileTupleIndex,
+    VariableName: compileVariableName,
+    Print: compilePrint,
+    Assign: compileAssign,
+    Block: compileBlock,
+    Conditional: compileConditional,
+    ConditionalElse: compileConditionalElse,
+    Loop: compileLoop,
+    FunctionDef: compileFunctionDef,
+    FunctionCall: compileFunctionCall,
+}
+
+# Slot resolution: maps every variable to an index in a fixed-size frame.
+# Top-level blocks share one global frame. A function's parameters and the
+# names it assigns are its locals and live in a frame created per call;
+# any other name it mentions refers to the global frame.
+
+class Scope():
+    def __init__(self, globalScope = None):
+        self.slots = {}
+        self.globalScope = globalScope
+        if globalScope is None:
+            self.globalFrame = []
+            self.declared = set()
+            self.functionScopes = {}
+            self.pure = set()
+            self.memoSize = 0
+        else:
+            self.globalFrame = globalScope.globalFrame
+            self.declared = globalScope.declared
+            self.functionScopes = globalScope.functionScopes
+
+    def define(self, name):
+        if name not in self.slots:
+            self.slots[name] = len(self.slots)
+        return self.slots[name]
+
+    def lookup(self, name):
+        if name in self.slots:
+            return "local", self.slots[name]
+        if self.globalScope is not None:
+            shape, slot = self.globalScope.lookup(name)
+            if shape == "local":
+                return "global", slot
+            return shape, slot
+        if name in self.declared:
+            return "local", self.define(name)
+        return "undeclared", None
+
+def assignedNames(node, found):
+    # Names assigned (and so declared by the parser) anywhere below node.
+    if type(node) is Assign:
+        if type(node.variable) is list:
+            found.add(node.variable[0])
+        else:
+            found.add(node.variable)
+    elif type(node) is FunctionDef:
+        found.update(node.var)
+    for child in childNodes(node):
+        assignedNames(child, found)
+    return found
+
+childAttributes = {}                            #node class -> the child fields it has, in order
+
+def childNodes(node):
+    cls = type(node)
+    if cls not in childAttributes:
+        slots = [attribute for base in cls.__mro__ for attribute in getattr(base, "__slots__", ())]
+        childAttributes[cls] = tuple(attribute for attribute in
+            ("conditional", "conditionalvalue", "left", "right", "child", "value", "output", "var")
+            if attribute in slots)
+    children = []
+    for attribute in childAttributes[cls]:
+        value = getattr(node, attribute, None)
+        if isinstance(value, Node):
+            children.append(value)
+        elif type(value) is list:
+            children.extend(item for item in value if isinstance(item, Node))
+    if type(node) is Assign and type(node.variable) is list:
+        children.append(node.variable[1])
+    return children
+
+def dumpTree(tree, out):
+    # Writes a node, or a program's list of sections, to out one line per
+    # node indented by depth. The nodes still to visit are kept on a stack,
+    # so the time is linear in the output however deep the tree.
+    if type(tree) is list:
+        pending = [(item, 0) for item in reversed(tree)]
+    else:
+        pending = [(tree, 0)]
+    while pending:
+        node, depth = pending.pop()
+        out.write("\t" * depth + node.label() + "\n")
+        pending.extend((child, depth + 1) for child in reversed(childNodes(node)))
+
+def resolveSlots(sections):
+    scope = Scope()
+    for item in sections:
+        assignedNames(item, scope.declared)
+    for item in sections:
+        if type(item) is FunctionDef:
+            local = Scope(scope)
+            for name in item.var:
+                local.define(name)
+            for name in sorted(assignedNames(item.value, set()) - set(item.var)):
+                local.define(name)
+            scope.functionScopes[item] = local
+        else:
+            for name in sorted(assignedNames(item, set())):
+                scope.define(name)
+    return scope
+
+# Memoization of pure functions (slot frames only: with dynamic scoping
+# every assignment in a body is a global side effect). A function is pure
+# when it prints nothing, assigns no list elements, reads no globals and
+# calls only pure functions; names defined more than once are left out, as
+# a caller's cached results would outlive the callee's redefinition.
+
+swallowedErrors = 0                             #failures swallowed by slot-frame calls
+memoCaches = []
+
+def memoKey(x):
+    # Keys carry types so that 1, 1.0 and True do not share an entry; a
+    # list anywhere makes the value uncacheable (TypeError from hash).
+    if type(x) is tuple:
+        return (tuple, tuple(memoKey(item) for item in x))
+    x = plain(x)
+    key = (type(x), x)
+    hash(key)
+    return key
+
+class MemoCache():
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def call(self, function, callFrame):
+        try:
+            key = memoKey(tuple(callFrame[:function[2]]))
+        except TypeError:
+            return callInFrame(function, callFrame)
+        entries = self.entries
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+        self.misses += 1
+        before = swallowedErrors
+        result = callInFrame(function, callFrame)
+        # A call whose body swallowed an error printed SEMANTIC ERROR, which
+        # a cached answer would not.
+        if swallowedErrors == before:
+            try:
+                memoKey(result)
+            except TypeError:
+                return result
+            entries[key] = result
+            if len(entries) > self.size:
+                entries.popitem(last = False)
+                self.evictions += 1
+        return result
+
+def isPureNode(node, local, callees):
+    if type(node) is Print:
+        return False
+    if type(node) is Assign and type(node.variable) is list:
+        return False
+    if type(node) is VariableName and node.name not in local.slots:
+        return False
+    if type(node) is FunctionCall:
+        callees.add(node.name)
+    return all(isPureNode(child, local, callees) for child in childNodes(node))
+
+def pureFunctions(sections, scope):
+    definitions = {}
+    for item in sections:
+        if type(item) is FunctionDef:
+            definitions.setdefault(item.name, []).append(item)
+    calls = {}
+    for name, items in definitions.items():
+        item = items[0]
+        callees = set()
+        if len(items) == 1 and isPureNode(item.value, scope.functionScopes[item], callees) \
+                and isPureNode(item.output, scope.functionScopes[item], callees):
+            calls[name] = callees
+    pure = set(calls)
+    builtins = builtinFunctions.keys() - definitions.keys()
+    changed = True
+    while changed:
+        changed = False
+        for name in list(pure):
+            if not calls[name] <= pure | builtins:
+                pure.discard(name)
+                changed = True
+    return pure
+
+def compileProgram(sections, slots = False, memoSize = 0):
+    scope = resolveSlots(sections) if slots else None
+    if scope is not None and memoSize > 0:
+        scope.memoSize = memoSize
+        scope.pure = pureFunctions(sections, scope)
+    compiled = [compileNode(item, scope) for item in sections]
+    if scope is None:
+        frame = None
+    else:
+        frame = scope.globalFrame
+        frame.extend([None] * (len(scope.slots) - len(frame)))
+    def program():
+        for item in compiled:
+            item(frame)
+    return program
+
+
+# Bytecode compiler and stack-based virtual machine. A program is lowered
+# into one flat array of (opcode, argument) pairs plus a constant pool, and
+# runBytecode executes it with an explicit value stack and call frames
+# instead of Python recursion. The unit can be saved with dumpBytecode and
+# run again later without re-parsing.
+
+LOAD_CONST        = 0
+LOAD_NAME         = 1
+STORE_NAME        = 2
+STORE_INDEX       = 3
+BINARY_ADD        = 4
+BINARY_SUBTRACT   = 5
+BINARY_MULTIPLY   = 6
+BINARY_INDEX      = 7
+BINARY_OP         = 8
+COMPARE_LT        = 9
+COMPARE_GT        = 10
+COMPARE_LE        = 11
+COMPARE_GE        = 12
+COMPARE_EQ        = 13
+COMPARE_NE        = 14
+UNARY_NOT         = 15
+CONS              = 16
+TUPLE_INDEX       = 17
+BUILD_LIST        = 18
+BUILD_TUPLE       = 19
+PRINT             = 20
+POP               = 21
+JUMP              = 22
+POP_JUMP_IF_FALSE = 23
+DEFINE            = 24
+CHECK_FUNCTION    = 25
+PUSH_ARG          = 26
+CALL              = 27
+END_BODY          = 28
+RETURN            = 29
+HALT              = 30
+LIST_CONST        = 31
+
+opnames = [
+    "LOAD_CONST",
+    "LOAD_NAME",
+    "STORE_NAME",
+    "STORE_INDEX",
+    "BINARY_ADD",
+    "BINARY_SUBTRACT",
+    "BINARY_MULTIPLY",
+    "BINARY_INDEX",
+    "BINARY_OP",
+    "COMPARE_LT",
+    "COMPARE_GT",
+    "COMPARE_LE",
+    "COMPARE_GE",
+    "COMPARE_EQ",
+    "COMPARE_NE",
+    "UNARY_NOT",
+    "CONS",
+    "TUPLE_INDEX",
+    "BUILD_LIST",
+    "BUILD_TUPLE",
+    "PRINT",
+    "POP",
+    "JUMP",
+    "POP_JUMP_IF_FALSE",
+    "DEFINE",
+    "CHECK_FUNCTION",
+    "PUSH_ARG",
+    "CALL",
+    "END_BODY",
+    "RETURN",
+    "HALT",
+    "LIST_CONST",
+]
+
+constOpcodes = (LOAD_CONST, LOAD_NAME, STORE_NAME, STORE_INDEX, DEFINE, CHECK_FUNCTION, CALL, LIST_CONST)
+
+binaryOpcodes = {
+    Plus: BINARY_ADD,
+    Minus: BINARY_SUBTRACT,
+    Times: BINARY_MULTIPLY,
+    Index: BINARY_INDEX,
+    Lessthan: COMPARE_LT,
+    Greaterthan: COMPARE_GT,
+    LEQ: COMPARE_LE,
+    GEQ: COMPARE_GE,
+    EqualTo: COMPARE_EQ,
+    NEQ: COMPARE_NE,
+}
+
+# Operators without a dedicated opcode go through BINARY_OP, whose argument
+# indexes this table.
+binaryOps = [opAnd, opOr, opIntdivision, opDivision, opModulus, opExponent, opIn]
+binaryOpNodes = [And, Or, Intdivision, Division, Modulus, Exponent, In]
+
+bytecodeMagic = b"SBMLBC\x01\n"
+
+
+class Bytecode():
+    def __init__(self, code, consts, declaredNames, declaredFunctions):
+        self.code = code                            #array of opcode, argument pairs
+        self.consts = consts                        #constant pool
+        self.declaredNames = declaredNames          #names the parser pre-declares
+        self.declaredFunctions = declaredFunctions  #function names the parser pre-declares
+
+
+class BytecodeCompiler():
+    def __init__(self):
+        self.code = array.array("i")
+        self.consts = []
+        self.constIndex = {}
+        self.declaredNames = []
+        self.declaredFunctions = []
+
+    def emit(self, opcode, arg = 0):
+        self.code.append(opcode)
+        self.code.append(arg)
+        return len(self.code) - 1                   #position of the argument, for patching
+
+    def label(self):
+        return len(self.code) // 2                  #jump targets count instructions
+
+    def patch(self, position, target):
+        self.code[position] = target
 
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Variable: " + self.name
-        if self.name in names:
-            res += " : " + str(names[self.name])
-        else:
-            res += " : " + "True"
-        return res
+    def const(self, value):
+        key = (type(value), value)
+        if key not in self.constIndex:
+            self.constIndex[key] = len(self.consts)
+            self.consts.append(value)
+        return self.constIndex[key]
 
-class Block(Node):
-    def __init__(self, value):
-        super().__init__()
-        self.value = value
-        
-    def eval(self):
-        for item in self.value: 
-            item.eval()
-        return
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Block"
-        return res
-    
-class Conditional(Node):
-    def __init__(self, conditional, value):
-        super().__init__()
-        self.value = value
-        self.conditional = conditional
-        
-    def eval(self):
-        if (self.conditional.eval()):
-            self.value.eval()
+    def declareName(self, name):
+        if name not in self.declaredNames:
+            self.declaredNames.append(name)
+
+    def compileProgram(self, sections):
+        for item in sections:
+            self.compileStatement(item)
+        self.emit(HALT)
+        return Bytecode(self.code, self.consts, self.declaredNames, self.declaredFunctions)
+
+    def compileStatement(self, node):
+        if node is None:
             return
+        self.compile(node)
+        if type(node) is FunctionCall:
+            self.emit(POP)
+
+    def compile(self, node):
+        getattr(self, "compile" + type(node).__name__)(node)
+
+    def compileConstant(self, node):
+        self.emit(LOAD_CONST, self.const(node.value))
+
+    compileNumber = compileConstant
+    compileReal = compileConstant
+    compileString = compileConstant
+    compileAST_True = compileConstant
+    compileAST_False = compileConstant
+
+    def compileUminus(self, node):
+        self.emit(LOAD_CONST, self.const(-node.value))
+
+    def compileBinary(self, node):
+        self.compile(node.left)
+        self.compile(node.right)
+        if type(node) in binaryOpcodes:
+            self.emit(binaryOpcodes[type(node)])
         else:
-            return
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Conditional"
-        return res
-    
-class ConditionalElse(Node):
-    def __init__(self, conditional, conditionalvalue, value):
-        super().__init__()
-        self.value = value
-        self.conditional = conditional
-        self.conditionalvalue = conditionalvalue
-        
-    def eval(self):        
-        if (self.conditional.eval()):
-            return self.conditionalvalue.eval() 
+            self.emit(BINARY_OP, binaryOpNodes.index(type(node)))
+
+    compilePlus = compileBinary
+    compileMinus = compileBinary
+    compileTimes = compileBinary
+    compileIndex = compileBinary
+    compileLessthan = compileBinary
+    compileGreaterthan = compileBinary
+    compileLEQ = compileBinary
+    compileGEQ = compileBinary
+    compileEqualTo = compileBinary
+    compileNEQ = compileBinary
+    compileAnd = compileBinary
+    compileOr = compileBinary
+    compileIntdivision = compileBinary
+    compileDivision = compileBinary
+    compileModulus = compileBinary
+    compileExponent = compileBinary
+    compileIn = compileBinary
+
+    def compileNot(self, node):
+        self.compile(node.child)
+        self.emit(UNARY_NOT)
+
+    def compileCons(self, node):
+        self.compile(node.right)                    #the tail is evaluated first
+        self.compile(node.left)
+        self.emit(CONS)
+
+    def compileTupleIndex(self, node):
+        self.compile(node.right)                    #the tuple is evaluated first
+        self.compile(node.left)
+        self.emit(TUPLE_INDEX)
+
+    def compileList(self, node):
+        for item in node.value:
+            self.compile(item)
+        self.emit(BUILD_LIST, len(node.value))
+
+    def compileListConstant(self, node):
+        self.emit(LIST_CONST, self.const(node.value))
+
+    def compileTuple(self, node):
+        for item in node.value:
+            self.compile(item)
+        self.emit(BUILD_TUPLE, len(node.value))
+
+    def compileVariableName(self, node):
+        self.emit(LOAD_NAME, self.const(node.name))
+
+    def compilePrint(self, node):
+        self.compile(node.value)
+        self.emit(PRINT)
+
+    def compileAssign(self, node):
+        self.compile(node.value)
+        if type(node.variable) is list:
+            self.declareName(node.variable[0])
+            self.compile(node.variable[1])
+            self.emit(STORE_INDEX, self.const(node.variable[0]))
         else:
-            return self.value.eval()
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "ConditionalElse"
-        return res
-    
+            self.declareName(node.variable)
+            self.emit(STORE_NAME, self.const(node.variable))
 
-class Loop(Node):
-    def __init__(self, conditional, value):
-        super().__init__()
-        self.value = value
-        self.conditional = conditional
-        
-    def eval(self):
-        while(self.conditional.eval()):
-            self.value.eval()
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "Loop"
-        return res
+    def compileBlock(self, node):
+        for item in node.value:
+            self.compileStatement(item)
 
-class FunctionDef(Node):
-    def __init__(self, name, var, value, output):
-        super().__init__()
-        self.name = name
-        self.var = var
-        self.value = value
-        self.output = output
-        
-    def eval(self):
-        funcnames[self.name] = [self.value, self.var, self.output]
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "FunctionDef"
-        return res
-    
-class FunctionCall(Node):
-    def __init__(self, name, var):
-        super().__init__()
-        self.name = name
-        self.var = var
-        
-    def eval(self):
-        if self.name not in funcnames:
-            print("SEMANTIC ERROR")
-            sys.exit()
-        
-        for item in self.var:
-            stack.append(item.eval())                  #push variables to stack in case of recursive function call
-        
-        functionName = funcnames[self.name]     #set function name aside 
-        blockVal = functionName[0]              #set block aside
-        variableNames = functionName[1]         #set variable name(s) aside
-        outputVar = functionName[2]             #set output variable aside     
-        
-        if len(variableNames) != len(self.var):
-            print("SEMANTIC ERROR")
-            sys.exit() 
-
-        count = 0                   #set variables for block evaluation
-        for x in range(len(variableNames) - 1, -1, -1):
-            names[variableNames[x]] = stack[len(stack) - 1 - count]
-            count += 1
-        
+    def compileConditional(self, node):
+        self.compile(node.conditional)
+        skip = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.value)
+        self.patch(skip, self.label())
+
+    def compileConditionalElse(self, node):
+        self.compile(node.conditional)
+        skip = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.conditionalvalue)
+        end = self.emit(JUMP)
+        self.patch(skip, self.label())
+        self.compile(node.value)
+        self.patch(end, self.label())
+
+    def compileLoop(self, node):
+        top = self.label()
+        self.compile(node.conditional)
+        end = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(node.value)
+        self.emit(JUMP, top)
+        self.patch(end, self.label())
+
+    def compileFunctionDef(self, node):
+        for name in node.var:
+            self.declareName(name)
+        if node.name not in self.declaredFunctions:
+            self.declaredFunctions.append(node.name)
+
+        skip = self.emit(JUMP)                      #function code lives inline, jumped over
+        bodyStart = self.label()
+        self.compile(node.value)
+        endBody = self.label()
+        self.emit(END_BODY)
+        self.compile(node.output)
+        self.emit(RETURN)
+        self.patch(skip, self.label())
+
+        function = (node.name, tuple(node.var), bodyStart, endBody)
+        self.emit(DEFINE, self.const(function))
+
+    def compileFunctionCall(self, node):
+        self.emit(CHECK_FUNCTION, self.const(node.name))
+        for item in node.var:
+            self.compile(item)
+            self.emit(PUSH_ARG)
+        self.emit(CALL, self.const((node.name, len(node.var))))
+
+
+def compileBytecode(sections):
+    return BytecodeCompiler().compileProgram(sections)
+
+
+def runBytecode(unit):
+    for name in unit.declaredNames:
+        if name not in names:
+            names[name] = None
+    for name in unit.declaredFunctions:
+        if name not in funcnames:
+            funcnames[name] = None
+
+    # Decode once into (opcode, argument) pairs with constant-pool arguments
+    # already resolved, so the dispatch loop does a single index per step.
+    code = unit.code
+    consts = unit.consts
+    instructions = []
+    for position in range(0, len(code), 2):
+        opcode = code[position]
+        arg = code[position + 1]
+        if opcode in constOpcodes:
+            arg = consts[arg]
+        instructions.append((opcode, arg))
+
+    # Opcodes are bound to locals: comparing against module globals would
+    # cost a global lookup per test in the dispatch chain.
+    (codeLoadConst, codeLoadName, codeStoreName, codeStoreIndex, codeBinaryAdd,
+     codeBinarySubtract, codeBinaryMultiply, codeBinaryIndex, codeBinaryOp, codeCompareLt,
+     codeCompareGt, codeCompareLe, codeCompareGe, codeCompareEq, codeCompareNe, codeUnaryNot,
+     codeCons, codeTupleIndex, codeBuildList, codeBuildTuple, codePrint, codePop, codeJump,
+     codePopJumpIfFalse, codeDefine, codeCheckFunction, codePushArg, codeCall, codeEndBody,
+     codeReturn, codeHalt, codeListConst) = \
+        (LOAD_CONST, LOAD_NAME, STORE_NAME, STORE_INDEX, BINARY_ADD, BINARY_SUBTRACT,
+         BINARY_MULTIPLY, BINARY_INDEX, BINARY_OP, COMPARE_LT, COMPARE_GT, COMPARE_LE,
+         COMPARE_GE, COMPARE_EQ, COMPARE_NE, UNARY_NOT, CONS, TUPLE_INDEX, BUILD_LIST,
+         BUILD_TUPLE, PRINT, POP, JUMP, POP_JUMP_IF_FALSE, DEFINE, CHECK_FUNCTION, PUSH_ARG,
+         CALL, END_BODY, RETURN, HALT, LIST_CONST)
+
+    values = []
+    push = values.append
+    pop = values.pop
+    frames = []                                     #[returnPc, params, stack height, end of body, in body]
+    pc = 0
+    while True:
         try:
-            blockVal.eval()                     #evaluate block
+            while True:
+                opcode, arg = instructions[pc]
+                pc += 1
+                if opcode == codeLoadName:
+                    try:
+                        push(names[arg])
+                    except KeyError:
+                        semanticError()
+                elif opcode == codeLoadConst:
+                    push(arg)
+                elif opcode == codeStoreName:
+                    names[arg] = pop()
+                elif opcode == codePopJumpIfFalse:
+                    if not pop():
+                        pc = arg
+                elif opcode == codeJump:
+                    pc = arg
+                elif opcode == codeBinaryAdd:
+                    y = pop()
+                    x = values[-1]
+                    if type(x) is int and type(y) is int:
+                        values[-1] = x + y
+                    else:
+                        values[-1] = opPlus(x, y)
+                elif opcode == codeBinarySubtract:
+                    y = pop()
+                    values[-1] = values[-1] - y
+                elif opcode == codeCompareLt:
+                    y = pop()
+                    x = values[-1]
+                    if type(x) is int and type(y) is int:
+                        values[-1] = x < y
+                    else:
+                        values[-1] = opLessthan(x, y)
+                elif opcode == codeBinaryIndex:
+                    y = pop()
+                    values[-1] = opIndex(values[-1], y)
+                elif opcode == codeBinaryMultiply:
+                    y = pop()
+                    values[-1] = values[-1] * y
+                elif opcode == codeBinaryOp:
+                    y = pop()
+                    values[-1] = binaryOps[arg](values[-1], y)
+                elif opcode == codeCompareGt:
+                    y = pop()
+                    values[-1] = opGreaterthan(values[-1], y)
+                elif opcode == codeCompareLe:
+                    y = pop()
+                    values[-1] = opLEQ(values[-1], y)
+                elif opcode == codeCompareGe:
+                    y = pop()
+                    values[-1] = opGEQ(values[-1], y)
+                elif opcode == codeCompareEq:
+                    y = pop()
+                    values[-1] = opEqualTo(values[-1], y)
+                elif opcode == codeCompareNe:
+                    y = pop()
+                    values[-1] = opNEQ(values[-1], y)
+                elif opcode == codeStoreIndex:
+                    index = pop()
+                    x = pop()
+                    target = names[arg] = mutableList(names[arg])
+                    target[index] = x
+                    listChanged(target)
+                elif opcode == codeUnaryNot:
+                    values[-1] = opNot(values[-1])
+                elif opcode == codeCons:
+                    x = pop()
+                    values[-1] = opCons(x, values[-1])
+                elif opcode == codeTupleIndex:
+                    i = pop()
+                    values[-1] = opTupleIndex(i, values[-1])
+                elif opcode == codeBuildList:
+                    if arg:
+                        x = values[-arg:]
+                        del values[-arg:]
+                    else:
+                        x = []
+                    push(x)
+                elif opcode == codeBuildTuple:
+                    if arg:
+                        x = tuple(values[-arg:])
+                        del values[-arg:]
+                    else:
+                        x = ()
+                    push(x)
+                elif opcode == codePrint:
+                    printLine(pop())
+                elif opcode == codePop:
+                    pop()
+                elif opcode == codeCheckFunction:
+                    if arg not in funcnames and arg not in builtinFunctions:
+                        semanticError()
+                elif opcode == codePushArg:
+                    stack.append(pop())      #same calling convention as FunctionCall.eval
+                elif opcode == codeCall:
+                    name, argc = arg
+                    if name not in funcnames:
+                        start = len(stack) - argc
+                        x = stack[start:]
+                        del stack[start:]
+                        push(applyBuiltin(name, x))
+                    else:
+                        variableNames, bodyStart, endBody = funcnames[name]
+                        if len(variableNames) != argc:
+                            semanticError()
+                        count = 0
+                        for x in range(len(variableNames) - 1, -1, -1):
+                            names[variableNames[x]] = stack[len(stack) - 1 - count]
+                            count += 1
+                        frames.append([pc, variableNames, len(values), endBody, True])
+                        pc = bodyStart
+                elif opcode == codeEndBody:
+                    frame = frames[-1]
+                    frame[4] = False
+                    variableNames = frame[1]
+                    for x in range(len(variableNames) - 1, -1, -1):
+                        stack.pop()
+                        try:
+                            names[variableNames[x]] = stack[len(stack) - x - 2]
+                        except:
+                            pass
+                elif opcode == codeReturn:
+                    pc = frames.pop()[0]
+                elif opcode == codeDefine:
+                    name, variableNames, bodyStart, endBody = arg
+                    funcnames[name] = (variableNames, bodyStart, endBody)
+                elif opcode == codeListConst:
+                    push(list(arg))
+                elif opcode == codeHalt:
+                    return
         except:
-            pass
+            # A failure inside a function body is swallowed by that call, as
+            # in FunctionCall.eval: unwind to the innermost frame still
+            # running its body and carry on from the end of that body.
+            while frames and not frames[-1][4]:
+                frames.pop()
+            if not frames:
+                raise
+            del values[frames[-1][2]:]
+            pc = frames[-1][3]
 
 
-        for x in range(len(variableNames) - 1, -1, -1):
-            stack.pop()
-            try:
-                names[variableNames[x]] = stack[len(stack) - x - 2]
-            except:
-                pass
-                
-        return outputVar.eval()
-        
-        
-    def __str__(self):
-        res = "\t" * self.parentCount() + "FunctionCall"
-        return res
+def disassemble(unit):
+    lines = []
+    code = unit.code
+    for position in range(0, len(code), 2):
+        opcode = code[position]
+        arg = code[position + 1]
+        line = "%6d %-18s" % (position // 2, opnames[opcode])
+        if opcode in constOpcodes:
+            line += " %5d (%r)" % (arg, unit.consts[arg])
+        elif opcode == BINARY_OP:
+            line += " %5d (%s)" % (arg, binaryOpNodes[arg].__name__)
+        elif opcode in (JUMP, POP_JUMP_IF_FALSE):
+            line += " %5d (to %d)" % (arg, arg)
+        elif opcode in (BUILD_LIST, BUILD_TUPLE):
+            line += " %5d" % arg
+        lines.append(line.rstrip())
+    return "\n".join(lines)
 
 
-class funcVarList(Node):
-    def __init__(self, value):
-        super().__init__()
-        self.value = value
+def dumpBytecode(unit):
+    body = (sys.byteorder, unit.code.typecode, unit.code.tobytes(), unit.consts,
+            unit.declaredNames, unit.declaredFunctions)
+    return bytecodeMagic + marshal.dumps(body)
+
+
+def loadBytecode(data):
+    if not data.startswith(bytecodeMagic):
+        raise ValueError("not an SBML bytecode file")
+    byteorder, typecode, raw, consts, declaredNames, declaredFunctions = marshal.loads(data[len(bytecodeMagic):])
+    code = array.array(typecode)
+    code.frombytes(raw)
+    if byteorder != sys.byteorder:
+        code.byteswap()
+    return Bytecode(code, consts, declaredNames, declaredFunctions)
+
 
-    def eval(self):
-        x = []
-        for item in self.value:
-            x.append(item.eval())
-        return x
-    
-    def __str__(self):
-        res = "\t" * self.parentCount() + "FuncVarList"
-        return res
 
 reserved = {
         'andalso' : 'AND',
@@ -940,8 +3535,7 @@ def t_FALSE(t):
 
 
 def t_error(t):
-    print("SYNTAX ERROR")
-    sys.exit()
+    syntaxError()
 
 # Ignore whitespace
 t_ignore = ' \t'
@@ -953,9 +3547,116 @@ def t_newline(t):
 
 
 # Build lexer
-lexer = lex.lex(debug = 0)
+# The lexer and parser are built on first use, so that importing this
+# module or running a saved bytecode unit does not pay for them. Their
+# tables ship prebuilt in lextab.py and parsetab.py, which spares PLY from
+# reflecting over and validating this module on every run; after changing
+# the tokens or the grammar, regenerate them with buildTables(). PLY
+# itself is imported here too: ply.lex alone pulls in inspect.
+
+lexer = None
+parser = None
+
+def getLexer():
+    global lexer
+    if lexer is None:
+        from ply import lex
+        lexer = lex.lex(optimize = 1, lextab = "lextab")
+    return lexer
+
+def getParser():
+    global parser
+    if parser is None:
+        from ply import yacc
+        parser = yacc.yacc(debug = False, write_tables = False)
+    return parser
+
+def buildTables():
+    from ply import lex, yacc
+    outputdir = os.path.dirname(os.path.abspath(__file__))
+    lex.lex(debug = 0).writetab("lextab", outputdir)
+    yacc.yacc(debug = False, outputdir = outputdir)
+
+parserKind = "yacc"                             #set by --parser
+
+def parse(source, lexer = "scan"):
+    if parserKind == "pratt":
+        return PrattParser(source).program()
+    if lexer == "ply":
+        return getParser().parse(source, lexer = getLexer())
+    return getParser().parse(source, lexer = Scanner())
+
+# A dedicated scanner producing the same tokens as the PLY lexer above,
+# without a Python callback and a LexToken per token. Alternatives are
+# tried in the order of PLY's master regex: the t_ functions as defined
+# (t_TRUE and t_FALSE are unreachable behind t_NAME, so True lexes as a
+# TRUE token with the string as its value), then the string rules longest
+# first, which is what makes **, ::, <=, >=, <> and == win over their
+# one-character prefixes.
+
+operatorTypes = {
+    "**": "EXPONENT", "<=": "LEQ", ">=": "GEQ", "<>": "NEQ", "==": "EQUALTO", "::": "CONS",
+    "+": "PLUS", "*": "TIMES", "(": "LPAREN", ")": "RPAREN", "[": "LBRACKET", "]": "RBRACKET",
+    "#": "TUPLEINDX", "{": "LBLOCK", "}": "RBLOCK", "-": "MINUS", "/": "DIVISION",
+    "=": "EQUALS", "<": "LT", ">": "GT", ",": "COMMA", ";": "SEMICOLON",
+}
+
+scanPattern = re.compile(r"[ \t]*(?:" + "|".join([
+    r"(?P<NAME>[a-zA-Z_][a-zA-Z0-9_]*)",
+    r"(?P<SCINOT>\d*\.\d+[e][-]?\d+)",
+    r"(?P<REAL>\d*\.\d*)",
+    r"(?P<NUMBER>\d+)",
+    r"(?P<NEWLINE>\n+)",
+    r"(?P<STRING>\'(.*?)\')",
+    r"(?P<STRING1>\"(.*?)\")",
+    r"(?P<OP>\*\*|<=|>=|<>|==|::|[-+*/()=<>\[\],#;{}])",
+    r"(?P<ERROR>[^ \t])",
+]) + ")")
+
+def scanTokens(source):
+    # Yields (type, value, lineno, lexpos) tuples as the source is scanned.
+    # Blanks are matched as the prefix of the next token rather than on
+    # their own, which halves the number of matches.
+    lineno = 1
+    for match in scanPattern.finditer(source):
+        kind = match.lastgroup
+        if kind == "NAME":
+            text = match.group(kind)
+            yield (reserved.get(text, "NAME"), text, lineno, match.start(kind))
+        elif kind == "OP":
+            text = match.group(kind)
+            yield (operatorTypes[text], text, lineno, match.start(kind))
+        elif kind == "NUMBER":
+            yield ("NUMBER", int(match.group(kind)), lineno, match.start(kind))
+        elif kind == "NEWLINE":
+            lineno += len(match.group(kind))
+        elif kind == "STRING" or kind == "STRING1":
+            yield (kind, match.group(kind), lineno, match.start(kind))
+        elif kind == "REAL" or kind == "SCINOT":
+            yield (kind, float(match.group(kind)), lineno, match.start(kind))
+        else:
+            syntaxError()
+
+class Token():
+    # A scanned token as PLY's parser reads it; lexer is set by PLY's error
+    # recovery on the offending token.
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+class Scanner():
+    # What PLY's parser needs of a lexer: input(), then token() until None.
+    # token is bound per input to next() over the scan, so fetching a token
+    # runs no Python-level method besides Token's constructor.
+    def input(self, source):
+        self.token = functools.partial(next, itertools.starmap(Token, scanTokens(source)), None)
 
 def tokenize(inp):
+    lexer = getLexer()
     lexer.input(inp)
     while True:
         tok = lexer.token()
@@ -1001,7 +3702,8 @@ def p_sections(p):
     if (len(p) == 2):
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_section(p):
     '''
@@ -1108,6 +3810,7 @@ def p_leq(p):
 
 def p_geq(p):
     'expression : expression GEQ expression'
+    p[0] = GEQ(p[1], p[3])
     
 def p_equalto(p):
     'expression : expression EQUALTO expression'
@@ -1124,7 +3827,12 @@ def p_index(p):
                | STRING LBRACKET expression RBRACKET
                | STRING1 LBRACKET expression RBRACKET
     '''
-    p[0] = Index(p[1], p[3]) 
+    if type(p[1]) is list:
+        p[0] = Index(List(p[1]), p[3])
+    elif type(p[1]) is str:
+        p[0] = Index(String(p[1][1:-1]), p[3])
+    else:
+        p[0] = Index(p[1], p[3])
 
 def p_list(p):
     'list : LBRACKET RBRACKET'
@@ -1142,7 +3850,8 @@ def p_list3(p):
     list : list expression RBRACKET
          | list expression COMMA
     '''
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_list_expression(p):
     'expression : list'
@@ -1166,14 +3875,16 @@ def p_tuple(p):
 
 def p_tuple1(p):
     'tuple : tuple expression COMMA'
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_tuple2(p):
     '''
     tuple : tuple expression RPAREN
           | tuple expression COMMA RPAREN
     '''
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
     
 def p_tuple3(p):
     'expression : tuple'
@@ -1223,7 +3934,8 @@ def p_block_statements(p):
     if (len(p) == 2):
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
 
 def p_statement(p):
     '''
@@ -1264,7 +3976,8 @@ def p_funcCall2(p):
     functionCallVars : functionCallVars expression COMMA
                      | functionCallVars expression RPAREN
     '''
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
     
     
 def p_funcCall3(p):
@@ -1300,31 +4013,1037 @@ def p_funcVarList2(p):
             | funcVar NAME RPAREN
     '''
     names[p[2]] = None
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
     
     
 def p_error(p):
-    print("SYNTAX ERROR")
-    sys.exit()
-    
+    syntaxError()
+
+
+# A hand-written parser for the grammar above, chosen with --parser pratt.
+# It reads scanTokens directly and needs neither PLY nor parsetab.py.
+# Operators bind by the precedence table, and the trees (and the names
+# pre-declared on the way) are the ones the yacc grammar builds, down to
+# the ways PLY resolves that grammar's conflicts:
+#   - [ binds looser than any operator: it indexes everything on its left
+#     back to the enclosing bracket, comma, = or #, so s + x[1] is
+#     (s + x)[1] and not a[1] is (not a)[1]. Only a string or list literal
+#     takes an index directly, so s + "ab"[1] is s + ("ab"[1]);
+#   - lists, tuples and argument lists stay open after their closing
+#     bracket and take whatever expression follows as one more element, so
+#     f(x) - 1 and (1, 2)[0] are syntax errors. After a list, [e] indexes
+#     it, while [e, starts a nested list element;
+#   - - is only a negative number literal in front of a number;
+#   - # takes any expression, then one operand. A [e] after the expression
+#     indexes it if more of the expression or the operand follows, and is
+#     the operand otherwise; [ ] and [e, start a list operand.
+
+precedenceLevels = {}
+for level, (associativity, *operators) in enumerate(precedence, 1):
+    for kind in operators:
+        # binding strength: an operand parsed for an operator of strength s
+        # takes the operators stronger than s, so a right associative one
+        # also takes itself
+        precedenceLevels[kind] = 2 * level + (associativity == "right")
+
+binaryNodes = {
+    "OR": Or, "AND": And, "LT": Lessthan, "LEQ": LEQ, "EQUALTO": EqualTo, "NEQ": NEQ,
+    "GEQ": GEQ, "GT": Greaterthan, "CONS": Cons, "IN": In, "PLUS": Plus, "MINUS": Minus,
+    "TIMES": Times, "INTDIVIDE": Intdivision, "DIVISION": Division, "MOD": Modulus,
+    "EXPONENT": Exponent,
+}
+binaryOperators = {kind: (precedenceLevels[kind], cls) for kind, cls in binaryNodes.items()}
+
+expressionStart = {"NAME", "NUMBER", "REAL", "SCINOT", "STRING", "STRING1", "TRUE", "FALSE",
+                   "MINUS", "NOT", "LPAREN", "LBRACKET", "TUPLEINDX"}
+
+class PrattParser():
+    def __init__(self, source):
+        self.tokens = scanTokens(source)
+        self.value = None
+        self.advance()
+
+    def advance(self):
+        # Moves to the next token and returns the value of the current one.
+        value = self.value
+        self.type, self.value, _, _ = next(self.tokens, ("$end", None, None, None))
+        return value
+
+    def error(self):
+        syntaxError()
+
+    def expect(self, kind):
+        if self.type != kind:
+            self.error()
+        return self.advance()
+
+    def close(self, kind):
+        # An element of a list, tuple or argument list ends with , or kind.
+        if self.type != kind and self.type != "COMMA":
+            self.error()
+        self.advance()
+
+    def program(self):
+        sections = []
+        while self.type != "$end":
+            if self.type == "LBLOCK":
+                sections.append(self.block())
+            elif self.type == "FUN":
+                sections.append(self.function())
+            else:
+                self.error()
+        if not sections:
+            self.error()
+        return sections
+
+    def function(self):
+        self.advance()
+        name = self.expect("NAME")
+        self.expect("LPAREN")
+        variables = []
+        if self.type == "RPAREN":
+            self.advance()
+        else:
+            variable = self.expect("NAME")
+            names[variable] = None
+            variables.append(variable)
+            self.close("RPAREN")
+        while self.type == "NAME":
+            variable = self.advance()
+            names[variable] = None
+            variables.append(variable)
+            self.close("RPAREN")
+        self.expect("EQUALS")
+        body = self.block()
+        output = self.expression()
+        self.expect("SEMICOLON")
+        if name not in funcnames:
+            funcnames[name] = None
+        return FunctionDef(name, variables, body, output)
+
+    def block(self):
+        self.expect("LBLOCK")
+        if self.type == "RBLOCK":
+            self.advance()
+            return Block([None])                #the empty statement
+        statements = []
+        while self.type != "RBLOCK":
+            statements.append(self.statement())
+        self.advance()
+        return Block(statements)
+
+    def statement(self):
+        kind = self.type
+        if kind == "NAME":
+            name = self.advance()
+            if self.type == "LPAREN":
+                return FunctionCall(name, self.arguments())
+            variable = name
+            if self.type == "LBRACKET":
+                self.advance()
+                index = self.expression()
+                self.expect("RBRACKET")
+                variable = [name, index]
+            self.expect("EQUALS")
+            value = self.expression()
+            self.expect("SEMICOLON")
+            if name not in names:
+                names[name] = None
+            return Assign(variable, value)
+        if kind == "PRINT":
+            self.advance()
+            self.expect("LPAREN")
+            value = self.expression()
+            self.expect("RPAREN")
+            self.expect("SEMICOLON")
+            return Print(value)
+        if kind == "IF" or kind == "WHILE":
+            self.advance()
+            self.expect("LPAREN")
+            condition = self.expression()
+            self.expect("RPAREN")
+            body = self.block()
+            if kind == "WHILE":
+                return Loop(condition, body)
+            if self.type == "ELSE":
+                self.advance()
+                return ConditionalElse(condition, body, self.block())
+            return Conditional(condition, body)
+        self.error()
+
+    def expression(self, strength = 0, indexing = True, left = None):
+        # Parses operators stronger than strength; at strength 0 (a whole
+        # expression) a trailing [e] indexes what came before, unless
+        # indexing is off for the first operand of #.
+        if left is None:
+            left = self.operand()
+        while True:
+            operator = binaryOperators.get(self.type)
+            if operator is not None:
+                operatorStrength, cls = operator
+                if operatorStrength <= strength:
+                    return left
+                self.advance()
+                if not operatorStrength & 1:
+                    left = cls(left, self.expression(operatorStrength))
+                    continue
+                # a right associative chain is collected in a loop, so a
+                # long one does not nest a call per operator
+                operands = [left, self.expression(operatorStrength)]
+                while self.type in binaryOperators and binaryOperators[self.type][0] == operatorStrength:
+                    self.advance()
+                    operands.append(self.expression(operatorStrength))
+                left = operands.pop()
+                while operands:
+                    left = cls(operands.pop(), left)
+            elif self.type == "LBRACKET" and strength == 0 and indexing:
+                self.advance()
+                index = self.expression()
+                self.expect("RBRACKET")
+                left = Index(left, index)
+            else:
+                return left
+
+    def operand(self):
+        kind = self.type
+        if kind == "NAME":
+            name = self.advance()
+            if self.type == "LPAREN":
+                return FunctionCall(name, self.arguments())
+            return VariableName(name)
+        if kind == "NUMBER":
+            return Number(self.advance())
+        if kind == "REAL" or kind == "SCINOT":
+            return Real(self.advance())
+        if kind == "STRING" or kind == "STRING1":
+            text = self.advance()[1:-1]
+            if self.type == "LBRACKET":
+                self.advance()
+                index = self.expression()
+                self.expect("RBRACKET")
+                return Index(String(text), index)
+            return String(text)
+        if kind == "TRUE":
+            self.advance()
+            return AST_True()
+        if kind == "FALSE":
+            self.advance()
+            return AST_False()
+        if kind == "MINUS":
+            self.advance()
+            if self.type != "NUMBER" and self.type != "REAL":
+                self.error()
+            return Uminus(self.advance())
+        if kind == "NOT":
+            self.advance()
+            return Not(self.expression(precedenceLevels["NOT"]))
+        if kind == "LPAREN":
+            self.advance()
+            item = self.expression()
+            if self.type == "RPAREN":
+                self.advance()
+                return item
+            self.expect("COMMA")
+            if self.type == "RPAREN":
+                self.advance()
+            return self.tupleTail([item])
+        if kind == "LBRACKET":
+            self.advance()
+            if self.type == "RBRACKET":
+                self.advance()
+                return self.listTail([])
+            item = self.expression()
+            self.close("RBRACKET")
+            return self.listTail([item])
+        if kind == "TUPLEINDX":
+            return self.tupleIndex()
+        self.error()
+
+    def listTail(self, items):
+        # The rest of a list whose first elements are items. Returns the
+        # List, or an Index of it.
+        while self.type in expressionStart:
+            if self.type == "LBRACKET":
+                self.advance()
+                if self.type == "RBRACKET":
+                    self.advance()
+                    item = self.expression(left = self.listTail([]))
+                else:
+                    item = self.expression()
+                    if self.type == "RBRACKET":
+                        self.advance()
+                        return Index(List(items), item)
+                    self.expect("COMMA")
+                    item = self.expression(left = self.listTail([item]))
+            else:
+                item = self.expression()
+            items.append(item)
+            self.close("RBRACKET")
+        return List(items)
+
+    def tupleTail(self, items):
+        while self.type in expressionStart:
+            items.append(self.expression())
+            if self.type == "COMMA":
+                self.advance()
+                if self.type == "RPAREN":
+                    self.advance()
+            else:
+                self.expect("RPAREN")
+        return Tuple(items)
+
+    def arguments(self):
+        self.advance()
+        if self.type == "RPAREN":
+            self.advance()
+            arguments = []
+        else:
+            arguments = [self.expression()]
+            self.close("RPAREN")
+        while self.type in expressionStart:
+            arguments.append(self.expression())
+            self.close("RPAREN")
+        return arguments
+
+    def tupleIndex(self):
+        self.advance()
+        index = self.expression(indexing = False)
+        while self.type == "LBRACKET":
+            self.advance()
+            if self.type == "RBRACKET":
+                self.advance()
+                return TupleIndex(index, self.listTail([]))
+            item = self.expression()
+            if self.type == "COMMA":
+                self.advance()
+                return TupleIndex(index, self.listTail([item]))
+            self.expect("RBRACKET")
+            if self.type not in expressionStart and self.type not in binaryOperators:
+                return TupleIndex(index, List([item]))
+            index = self.expression(indexing = False, left = Index(index, item))
+        return TupleIndex(index, self.operand())
+
+
+# On-disk parse cache. An entry holds a parsed program and the names the
+# parser pre-declared while building it, marshalled in a compact form, and
+# is filed under a hash of the source and the interpreter (this file and
+# the Python version), so any change to either misses. Entries carry a
+# checksum: a stale, truncated or corrupt one reads as a miss and is
+# rewritten. When the directory grows past its size cap the least
+# recently used entries are removed first, after any .tmp file a killed
+# run left behind. A cache that cannot be written is skipped.
+
+cacheMagic = b"SBMLPC\x02\n"
+interpreterHash = None
+staleTemporary = 60                             #seconds before a .tmp file is taken as abandoned
+
+def encodeNode(node, fields):
+    # A node becomes (class name, field values...), with the field names
+    # kept once per class in fields. A plain tuple is tagged with an empty
+    # class name.
+    if isinstance(node, Node):
+        cls = quickenBases.get(type(node), type(node))
+        name = cls.__name__
+        fields[name] = cls.__slots__
+        return (name,) + tuple(encodeNode(getattr(node, attribute), fields) for attribute in cls.__slots__)
+    if type(node) is list:
+        return [encodeNode(item, fields) for item in node]
+    if type(node) is tuple:
+        return ("", tuple(encodeNode(item, fields) for item in node))
+    return node
+
+def decodeNode(data, classes, fields):
+    if type(data) is list:
+        return [decodeNode(item, classes, fields) if type(item) in (tuple, list) else item
+                for item in data]
+    name = data[0]
+    if name == "":
+        return tuple(decodeNode(item, classes, fields) if type(item) in (tuple, list) else item
+                     for item in data[1])
+    cls = classes[name]
+    node = cls.__new__(cls)
+    i = 1
+    for attribute in fields[name]:
+        value = data[i]
+        if type(value) in (tuple, list):
+            value = decodeNode(value, classes, fields)
+        setattr(node, attribute, value)
+        i += 1
+    return node
+
+def cacheKey(source):
+    global interpreterHash
+    if interpreterHash is None:
+        with open(os.path.abspath(__file__), "rb") as f:
+            interpreterHash = hashlib.sha256(f.read() + sys.version.encode()).hexdigest()
+    return hashlib.sha256((interpreterHash + source).encode()).hexdigest()
+
+def loadCached(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(cacheMagic):
+            return None
+        digest = data[len(cacheMagic):len(cacheMagic) + 32]
+        payload = data[len(cacheMagic) + 32:]
+        if hashlib.sha256(payload).digest() != digest:
+            return None
+        classes = {cls.__name__: cls for cls in Node.__subclasses__()}
+        # Decoding allocates nothing but long-lived nodes; letting the cyclic
+        # collector rescan them as they pile up costs more than the decoding.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            declaredNames, declaredFunctions, fields, sections = marshal.loads(payload)
+            sections = decodeNode(sections, classes, fields)
+        finally:
+            if collecting:
+                gc.enable()
+        os.utime(path)
+    except (OSError, EOFError, ValueError, TypeError, KeyError, IndexError, AttributeError):
+        return None
+    return declaredNames, declaredFunctions, sections
+
+def storeCached(cacheDir, path, entry, cacheSize):
+    declaredNames, declaredFunctions, sections = entry
+    fields = {}
+    try:
+        sections = encodeNode(sections, fields)
+        payload = marshal.dumps((declaredNames, declaredFunctions, fields, sections))
+    except (ValueError, RecursionError):
+        return                                  #too deeply nested to cache
+    temporary = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        os.makedirs(cacheDir, exist_ok = True)
+        with open(temporary, "wb") as f:
+            f.write(cacheMagic + hashlib.sha256(payload).digest() + payload)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return                                  #the cache is optional
+
+    entries = []
+    try:
+        listing = os.listdir(cacheDir)
+    except OSError:
+        return
+    now = time.time()
+    for name in listing:
+        if not name.endswith((".sbp", ".tmp")):
+            continue
+        try:
+            info = os.stat(os.path.join(cacheDir, name))
+        except OSError:
+            continue                            #removed by another run
+        if name.endswith(".tmp"):
+            if now - info.st_mtime < staleTemporary:
+                continue                        #still being written
+            entries.append((0, info.st_size, name))     #left by a killed run; goes first
+        else:
+            entries.append((info.st_mtime, info.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, name in sorted(entries):
+        if total <= cacheSize and mtime:
+            break
+        try:
+            os.remove(os.path.join(cacheDir, name))
+        except OSError:
+            pass
+        total -= size
+
+def declare(declaredNames, declaredFunctions):
+    # What the parser would have pre-declared for a program read back
+    # from a file.
+    for name in declaredNames:
+        if name not in names:
+            names[name] = None
+    for name in declaredFunctions:
+        if name not in funcnames:
+            funcnames[name] = None
+
+def parseCached(source, cacheDir, cacheSize, stats = False):
+    path = os.path.join(cacheDir, cacheKey(source) + ".sbp")
+    entry = loadCached(path)
+    if entry is not None:
+        declaredNames, declaredFunctions, sections = entry
+        declare(declaredNames, declaredFunctions)
+        if stats:
+            print("parse cache hit", file = sys.stderr)
+        return sections
+    beforeNames = set(names)
+    beforeFunctions = set(funcnames)
+    sections = parse(source)
+    declaredNames = [name for name in names if name not in beforeNames]
+    declaredFunctions = [name for name in funcnames if name not in beforeFunctions]
+    storeCached(cacheDir, path, (declaredNames, declaredFunctions, sections), cacheSize)
+    if stats:
+        print("parse cache miss", file = sys.stderr)
+    return sections
+
+
+# AST files: a parsed program as JSON, so that other tools can analyze
+# or keep programs without parsing SBML. --emit-ast writes one, and it
+# runs like a source file. The document holds the field names of every
+# node class, the names the parser pre-declared, the nodes children first
+# and one per line as [class name, field values...], and the sections. A
+# child is {"node": index} and a tuple {"tuple": [...]}, so the nesting
+# stays shallow however deep the tree, and writing and reading are linear.
 
-file_name = sys.argv[1]
-f = open(file_name)
+astMagic = b'{"format": "sbml-ast", "version": 1,'
 
-parser = yacc.yacc()
+def encodeASTValue(value, index):
+    if isinstance(value, Node):
+        return {"node": index[id(value)]}
+    if type(value) is list:
+        return [encodeASTValue(item, index) for item in value]
+    if type(value) is tuple:
+        return {"tuple": [encodeASTValue(item, index) for item in value]}
+    return value
 
+def decodeASTValue(value, nodes):
+    if type(value) is dict:
+        if "node" in value:
+            return nodes[value["node"]]
+        return tuple(decodeASTValue(item, nodes) for item in value["tuple"])
+    if type(value) is list:
+        return [decodeASTValue(item, nodes) for item in value]
+    return value
+
+def writeAST(sections, out):
+    import json                                 #only needed here and in loadAST
+    fields = {cls.__name__: cls.__slots__ for cls in Node.__subclasses__()}
+    out.write(astMagic.decode() + "\n")
+    out.write(' "fields": %s,\n' % json.dumps(fields))
+    out.write(' "names": %s,\n' % json.dumps(list(names)))
+    out.write(' "functions": %s,\n' % json.dumps(list(funcnames)))
+    out.write(' "nodes": [')
+    encode = json.JSONEncoder().encode
+    index = {}
+    pending = [(item, False) for item in reversed(sections)]
+    while pending:
+        node, ready = pending.pop()
+        if id(node) in index:
+            continue                            #shared by the folder
+        if not ready:
+            children = childNodes(node)
+            if children:
+                pending.append((node, True))
+                pending.extend((child, False) for child in reversed(children))
+                continue
+        cls = quickenBases.get(type(node), type(node))
+        entry = [cls.__name__] + [encodeASTValue(getattr(node, attribute), index) for attribute in cls.__slots__]
+        out.write((",\n  " if index else "\n  ") + encode(entry))
+        index[id(node)] = len(index)
+    out.write('],\n "sections": %s}\n' % json.dumps(encodeASTValue(sections, index)))
+
+def loadAST(data):
+    # Returns the sections, after declaring the program's names.
+    import json
+    document = json.loads(data)
+    if type(document) is not dict or document.get("format") != "sbml-ast" or document.get("version") != 1:
+        raise ValueError("not an SBML AST file")
+    classes = {cls.__name__: cls for cls in Node.__subclasses__()}
+    fields = document["fields"]
+    nodes = []
+    for entry in document["nodes"]:
+        cls = classes[entry[0]]
+        if fields[entry[0]] != list(cls.__slots__) or len(entry) != len(cls.__slots__) + 1:
+            raise ValueError("unknown layout for " + entry[0])
+        node = cls.__new__(cls)
+        for attribute, value in zip(cls.__slots__, entry[1:]):
+            setattr(node, attribute, decodeASTValue(value, nodes))
+        nodes.append(node)
+    declare(document["names"], document["functions"])
+    return decodeASTValue(document["sections"], nodes)
+
+
+# Streaming execution: sections are cut out of the source as it is read and
+# each one is parsed, run and dropped before the next, so memory is bounded
+# by the largest section instead of the whole program. A section is a block
+# ending at its matching }, or anything else (a function) ending at the
+# first ; outside braces; strings cannot span lines, so quotes only matter
+# up to the end of the line.
+
+sectionMarks = re.compile(r"""[{};'"\n]""")
+
+def readSections(f, chunkSize = 1 << 20):
+    pieces = []
+    depth = 0
+    kind = None
+    quote = None
+    while True:
+        chunk = f.read(chunkSize)
+        if not chunk:
+            break
+        start = 0
+        for match in sectionMarks.finditer(chunk):
+            mark = match.group()
+            position = match.start()
+            if quote is not None:
+                if mark == quote or mark == "\n":
+                    quote = None
+                continue
+            if mark == "\n":
+                continue
+            if mark == "'" or mark == '"':
+                quote = mark
+                kind = kind or "function"
+                continue
+            if mark == "{":
+                if kind is None:
+                    blank = not chunk[start:position].strip() and not "".join(pieces).strip()
+                    kind = "block" if blank else "function"
+                depth += 1
+                continue
+            if mark == "}" and depth > 1:
+                depth -= 1
+                continue
+            if mark == "}" and depth == 1:
+                depth = 0
+                if kind != "block":
+                    continue
+            elif mark == ";" and depth > 0:
+                continue
+            # end of a section: a block's closing brace, or ; (or a stray })
+            # outside braces
+            pieces.append(chunk[start:position + 1])
+            yield "".join(pieces)
+            pieces = []
+            start = position + 1
+            kind = None
+        pieces.append(chunk[start:])
+    rest = "".join(pieces)
+    if rest.strip():
+        yield rest
+
+def runStream(f, engine = "tree", fold = False):
+    # Returns the number of nodes folded.
+    found = False
+    folded = 0
+    for source in readSections(f):
+        found = True
+        result = parse(source)
+        if fold:
+            result, count = foldConstants(result)
+            folded += count
+        execute(result, engine)
+        flushOutput()                           #each section's output as soon as it has run
+        deoptimized.clear()                     #and let its nodes go
+    if not found:
+        parse("")                               #an empty program is a syntax error
+    return folded
+
+
+def execute(result, engine = "tree", slots = False, memoSize = 0):
+    if engine == "closure":
+        compileProgram(result, slots, memoSize)()
+    elif engine == "vm":
+        runBytecode(compileBytecode(result))
+    elif engine == "stack":
+        markDeepNodes(result)
+        for item in result:
+            evaluate(item)
+    else:
+        for item in result:
+            item.eval()
+
+
+# Running programs in-process. The engines read a program's state (names,
+# funcnames, stack, the memo caches, output and the options) from module
+# globals, so an Interpreter keeps its own and installs them for the
+# length of a run, putting the previous ones back afterwards. One program
+# runs at a time per process; the lexer and parser tables are shared.
+
+def installState(state):
+    # Makes state the module's program state and returns the one it replaced.
+    global names, funcnames, stack, memoCaches, swallowedErrors, output, tailCalls, parserKind
+    previous = (names, funcnames, stack, memoCaches, swallowedErrors, output, tailCalls, parserKind)
+    names, funcnames, stack, memoCaches, swallowedErrors, output, tailCalls, parserKind = state
+    return previous
+
+class Interpreter():
+    def __init__(self, output = None, engine = "tree", slots = False, memoSize = 0,
+                 fold = False, tailCalls = True, parser = "yacc", typecheck = False):
+        self.output = output                    #file the program prints to; None is sys.stdout
+        self.engine = engine
+        self.slots = slots
+        self.memoSize = memoSize
+        self.fold = fold
+        self.tailCalls = tailCalls
+        self.parser = parser
+        self.typecheck = typecheck
+        self.names = {}
+        self.funcnames = {}
+        self.stack = []
+        self.memoCaches = []
+
+    def run(self, source):
+        # Runs source from a fresh state, which is kept for inspection until
+        # the next run. A failing program raises SBMLSyntaxError or
+        # SBMLSemanticError once its error line is written to output.
+        self.names = {}
+        self.funcnames = {}
+        self.stack = []
+        self.memoCaches = []
+        saved = installState((self.names, self.funcnames, self.stack, self.memoCaches, 0,
+                              self.output, self.tailCalls, self.parser))
+        try:
+            result = parse(source)
+            if self.fold:
+                result, _ = foldConstants(result)
+            if self.typecheck:
+                errors, _ = inferTypes(result, self.engine in ("tree", "stack"))
+                if any(certain for _, _, certain in errors):
+                    semanticError()
+            execute(result, self.engine, self.slots, self.memoSize)
+        finally:
+            flushOutput()
+            memberIndexes.clear()
+            deoptimized.clear()
+            deepNodes.clear()
+            installState(saved)
+
+
+# Batch runs (--batch): many source files spread over a pool of worker
+# processes. Each worker builds the parser once and runs its share of the
+# files through one Interpreter, returning each file's output, outcome and
+# wall time; the parent prints them in input order as JSON lines.
+
+batchInterpreter = None
+
+def startBatchWorker(options):
+    global batchInterpreter
+    batchInterpreter = Interpreter(**options)
+    if batchInterpreter.parser == "yacc":
+        getParser()
+
+def runSource(interpreter, source):
+    # Returns (output, status, seconds); status is "ok" or the line the
+    # failure printed, or the Python error the program ran into.
+    out = io.StringIO()
+    interpreter.output = out
+    start = time.perf_counter()
+    try:
+        interpreter.run(source)
+        status = "ok"
+    except SBMLError as e:
+        status = str(e)
+    except RecursionError:
+        status = "maximum recursion depth exceeded"
+    except Exception as e:
+        status = "%s: %s" % (type(e).__name__, e)
+    return out.getvalue(), status, time.perf_counter() - start
+
+def runBatchFile(path):
+    try:
+        with open(path, "rb") as f:
+            source = f.read().decode()
+    except (OSError, UnicodeDecodeError) as e:
+        return path, "", "%s: %s" % (type(e).__name__, e), 0.0
+    return (path,) + runSource(batchInterpreter, source)
+
+def batchFiles(patterns):
+    import glob
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise OSError("no files match %s" % pattern)
+        paths.extend(matches)
+    return paths
+
+def runBatch(paths, jobs, options, out):
+    # Writes one JSON object per file to out and returns the elapsed time.
+    import json
+    import multiprocessing
+    start = time.perf_counter()
+    with multiprocessing.Pool(jobs, startBatchWorker, (options,)) as pool:
+        chunk = max(1, len(paths) // (jobs * 8))
+        for path, output, status, seconds in pool.imap(runBatchFile, paths, chunk):
+            out.write(json.dumps({"file": path, "status": status, "seconds": round(seconds, 6),
+                                  "output": output}) + "\n")
+    return time.perf_counter() - start
+
+
+# Server mode (--serve): keeps the interpreter loaded and runs programs
+# sent as JSON lines, {"source": ..., "id": ...} with the id optional,
+# read from stdin or from the clients of a Unix socket. Each program
+# starts from fresh names and funcnames, and the reply carries the id and
+# the fields of a batch line. {"stats": true} is answered with latency
+# percentiles instead. Each connection is served by a thread, but the
+# programs run one at a time, since they share the module state.
+
+class Server():
+    def __init__(self, options):
+        import threading
+        self.interpreter = Interpreter(**options)
+        if self.interpreter.parser == "yacc":
+            getParser()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.latencies = collections.deque(maxlen = 100000)     #seconds, latest requests
+
+    def reply(self, line):
+        # The JSON reply to one request line.
+        import json
+        start = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+        if type(request) is not dict or not (type(request.get("source")) is str or request.get("stats")):
+            return json.dumps({"error": "expected {\"source\": ...} or {\"stats\": true}"})
+        if request.get("stats"):
+            return json.dumps(self.stats())
+        with self.lock:
+            output, status, seconds = runSource(self.interpreter, request["source"])
+            self.requests += 1
+            self.latencies.append(time.perf_counter() - start)
+        reply = {"id": request["id"]} if "id" in request else {}
+        reply.update(status = status, seconds = round(seconds, 6), output = output)
+        return json.dumps(reply)
+
+    def stats(self):
+        # Request count, and percentiles in milliseconds of the time from
+        # reading a request to its reply, lock wait included.
+        with self.lock:
+            latencies = sorted(self.latencies)
+        result = {"requests": self.requests}
+        for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1.0)):
+            if latencies:
+                index = min(len(latencies) - 1, int(fraction * len(latencies)))
+                result[name] = round(latencies[index] * 1000, 3)
+        return result
+
+    def serveLines(self, lines, out):
+        for line in lines:
+            if line.strip():
+                out.write(self.reply(line) + "\n")
+                out.flush()
+
+    def serveSocket(self, path):
+        import socketserver
+        server = self
+
+        class Connection(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write((server.reply(line) + "\n").encode())
+
+        class SocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        with SocketServer(path, Connection) as listener:
+            try:
+                listener.serve_forever()
+            finally:
+                os.remove(path)
+
+def serve(where, options):
+    # Serves until stdin ends (where is "-") or the process is stopped,
+    # then reports the latency percentiles on stderr.
+    import signal
+    server = Server(options)
+    signal.signal(signal.SIGTERM, lambda number, frame: sys.exit())
+    try:
+        if where == "-":
+            server.serveLines(sys.stdin, sys.stdout)
+        else:
+            server.serveSocket(where)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats()
+        print("%d requests" % stats.pop("requests")
+              + "".join(", %s %.3f ms" % item for item in stats.items()), file = sys.stderr)
 
 
 def main():
+    argParser = argparse.ArgumentParser(description = "Run an SBML program.")
+    argParser.add_argument("file", nargs = "?")
+    argParser.add_argument("--engine", choices = ["tree", "closure", "vm", "stack"], default = "tree",
+                           help = "execution engine (default: tree)")
+    argParser.add_argument("--slots", action = "store_true",
+                           help = "give each function call its own frame of variable slots "
+                                  "(closure engine only)")
+    argParser.add_argument("--fold", action = "store_true",
+                           help = "fold constant subtrees before running")
+    argParser.add_argument("--memo-size", type = int, default = 0, metavar = "N",
+                           help = "cache up to N results per pure function (requires --slots)")
+    argParser.add_argument("--typecheck", action = "store_true",
+                           help = "infer types before running: report certain SEMANTIC ERRORs, "
+                                  "reject programs that always reach one, and drop proven checks")
+    argParser.add_argument("--stats", action = "store_true",
+                           help = "report optimizer statistics on stderr")
+    argParser.add_argument("--no-tail-calls", action = "store_true",
+                           help = "run calls in tail position as ordinary nested calls")
+    argParser.add_argument("--parser", choices = ["yacc", "pratt"], default = "yacc",
+                           help = "parse with PLY's tables or the hand-written parser (default: yacc)")
+    argParser.add_argument("--cache-dir", metavar = "DIR",
+                           help = "keep parsed programs in DIR and reuse them on later runs")
+    argParser.add_argument("--cache-size", type = int, default = 64 * 1024 * 1024, metavar = "BYTES",
+                           help = "size cap of the cache directory (default: 64 MiB)")
+    argParser.add_argument("--stream", action = "store_true",
+                           help = "parse and run one section at a time as the file is read "
+                                  "(not with the vm engine or --slots)")
+    argParser.add_argument("--dump-ast", action = "store_true",
+                           help = "print the program's syntax tree instead of running it")
+    argParser.add_argument("--emit-ast", metavar = "PATH",
+                           help = "write the program's syntax tree to PATH as JSON instead of running it")
+    argParser.add_argument("--disassemble", action = "store_true",
+                           help = "print the program's bytecode instead of running it")
+    argParser.add_argument("--emit-bytecode", metavar = "PATH",
+                           help = "write the program's bytecode to PATH instead of running it")
+    argParser.add_argument("--batch", nargs = "+", metavar = "PATTERN",
+                           help = "run every file matching the patterns and print a JSON line per file")
+    argParser.add_argument("--jobs", type = int, default = os.cpu_count() or 1, metavar = "N",
+                           help = "worker processes for --batch (default: one per CPU)")
+    argParser.add_argument("--output", metavar = "PATH",
+                           help = "write what the program prints to PATH instead of stdout")
+    argParser.add_argument("--output-buffer", type = int, metavar = "CHARS",
+                           help = "pass printed lines on in blocks of CHARS characters, 0 for line by line "
+                                  "(default: 65536, or 0 on a terminal)")
+    argParser.add_argument("--serve", metavar = "SOCKET",
+                           help = "run programs sent as JSON lines to the Unix socket SOCKET, "
+                                  "or on stdin if SOCKET is -")
+    args = argParser.parse_args()
+    if [args.file, args.batch, args.serve].count(None) != 2:
+        argParser.error("give one of a file, --batch or --serve")
+    if (args.batch or args.serve) and (args.stream or args.cache_dir or args.dump_ast or args.emit_ast
+                                       or args.disassemble or args.emit_bytecode or args.output
+                                       or args.output_buffer is not None):
+        argParser.error("--batch and --serve only run programs, without --stream, --cache-dir, "
+                        "--output or bytecode or AST output")
+    if args.output_buffer is not None and args.output_buffer < 0:
+        argParser.error("--output-buffer must not be negative")
+    if args.jobs < 1:
+        argParser.error("--jobs must be at least 1")
+    if args.slots and args.engine != "closure":
+        argParser.error("--slots requires --engine closure")
+    if args.memo_size and not args.slots:
+        argParser.error("--memo-size requires --slots")
+    if args.stream and (args.engine == "vm" or args.slots or args.cache_dir or args.typecheck
+                        or args.disassemble or args.emit_bytecode or args.dump_ast or args.emit_ast):
+        argParser.error("--stream works with the tree, closure or stack engine only, "
+                        "without --slots, --cache-dir, --typecheck or bytecode or AST output")
+    global tailCalls, parserKind, output
+    tailCalls = not args.no_tail_calls
+    parserKind = args.parser
+
+    options = {"engine": args.engine, "slots": args.slots, "memoSize": args.memo_size,
+               "fold": args.fold, "tailCalls": tailCalls, "parser": parserKind,
+               "typecheck": args.typecheck}
+    if args.serve:
+        serve(args.serve, options)
+        return
+    if args.batch:
+        try:
+            paths = batchFiles(args.batch)
+        except OSError as e:
+            argParser.error(str(e))
+        elapsed = runBatch(paths, args.jobs, options, sys.stdout)
+        print("%d files in %.3fs, %.1f files/s with %d workers"
+              % (len(paths), elapsed, len(paths) / elapsed, args.jobs), file = sys.stderr)
+        return
+
+    target = open(args.output, "w", encoding = "utf-8") if args.output else sys.stdout
+    size = args.output_buffer
+    if size is None:
+        size = 0 if target.isatty() else 65536  #a terminal shows each line as it is printed
+    output = OutputBuffer(target, size) if size else target
+    try:
+        runFile(args, argParser)
+    finally:
+        output.flush()
+        if args.output:
+            target.close()
+
+def runFile(args, argParser):
+    global quickenStats
+    if args.stream:
+        with open(args.file, encoding = "utf-8") as f:
+            try:
+                folded = runStream(f, args.engine, args.fold)
+            except RecursionError:
+                sys.exit("maximum recursion depth exceeded")
+        if args.stats and args.fold:
+            print("folded %d nodes" % folded, file = sys.stderr)
+        return
+
     #tokenize()
-    result = parser.parse(f.read(), debug = 1)
-    for item in result:
-        item.eval()
-        
-    
+    with open(args.file, "rb") as f:
+        data = f.read()
+    if data.startswith(bytecodeMagic):
+        if args.dump_ast or args.emit_ast or args.typecheck:
+            argParser.error("a bytecode file has no syntax tree")
+        unit = loadBytecode(data)
+    else:
+        try:
+            if data.startswith(astMagic):
+                result = loadAST(data.decode())
+            elif args.cache_dir:
+                result = parseCached(data.decode(), args.cache_dir, args.cache_size, args.stats)
+            else:
+                result = parse(data.decode())
+            if args.fold:
+                result, folded = foldConstants(result)
+        except RecursionError:
+            sys.exit("maximum recursion depth exceeded")
+        if args.fold and args.stats:
+            print("folded %d nodes" % folded, file = sys.stderr)
+        if args.dump_ast:
+            dumpTree(result, sys.stdout)
+            return
+        if args.emit_ast:
+            with open(args.emit_ast, "w", encoding = "utf-8") as f:
+                writeAST(result, f)
+            return
+        if args.typecheck and not args.disassemble and not args.emit_bytecode:
+            try:
+                errors, proved = inferTypes(result, args.engine in ("tree", "stack"))
+            except RecursionError:
+                sys.exit("maximum recursion depth exceeded")
+            reportTypeErrors(result, errors, sys.stderr)
+            if args.stats:
+                print("typecheck proved %d nodes" % proved, file = sys.stderr)
+            if any(certain for _, _, certain in errors):
+                semanticError()
+        if args.engine != "vm" and not args.disassemble and not args.emit_bytecode:
+            if args.stats and args.engine != "closure":
+                quickenStats = {}
+            try:
+                execute(result, args.engine, args.slots, args.memo_size)
+            except RecursionError:
+                sys.exit("maximum recursion depth exceeded")
+            finally:
+                if args.stats:
+                    for memo in memoCaches:
+                        print("memo %s: %d hits, %d misses, %d evictions"
+                              % (memo.name, memo.hits, memo.misses, memo.evictions), file = sys.stderr)
+                if quickenStats is not None:
+                    reportQuickening(result, sys.stderr)
+            return
+        unit = compileBytecode(result)
+
+    if args.disassemble:
+        print(disassemble(unit))
+    elif args.emit_bytecode:
+        with open(args.emit_bytecode, "wb") as f:
+            f.write(dumpBytecode(unit))
+    else:
+        runBytecode(unit)
+
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except SBMLError:
+        pass                                    #its line is already printed
 '''
 
 def parse(inp):
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'COMMA', 'CONS', 'DIVISION', 'ELSE', 'EQUALS', 'EQUALTO', 'EXPONENT', 'FALSE', 'FUN', 'GEQ', 'GT', 'IF', 'IN', 'INTDIVIDE', 'LBLOCK', 'LBRACKET', 'LEQ', 'LPAREN', 'LT', 'MINUS', 'MOD', 'NAME', 'NEQ', 'NOT', 'NUMBER', 'OR', 'PLUS', 'PRINT', 'RBLOCK', 'RBRACKET', 'REAL', 'RPAREN', 'SCINOT', 'SEMICOLON', 'STRING', 'STRING1', 'TIMES', 'TRUE', 'TUPLEINDX', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_NAME>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_SCINOT>\\d*\\.\\d+[e][-]?\\d+)|(?P<t_REAL>\\d*\\.\\d*)|(?P<t_NUMBER>\\d+)|(?P<t_TRUE>True)|(?P<t_FALSE>False)|(?P<t_newline>\\n+)|(?P<t_STRING>\\\'(.*?)\\\')|(?P<t_STRING1>"(.*?)")|(?P<t_EXPONENT>\\*\\*)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LEQ><=)|(?P<t_GEQ>>=)|(?P<t_NEQ><>)|(?P<t_EQUALTO>==)|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_CONS>::)|(?P<t_TUPLEINDX>\\#)|(?P<t_LBLOCK>\\{)|(?P<t_RBLOCK>\\})|(?P<t_MINUS>-)|(?P<t_DIVISION>/)|(?P<t_EQUALS>=)|(?P<t_LT><)|(?P<t_GT>>)|(?P<t_COMMA>,)|(?P<t_SEMICOLON>;)', [None, ('t_NAME', 'NAME'), ('t_SCINOT', 'SCINOT'), ('t_REAL', 'REAL'), ('t_NUMBER', 'NUMBER'), ('t_TRUE', 'TRUE'), ('t_FALSE', 'FALSE'), ('t_newline', 'newline'), (None, 'STRING'), None, (None, 'STRING1'), None, (None, 'EXPONENT'), (None, 'PLUS'), (None, 'TIMES'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LEQ'), (None, 'GEQ'), (None, 'NEQ'), (None, 'EQUALTO'), (None, 'LBRACKET'), (None, 'RBRACKET'), (None, 'CONS'), (None, 'TUPLEINDX'), (None, 'LBLOCK'), (None, 'RBLOCK'), (None, 'MINUS'), (None, 'DIVISION'), (None, 'EQUALS'), (None, 'LT'), (None, 'GT'), (None, 'COMMA'), (None, 'SEMICOLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
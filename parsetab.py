@@ -0,0 +1,110 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftORleftANDleftNOTleftLTleftLEQleftEQUALTOleftNEQleftGEQleftGTrightCONSleftINleftPLUSMINUSleftTIMESINTDIVIDEDIVISIONMODrightEXPONENTleftTUPLEINDXrightUMINUSleftLPARENRPARENAND COMMA CONS DIVISION ELSE EQUALS EQUALTO EXPONENT FALSE FUN GEQ GT IF IN INTDIVIDE LBLOCK LBRACKET LEQ LPAREN LT MINUS MOD NAME NEQ NOT NUMBER OR PLUS PRINT RBLOCK RBRACKET REAL RPAREN SCINOT SEMICOLON STRING STRING1 TIMES TRUE TUPLEINDX WHILEprogram : sections\n    sections : sections section\n             | section\n    \n    section : block\n            | function\n\n    expression : NAMEexpression : NUMBERexpression : REALexpression : SCINOTexpression : expression PLUS expressionexpression : expression MINUS expression\n    expression : MINUS NUMBER %prec UMINUS\n               | MINUS REAL %prec UMINUS\n    expression : expression TIMES expressionexpression : expression INTDIVIDE expressionexpression : expression DIVISION expressionexpression : expression MOD expressionexpression : TRUEexpression : FALSEexpression : expression AND expressionexpression : expression OR expressionexpression : NOT expressionexpression : LPAREN expression RPARENexpression : expression EXPONENT expressionexpression : STRINGexpression : STRING1expression : expression LT expressionexpression : expression GT expressionexpression : expression LEQ expressionexpression : expression GEQ expressionexpression : expression EQUALTO expressionexpression : expression NEQ expression\n    expression : expression LBRACKET expression RBRACKET\n               | list LBRACKET expression RBRACKET\n               | STRING LBRACKET expression RBRACKET\n               | STRING1 LBRACKET expression RBRACKET\n    list : LBRACKET RBRACKET\n    list : LBRACKET expression COMMA\n         | LBRACKET expression RBRACKET\n    \n    list : list expression RBRACKET\n         | list expression COMMA\n    expression : listexpression : expression CONS expressionexpression : expression IN expression\n    tuple : LPAREN expression COMMA RPAREN\n          | LPAREN expression COMMA\n    tuple : tuple expression COMMA\n    tuple : tuple expression RPAREN\n          | tuple expression COMMA RPAREN\n    expression : tupleexpression : TUPLEINDX expression expressionprint : PRINT LPAREN expression RPAREN SEMICOLON\n    assignment : NAME EQUALS expression SEMICOLON\n               | NAME LBRACKET expression RBRACKET EQUALS expression SEMICOLON\n    conditional : IF LPAREN expression RPAREN blockconditional : IF LPAREN expression RPAREN block ELSE blockloop : WHILE LPAREN expression RPAREN blockblock : LBLOCK statements RBLOCK\n    statements : statements statement\n               | statement\n    \n    statement : empty\n              | print\n              | assignment\n              | conditional\n              | loop\n    empty :\n    function : FUN NAME funcVar EQUALS block expression SEMICOLON\n    \n    functionCallVars : NAME LPAREN expression RPAREN\n                     | NAME LPAREN expression COMMA\n                     | NAME LPAREN RPAREN\n    \n    functionCallVars : functionCallVars expression COMMA\n                     | functionCallVars expression RPAREN\n    functionCall : functionCallVarsexpression : functionCallstatement : functionCall\n    funcVar : LPAREN NAME RPAREN\n            | LPAREN NAME COMMA\n            | LPAREN RPAREN\n    \n    funcVar : funcVar NAME COMMA\n            | funcVar NAME RPAREN\n    '
+    
+_lr_action_items = {'LBLOCK':([0,2,3,4,5,8,23,90,98,99,152,154,],[6,6,-3,-4,-5,-2,-58,6,6,6,6,-67,]),'FUN':([0,2,3,4,5,8,23,154,],[7,7,-3,-4,-5,-2,-58,-67,]),'$end':([1,2,3,4,5,8,23,154,],[0,-1,-3,-4,-5,-2,-58,-67,]),'RBLOCK':([6,9,10,11,12,13,14,15,16,21,23,24,54,57,58,94,96,97,137,139,140,155,156,],[-66,23,-60,-61,-62,-63,-64,-65,-75,-73,-58,-59,-70,-71,-72,-53,-68,-69,-52,-55,-57,-54,-56,]),'PRINT':([6,9,10,11,12,13,14,15,16,21,23,24,54,57,58,94,96,97,137,139,140,155,156,],[17,17,-60,-61,-62,-63,-64,-65,-75,-73,-58,-59,-70,-71,-72,-53,-68,-69,-52,-55,-57,-54,-56,]),'NAME':([6,7,9,10,11,12,13,14,15,16,21,23,24,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,48,49,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,92,94,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,153,155,156,],[18,22,18,-60,-61,-62,-63,-64,-65,-75,32,-58,-59,32,32,32,32,32,32,-6,-7,-8,-9,-18,-19,32,32,-25,-26,32,32,32,32,-74,89,91,-70,-71,-72,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,-12,-13,-22,32,32,-37,32,32,-78,-53,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,32,32,-79,-80,32,-76,-77,-52,32,-55,-57,-33,-45,-35,-36,-34,-49,-7,-8,-33,-54,-56,]),'IF':([6,9,10,11,12,13,14,15,16,21,23,24,54,57,58,94,96,97,137,139,140,155,156,],[19,19,-60,-61,-62,-63,-64,-65,-75,-73,-58,-59,-70,-71,-72,-53,-68,-69,-52,-55,-57,-54,-56,]),'WHILE':([6,9,10,11,12,13,14,15,16,21,23,24,54,57,58,94,96,97,137,139,140,155,156,],[20,20,-60,-61,-62,-63,-64,-65,-75,-73,-58,-59,-70,-71,-72,-53,-68,-69,-52,-55,-57,-54,-56,]),'LPAREN':([17,18,19,20,21,22,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[25,28,29,30,40,49,-58,40,40,40,40,40,40,28,-7,-8,-9,-18,-19,40,40,-25,-26,40,40,40,40,-74,-70,-71,-72,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-12,-13,-22,40,40,-37,40,40,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,40,40,40,40,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'EQUALS':([18,48,92,95,132,133,135,136,],[26,90,-78,138,-79,-80,-76,-77,]),'LBRACKET':([18,21,23,25,26,27,28,29,30,31,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,149,150,151,153,],[27,43,-58,43,43,43,43,43,43,74,-6,-7,-8,-9,-18,-19,43,43,81,82,43,85,43,43,-74,74,74,74,74,-70,74,74,-71,-72,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-12,-13,-22,74,43,43,-37,74,43,74,74,131,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,74,-43,-44,-23,-46,74,74,-38,-39,74,-40,-41,-47,-48,-51,43,43,43,43,-33,-45,-35,-36,-34,-49,-7,-8,74,74,74,-33,]),'COMMA':([21,31,32,33,34,35,37,38,41,42,44,45,47,53,54,57,58,77,78,79,80,83,84,86,87,89,91,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,153,],[-73,57,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,97,-70,-71,-72,-12,-13,-22,119,-37,122,126,127,132,136,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,122,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,122,-39,]),'RPAREN':([21,28,31,32,33,34,35,37,38,41,42,44,45,47,49,50,53,54,55,56,57,58,77,78,79,80,83,87,89,91,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,141,142,143,144,145,146,147,148,153,],[-73,54,58,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,92,93,96,-70,98,99,-71,-72,-12,-13,-22,118,-37,128,133,135,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,142,-38,-39,-40,-41,146,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,-39,]),'PLUS':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,59,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,59,59,59,59,-70,59,59,-71,-72,-12,-13,59,59,-37,59,59,59,59,-68,-69,-10,-11,-14,-15,-16,-17,59,59,-24,59,59,59,59,59,59,59,59,59,-23,-46,59,59,-38,-39,59,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,59,59,59,-33,]),'MINUS':([21,23,25,26,27,28,29,30,31,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,149,150,151,153,],[36,-58,36,36,36,36,36,36,60,-6,-7,-8,-9,-18,-19,36,36,-25,-26,36,36,36,36,-74,60,60,60,60,-70,60,60,-71,-72,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-12,-13,60,60,36,36,-37,60,36,60,60,130,-68,-69,-10,-11,-14,-15,-16,-17,60,60,-24,60,60,60,60,60,60,60,60,60,-23,-46,60,60,-38,-39,60,-40,-41,-47,-48,-51,36,36,36,36,-33,-45,-35,-36,-34,-49,-7,-8,60,60,60,-33,]),'TIMES':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,61,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,61,61,61,61,-70,61,61,-71,-72,-12,-13,61,61,-37,61,61,61,61,-68,-69,61,61,-14,-15,-16,-17,61,61,-24,61,61,61,61,61,61,61,61,61,-23,-46,61,61,-38,-39,61,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,61,61,61,-33,]),'INTDIVIDE':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,62,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,62,62,62,62,-70,62,62,-71,-72,-12,-13,62,62,-37,62,62,62,62,-68,-69,62,62,-14,-15,-16,-17,62,62,-24,62,62,62,62,62,62,62,62,62,-23,-46,62,62,-38,-39,62,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,62,62,62,-33,]),'DIVISION':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,63,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,63,63,63,63,-70,63,63,-71,-72,-12,-13,63,63,-37,63,63,63,63,-68,-69,63,63,-14,-15,-16,-17,63,63,-24,63,63,63,63,63,63,63,63,63,-23,-46,63,63,-38,-39,63,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,63,63,63,-33,]),'MOD':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,64,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,64,64,64,64,-70,64,64,-71,-72,-12,-13,64,64,-37,64,64,64,64,-68,-69,64,64,-14,-15,-16,-17,64,64,-24,64,64,64,64,64,64,64,64,64,-23,-46,64,64,-38,-39,64,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,64,64,64,-33,]),'AND':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,65,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,65,65,65,65,-70,65,65,-71,-72,-12,-13,-22,65,-37,65,65,65,65,-68,-69,-10,-11,-14,-15,-16,-17,-20,65,-24,-27,-28,-29,-30,-31,-32,65,-43,-44,-23,-46,65,65,-38,-39,65,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,65,65,65,-33,]),'OR':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,66,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,66,66,66,66,-70,66,66,-71,-72,-12,-13,-22,66,-37,66,66,66,66,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,66,-43,-44,-23,-46,66,66,-38,-39,66,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,66,66,66,-33,]),'EXPONENT':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,67,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,67,67,67,67,-70,67,67,-71,-72,-12,-13,67,67,-37,67,67,67,67,-68,-69,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,-23,-46,67,67,-38,-39,67,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,67,67,67,-33,]),'LT':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,68,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,68,68,68,68,-70,68,68,-71,-72,-12,-13,68,68,-37,68,68,68,68,-68,-69,-10,-11,-14,-15,-16,-17,68,68,-24,-27,-28,-29,-30,-31,-32,68,-43,-44,-23,-46,68,68,-38,-39,68,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,68,68,68,-33,]),'GT':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,69,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,69,69,69,69,-70,69,69,-71,-72,-12,-13,69,69,-37,69,69,69,69,-68,-69,-10,-11,-14,-15,-16,-17,69,69,-24,69,-28,69,69,69,69,69,-43,-44,-23,-46,69,69,-38,-39,69,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,69,69,69,-33,]),'LEQ':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,70,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,70,70,70,70,-70,70,70,-71,-72,-12,-13,70,70,-37,70,70,70,70,-68,-69,-10,-11,-14,-15,-16,-17,70,70,-24,70,-28,-29,-30,-31,-32,70,-43,-44,-23,-46,70,70,-38,-39,70,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,70,70,70,-33,]),'GEQ':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,71,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,71,71,71,71,-70,71,71,-71,-72,-12,-13,71,71,-37,71,71,71,71,-68,-69,-10,-11,-14,-15,-16,-17,71,71,-24,71,-28,71,-30,71,71,71,-43,-44,-23,-46,71,71,-38,-39,71,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,71,71,71,-33,]),'EQUALTO':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,72,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,72,72,72,72,-70,72,72,-71,-72,-12,-13,72,72,-37,72,72,72,72,-68,-69,-10,-11,-14,-15,-16,-17,72,72,-24,72,-28,72,-30,-31,-32,72,-43,-44,-23,-46,72,72,-38,-39,72,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,72,72,72,-33,]),'NEQ':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,73,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,73,73,73,73,-70,73,73,-71,-72,-12,-13,73,73,-37,73,73,73,73,-68,-69,-10,-11,-14,-15,-16,-17,73,73,-24,73,-28,73,-30,73,-32,73,-43,-44,-23,-46,73,73,-38,-39,73,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,73,73,73,-33,]),'CONS':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,75,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,75,75,75,75,-70,75,75,-71,-72,-12,-13,75,75,-37,75,75,75,75,-68,-69,-10,-11,-14,-15,-16,-17,75,75,-24,75,75,75,75,75,75,75,75,-44,-23,-46,75,75,-38,-39,75,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,75,75,75,-33,]),'IN':([21,31,32,33,34,35,37,38,41,42,44,45,47,50,51,52,53,54,55,56,57,58,77,78,79,80,83,84,86,87,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,141,142,143,144,145,146,147,148,149,150,151,153,],[-73,76,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,76,76,76,76,-70,76,76,-71,-72,-12,-13,76,76,-37,76,76,76,76,-68,-69,-10,-11,-14,-15,-16,-17,76,76,-24,76,76,76,76,76,76,76,76,-44,-23,-46,76,76,-38,-39,76,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,76,76,76,-33,]),'SEMICOLON':([21,32,33,34,35,37,38,41,42,44,45,47,51,54,57,58,77,78,79,83,93,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,141,142,143,144,145,146,147,148,150,151,153,],[-73,-6,-7,-8,-9,-18,-19,-25,-26,-42,-50,-74,94,-70,-71,-72,-12,-13,-22,-37,137,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,-33,-45,-35,-36,-34,-49,-7,-8,154,155,-39,]),'RBRACKET':([21,32,33,34,35,37,38,41,42,43,44,45,47,52,54,57,58,77,78,79,83,84,85,86,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,118,119,120,121,122,123,124,125,126,127,128,129,131,141,142,143,144,145,146,147,148,149,153,],[-73,-6,-7,-8,-9,-18,-19,-25,-26,83,-42,-50,-74,95,-70,-71,-72,-12,-13,-22,-37,123,83,125,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,141,-43,-44,-23,-46,143,144,-38,-39,145,-40,-41,-47,-48,-51,83,-33,-45,-35,-36,-34,-49,-7,-8,153,-39,]),'NUMBER':([21,23,25,26,27,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[33,-58,33,33,33,33,33,33,-6,-7,-8,-9,77,-18,-19,33,33,-25,-26,33,33,33,33,-74,-70,-71,-72,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,-12,-13,-22,33,33,-37,33,33,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,147,33,33,33,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'REAL':([21,23,25,26,27,28,29,30,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[34,-58,34,34,34,34,34,34,-6,-7,-8,-9,78,-18,-19,34,34,-25,-26,34,34,34,34,-74,-70,-71,-72,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,34,-12,-13,-22,34,34,-37,34,34,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,148,34,34,34,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'SCINOT':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[35,-58,35,35,35,35,35,35,-6,-7,-8,-9,-18,-19,35,35,-25,-26,35,35,35,35,-74,-70,-71,-72,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-12,-13,-22,35,35,-37,35,35,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,35,35,35,35,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'TRUE':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[37,-58,37,37,37,37,37,37,-6,-7,-8,-9,-18,-19,37,37,-25,-26,37,37,37,37,-74,-70,-71,-72,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,-12,-13,-22,37,37,-37,37,37,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,37,37,37,37,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'FALSE':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[38,-58,38,38,38,38,38,38,-6,-7,-8,-9,-18,-19,38,38,-25,-26,38,38,38,38,-74,-70,-71,-72,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-12,-13,-22,38,38,-37,38,38,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,38,38,38,38,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'NOT':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[39,-58,39,39,39,39,39,39,-6,-7,-8,-9,-18,-19,39,39,-25,-26,39,39,39,39,-74,-70,-71,-72,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,39,-12,-13,-22,39,39,-37,39,39,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,39,39,39,39,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'STRING':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[41,-58,41,41,41,41,41,41,-6,-7,-8,-9,-18,-19,41,41,-25,-26,41,41,41,41,-74,-70,-71,-72,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,41,-12,-13,-22,41,41,-37,41,41,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,41,41,41,41,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'STRING1':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[42,-58,42,42,42,42,42,42,-6,-7,-8,-9,-18,-19,42,42,-25,-26,42,42,42,42,-74,-70,-71,-72,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-12,-13,-22,42,42,-37,42,42,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,42,42,42,42,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'TUPLEINDX':([21,23,25,26,27,28,29,30,32,33,34,35,37,38,39,40,41,42,43,44,45,46,47,54,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,81,82,83,85,88,96,97,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,116,117,118,119,122,123,125,126,127,128,129,130,131,134,138,141,142,143,144,145,146,147,148,153,],[46,-58,46,46,46,46,46,46,-6,-7,-8,-9,-18,-19,46,46,-25,-26,46,46,46,46,-74,-70,-71,-72,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,46,-12,-13,-22,46,46,-37,46,46,-68,-69,-10,-11,-14,-15,-16,-17,-20,-21,-24,-27,-28,-29,-30,-31,-32,-43,-44,-23,-46,-38,-39,-40,-41,-47,-48,-51,46,46,46,46,-33,-45,-35,-36,-34,-49,-7,-8,-33,]),'ELSE':([23,139,],[-58,152,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'sections':([0,],[2,]),'section':([0,2,],[3,8,]),'block':([0,2,90,98,99,152,],[4,4,134,139,140,156,]),'function':([0,2,],[5,5,]),'statements':([6,],[9,]),'statement':([6,9,],[10,24,]),'empty':([6,9,],[11,11,]),'print':([6,9,],[12,12,]),'assignment':([6,9,],[13,13,]),'conditional':([6,9,],[14,14,]),'loop':([6,9,],[15,15,]),'functionCall':([6,9,21,25,26,27,28,29,30,39,40,43,44,45,46,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,81,82,85,88,130,131,134,138,],[16,16,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,47,]),'functionCallVars':([6,9,21,25,26,27,28,29,30,39,40,43,44,45,46,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,81,82,85,88,130,131,134,138,],[21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,]),'expression':([21,25,26,27,28,29,30,39,40,43,44,45,46,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,81,82,85,88,130,131,134,138,],[31,50,51,52,53,55,56,79,80,84,86,87,88,100,101,102,103,104,105,106,107,108,109,110,111,112,113,114,115,116,117,120,121,124,129,101,149,150,151,]),'list':([21,25,26,27,28,29,30,39,40,43,44,45,46,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,81,82,85,88,130,131,134,138,],[44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,44,]),'tuple':([21,25,26,27,28,29,30,39,40,43,44,45,46,59,60,61,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,81,82,85,88,130,131,134,138,],[45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,45,]),'funcVar':([22,],[48,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> sections','program',1,'p_fileparser','hw5.py',2580),
+  ('sections -> sections section','sections',2,'p_sections','hw5.py',2585),
+  ('sections -> section','sections',1,'p_sections','hw5.py',2586),
+  ('section -> block','section',1,'p_section','hw5.py',2595),
+  ('section -> function','section',1,'p_section','hw5.py',2596),
+  ('expression -> NAME','expression',1,'p_expression_name','hw5.py',2602),
+  ('expression -> NUMBER','expression',1,'p_expression_num','hw5.py',2606),
+  ('expression -> REAL','expression',1,'p_expression_real','hw5.py',2610),
+  ('expression -> SCINOT','expression',1,'p_expression_scinot','hw5.py',2614),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_plus','hw5.py',2618),
+  ('expression -> expression MINUS expression','expression',3,'p_expression_minus','hw5.py',2622),
+  ('expression -> MINUS NUMBER','expression',2,'p_expression_uminus','hw5.py',2627),
+  ('expression -> MINUS REAL','expression',2,'p_expression_uminus','hw5.py',2628),
+  ('expression -> expression TIMES expression','expression',3,'p_term_times','hw5.py',2633),
+  ('expression -> expression INTDIVIDE expression','expression',3,'p_int_division','hw5.py',2637),
+  ('expression -> expression DIVISION expression','expression',3,'p_division','hw5.py',2641),
+  ('expression -> expression MOD expression','expression',3,'p_expression_modulus','hw5.py',2645),
+  ('expression -> TRUE','expression',1,'p_true','hw5.py',2649),
+  ('expression -> FALSE','expression',1,'p_false','hw5.py',2653),
+  ('expression -> expression AND expression','expression',3,'p_boolean_and','hw5.py',2657),
+  ('expression -> expression OR expression','expression',3,'p_boolean_or','hw5.py',2661),
+  ('expression -> NOT expression','expression',2,'p_boolean_not','hw5.py',2665),
+  ('expression -> LPAREN expression RPAREN','expression',3,'p_parenthetical','hw5.py',2669),
+  ('expression -> expression EXPONENT expression','expression',3,'p_expression_exponent','hw5.py',2673),
+  ('expression -> STRING','expression',1,'p_string','hw5.py',2677),
+  ('expression -> STRING1','expression',1,'p_string1','hw5.py',2681),
+  ('expression -> expression LT expression','expression',3,'p_lessthan','hw5.py',2685),
+  ('expression -> expression GT expression','expression',3,'p_greaterthan','hw5.py',2689),
+  ('expression -> expression LEQ expression','expression',3,'p_leq','hw5.py',2693),
+  ('expression -> expression GEQ expression','expression',3,'p_geq','hw5.py',2697),
+  ('expression -> expression EQUALTO expression','expression',3,'p_equalto','hw5.py',2701),
+  ('expression -> expression NEQ expression','expression',3,'p_neq','hw5.py',2705),
+  ('expression -> expression LBRACKET expression RBRACKET','expression',4,'p_index','hw5.py',2710),
+  ('expression -> list LBRACKET expression RBRACKET','expression',4,'p_index','hw5.py',2711),
+  ('expression -> STRING LBRACKET expression RBRACKET','expression',4,'p_index','hw5.py',2712),
+  ('expression -> STRING1 LBRACKET expression RBRACKET','expression',4,'p_index','hw5.py',2713),
+  ('list -> LBRACKET RBRACKET','list',2,'p_list','hw5.py',2723),
+  ('list -> LBRACKET expression COMMA','list',3,'p_list2','hw5.py',2728),
+  ('list -> LBRACKET expression RBRACKET','list',3,'p_list2','hw5.py',2729),
+  ('list -> list expression RBRACKET','list',3,'p_list3','hw5.py',2735),
+  ('list -> list expression COMMA','list',3,'p_list3','hw5.py',2736),
+  ('expression -> list','expression',1,'p_list_expression','hw5.py',2741),
+  ('expression -> expression CONS expression','expression',3,'p_cons','hw5.py',2746),
+  ('expression -> expression IN expression','expression',3,'p_in','hw5.py',2750),
+  ('tuple -> LPAREN expression COMMA RPAREN','tuple',4,'p_tuple','hw5.py',2755),
+  ('tuple -> LPAREN expression COMMA','tuple',3,'p_tuple','hw5.py',2756),
+  ('tuple -> tuple expression COMMA','tuple',3,'p_tuple1','hw5.py',2761),
+  ('tuple -> tuple expression RPAREN','tuple',3,'p_tuple2','hw5.py',2766),
+  ('tuple -> tuple expression COMMA RPAREN','tuple',4,'p_tuple2','hw5.py',2767),
+  ('expression -> tuple','expression',1,'p_tuple3','hw5.py',2772),
+  ('expression -> TUPLEINDX expression expression','expression',3,'p_tuple_index','hw5.py',2776),
+  ('print -> PRINT LPAREN expression RPAREN SEMICOLON','print',5,'p_print','hw5.py',2780),
+  ('assignment -> NAME EQUALS expression SEMICOLON','assignment',4,'p_assign','hw5.py',2785),
+  ('assignment -> NAME LBRACKET expression RBRACKET EQUALS expression SEMICOLON','assignment',7,'p_assign','hw5.py',2786),
+  ('conditional -> IF LPAREN expression RPAREN block','conditional',5,'p_conditional','hw5.py',2796),
+  ('conditional -> IF LPAREN expression RPAREN block ELSE block','conditional',7,'p_conditional_else','hw5.py',2800),
+  ('loop -> WHILE LPAREN expression RPAREN block','loop',5,'p_loop','hw5.py',2804),
+  ('block -> LBLOCK statements RBLOCK','block',3,'p_block','hw5.py',2808),
+  ('statements -> statements statement','statements',2,'p_block_statements','hw5.py',2813),
+  ('statements -> statement','statements',1,'p_block_statements','hw5.py',2814),
+  ('statement -> empty','statement',1,'p_statement','hw5.py',2823),
+  ('statement -> print','statement',1,'p_statement','hw5.py',2824),
+  ('statement -> assignment','statement',1,'p_statement','hw5.py',2825),
+  ('statement -> conditional','statement',1,'p_statement','hw5.py',2826),
+  ('statement -> loop','statement',1,'p_statement','hw5.py',2827),
+  ('empty -> <empty>','empty',0,'p_empty','hw5.py',2832),
+  ('function -> FUN NAME funcVar EQUALS block expression SEMICOLON','function',7,'p_funcDef','hw5.py',2837),
+  ('functionCallVars -> NAME LPAREN expression RPAREN','functionCallVars',4,'p_funcCall','hw5.py',2845),
+  ('functionCallVars -> NAME LPAREN expression COMMA','functionCallVars',4,'p_funcCall','hw5.py',2846),
+  ('functionCallVars -> NAME LPAREN RPAREN','functionCallVars',3,'p_funcCall','hw5.py',2847),
+  ('functionCallVars -> functionCallVars expression COMMA','functionCallVars',3,'p_funcCall2','hw5.py',2857),
+  ('functionCallVars -> functionCallVars expression RPAREN','functionCallVars',3,'p_funcCall2','hw5.py',2858),
+  ('functionCall -> functionCallVars','functionCall',1,'p_funcCall3','hw5.py',2864),
+  ('expression -> functionCall','expression',1,'p_funcCallExpr','hw5.py',2868),
+  ('statement -> functionCall','statement',1,'p_funcCallStat','hw5.py',2873),
+  ('funcVar -> LPAREN NAME RPAREN','funcVar',3,'p_funcVarList','hw5.py',2879),
+  ('funcVar -> LPAREN NAME COMMA','funcVar',3,'p_funcVarList','hw5.py',2880),
+  ('funcVar -> LPAREN RPAREN','funcVar',2,'p_funcVarList','hw5.py',2881),
+  ('funcVar -> funcVar NAME COMMA','funcVar',3,'p_funcVarList2','hw5.py',2892),
+  ('funcVar -> funcVar NAME RPAREN','funcVar',3,'p_funcVarList2','hw5.py',2893),
+]